@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import get_profile_data
+from .revocation import revocation_list
+from .tokens import profile_from_claims
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user built from verified token claims.
+
+    name, email and role come from the token (or the profile cache when the
+    claims are stale). The User row is only fetched the first time a view
+    reads a model field, such as user.date_joined or user.profile.
+
+    is_active stays True from TokenUser: deactivating a user revokes their
+    tokens instead, so a token that gets this far belongs to an active user.
+    """
+
+    @cached_property
+    def profile_data(self):
+        return profile_from_claims(self.token) or get_profile_data(self.id) or {}
+
+    @cached_property
+    def username(self):
+        return self.token.get('username') or self.profile_data.get('email', '')
+
+    @cached_property
+    def first_name(self):
+        return self.profile_data.get('name', '')
+
+    @cached_property
+    def email(self):
+        return self.profile_data.get('email', '')
+
+    @cached_property
+    def role(self):
+        return self.profile_data.get('role', '')
+
+    @cached_property
+    def orm_user(self):
+        return User.objects.select_related('profile').get(pk=self.id)
+
+    def __getattr__(self, attr):
+        if not attr.startswith('_'):
+            try:
+                User._meta.get_field(attr)
+            except FieldDoesNotExist:
+                pass
+            else:
+                return getattr(self.orm_user, attr)
+        return super().__getattr__(attr)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT authentication that trusts token claims instead of loading the user"""
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        revoked = revocation_list.is_revoked(
+            token.get(api_settings.JTI_CLAIM), token.get(api_settings.USER_ID_CLAIM), token.get('iat')
+        )
+        if revoked:
+            raise InvalidToken('Token has been revoked')
+        return token
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('Token contained no recognizable user identification')
+        return ClaimsUser(validated_token)
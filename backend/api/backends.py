@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .credentials import credential_cache
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """ModelBackend that loads the user's profile in the same query"""
+
+    def get_user_by_natural_key(self, username):
+        return UserModel._default_manager.select_related('profile').get(
+            **{UserModel.USERNAME_FIELD: username}
+        )
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = self.get_user_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+
+class CachedModelBackend(ProfileModelBackend):
+    """
+    ModelBackend that skips the password hasher for recently verified logins.
+
+    Only successful verifications are cached. Unknown users, wrong passwords
+    and expired entries all go through the full hasher, so a failed attempt
+    costs the same as it would without the cache.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = self.get_user_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            UserModel().set_password(password)
+            return None
+        if not self.user_can_authenticate(user):
+            return None
+        if credential_cache.check(user, password):
+            return user
+        if user.check_password(password):
+            # check_password may have upgraded the stored hash, so cache after it
+            credential_cache.add(user, password)
+            return user
+        return None
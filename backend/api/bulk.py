@@ -0,0 +1,133 @@
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .models import UserProfile
+
+REQUIRED_FIELDS = ('name', 'email', 'password', 'role')
+VALID_ROLES = {choice for choice, _ in UserProfile.ROLE_CHOICES}
+
+
+def _init_hash_worker():
+    # Spawned workers start without Django configured; forked ones already are
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    import django
+    django.setup()
+
+
+def _hash_password(args):
+    password, algorithm = args
+    return make_password(password, hasher=algorithm)
+
+
+def hash_passwords(passwords, workers=None):
+    """Hash passwords with the default hasher, in parallel when it pays off"""
+    algorithm = get_hasher().algorithm
+    workers = workers or settings.BULK_REGISTER_WORKERS
+    jobs = [(password, algorithm) for password in passwords]
+    if workers <= 1 or len(jobs) < 2:
+        return [_hash_password(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as pool:
+        return list(pool.map(_hash_password, jobs, chunksize=chunksize))
+
+
+def _validate(row):
+    missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+    if missing:
+        return f"Missing fields: {', '.join(missing)}"
+    if row['role'] not in VALID_ROLES:
+        return f"Invalid role: {row['role']}"
+    return None
+
+
+def register_batch(rows, start=0, chunk_size=None, workers=None):
+    """
+    Register a batch of {name, email, password, role} rows.
+
+    Existence is checked with a single query, passwords are hashed on a process
+    pool and rows are inserted with bulk_create, one transaction per chunk.
+    Returns one result dict per input row, in order.
+    """
+    chunk_size = chunk_size or settings.BULK_REGISTER_CHUNK_SIZE
+    results = []
+    pending = []
+    seen = set()
+    for index, row in enumerate(rows, start=start):
+        if not isinstance(row, dict):
+            row = {}
+        email = (row.get('email') or '').strip()
+        result = {'row': index, 'email': email, 'status': 'invalid'}
+        results.append(result)
+        error = _validate({**row, 'email': email})
+        if error:
+            result['error'] = error
+        elif email in seen:
+            result['status'] = 'duplicate'
+        else:
+            seen.add(email)
+            pending.append((result, row))
+
+    existing = set(User.objects.filter(username__in=seen).values_list('username', flat=True))
+    for result, _ in pending:
+        if result['email'] in existing:
+            result['status'] = 'exists'
+    pending = [(result, row) for result, row in pending if result['email'] not in existing]
+
+    hashes = hash_passwords([row['password'] for _, row in pending], workers=workers)
+    for offset in range(0, len(pending), chunk_size):
+        _insert_chunk(pending[offset:offset + chunk_size], hashes[offset:offset + chunk_size])
+    return results
+
+
+def _insert_chunk(pending, hashes):
+    users = [
+        User(username=result['email'], email=result['email'], first_name=row['name'], password=password)
+        for (result, row), password in zip(pending, hashes)
+    ]
+    with transaction.atomic():
+        # A concurrent registration may win the race after the existence
+        # check. Conflicts are skipped and our rows are recognised by their
+        # freshly salted password hash.
+        User.objects.bulk_create(users, ignore_conflicts=True)
+        emails = [user.username for user in users]
+        stored = {
+            username: (pk, password)
+            for username, pk, password in User.objects.filter(username__in=emails).values_list('username', 'pk', 'password')
+        }
+        profiles = []
+        for (result, row), password in zip(pending, hashes):
+            user_id, stored_password = stored.get(result['email'], (None, None))
+            if stored_password != password:
+                result['status'] = 'exists'
+                continue
+            result['status'] = 'created'
+            profiles.append(UserProfile(user_id=user_id, role=row['role']))
+        UserProfile.objects.bulk_create(profiles)
+
+
+def register_stream(rows, batch_size=None, chunk_size=None, workers=None):
+    """Register rows from an iterable in bounded batches, yielding results"""
+    batch_size = batch_size or settings.BULK_REGISTER_BATCH_SIZE
+    rows = iter(rows)
+    start = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield from register_batch(batch, start=start, chunk_size=chunk_size, workers=workers)
+        start += len(batch)
+
+
+def read_csv(stream):
+    """Yield row dicts from a binary or text CSV stream with a header row"""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    yield from csv.DictReader(stream)
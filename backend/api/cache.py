@@ -0,0 +1,67 @@
+from uuid import uuid4
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+# Cached /api/me/ payloads live under a per-user version. Bumping the version
+# orphans every cached payload (and every token claim set) issued before it.
+PROFILE_VERSION_KEY = 'api:profile-version:{user_id}'
+PROFILE_DATA_KEY = 'api:profile:{user_id}:{version}'
+ACCESS_DATA_KEY = 'api:access:{user_id}:{version}'
+PROFILE_DATA_TIMEOUT = 300
+
+
+def get_profile_version(user_id):
+    """Return the current profile version for a user, creating one if needed"""
+    # Versions are random rather than counters so a flushed cache can never
+    # hand out a version that matches a stale token or payload.
+    return cache.get_or_set(
+        PROFILE_VERSION_KEY.format(user_id=user_id), lambda: uuid4().hex[:12], timeout=None
+    )
+
+
+def bump_profile_version(user_id):
+    """Invalidate every cached payload and token claim set for a user"""
+    cache.set(PROFILE_VERSION_KEY.format(user_id=user_id), uuid4().hex[:12], timeout=None)
+
+
+def build_profile_data(user):
+    """Serialize the fields served by /api/me/"""
+    role = user.profile.role if hasattr(user, 'profile') else ''
+    return {
+        'name': user.first_name,
+        'email': user.email,
+        'role': role,
+    }
+
+
+def get_profile_data(user_id):
+    """Return the /api/me/ payload for a user, reading the database only on a miss"""
+    version = get_profile_version(user_id)
+    key = PROFILE_DATA_KEY.format(user_id=user_id, version=version)
+    data = cache.get(key)
+    if data is None:
+        user = User.objects.select_related('profile').filter(pk=user_id).first()
+        if user is None:
+            return None
+        data = build_profile_data(user)
+        cache.set(key, data, PROFILE_DATA_TIMEOUT)
+    return data
+
+
+def get_access_data(user_id):
+    """Return the fields permission checks need, cached under the same version as the profile"""
+    version = get_profile_version(user_id)
+    key = ACCESS_DATA_KEY.format(user_id=user_id, version=version)
+    data = cache.get(key)
+    if data is None:
+        user = User.objects.select_related('profile').filter(pk=user_id).first()
+        if user is None:
+            return None
+        data = {
+            'role': user.profile.role if hasattr(user, 'profile') else '',
+            'is_active': user.is_active,
+            'is_superuser': user.is_superuser,
+        }
+        cache.set(key, data, PROFILE_DATA_TIMEOUT)
+    return data
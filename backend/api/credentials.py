@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+KEY_SALT = 'api.credentials.CredentialCache'
+
+
+def credential_digest(user, password):
+    """Keyed HMAC of a submitted password, bound to the user's stored hash"""
+    # Including the stored hash means any password change invalidates every
+    # cached entry for the user, in every process, without a broadcast.
+    value = f'{user.pk}:{user.password}:{password}'
+    return salted_hmac(KEY_SALT, value, algorithm='sha256').digest()
+
+
+class CredentialCache:
+    """
+    Bounded LRU of recently verified credentials, one entry per user id.
+
+    Only the HMAC digest is kept, never the password or its hash, and entries
+    expire after ttl seconds whether or not they are used.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def check(self, user, password):
+        digest = credential_digest(user, password)
+        with self.lock:
+            entry = self.entries.get(user.pk)
+            if entry is None:
+                return False
+            cached_digest, expires = entry
+            if expires < time.monotonic():
+                del self.entries[user.pk]
+                return False
+            self.entries.move_to_end(user.pk)
+        return constant_time_compare(cached_digest, digest)
+
+    def add(self, user, password):
+        digest = credential_digest(user, password)
+        with self.lock:
+            self.entries[user.pk] = (digest, time.monotonic() + self.ttl)
+            self.entries.move_to_end(user.pk)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+credential_cache = CredentialCache(
+    max_entries=settings.CREDENTIAL_CACHE_MAX_ENTRIES,
+    ttl=settings.CREDENTIAL_CACHE_TTL,
+)
@@ -0,0 +1,66 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import get_profile_version
+
+RESPONSE_BODY_KEY = 'api:body:{scope}:{user_id}:{version}:{media_type}'
+RESPONSE_BODY_TIMEOUT = 300
+
+
+def conditional_response(scope, cache_body=False):
+    """
+    Decorate a GET handler whose output only changes with the user's profile.
+
+    Responses get a weak ETag built from the per-user profile version, so a
+    matching If-None-Match is answered with 304 before the handler runs. With
+    cache_body the rendered bytes are also kept in the API_RESPONSE_CACHE
+    backend and replayed until the version changes.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            user_id = request.user.pk
+            version = get_profile_version(user_id)
+            etag = f'W/"{scope}-{user_id}-{version}"'
+
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                return _finish(response, etag)
+
+            body_cache = caches[settings.API_RESPONSE_CACHE]
+            key = RESPONSE_BODY_KEY.format(
+                scope=scope, user_id=user_id, version=version, media_type=request.accepted_media_type
+            )
+            if cache_body:
+                cached = body_cache.get(key)
+                if cached is not None:
+                    content, content_type = cached
+                    return _finish(HttpResponse(content, content_type=content_type), etag)
+
+            response = handler(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            if cache_body:
+                response.add_post_render_callback(
+                    lambda rendered: body_cache.set(
+                        key, (rendered.content, rendered['Content-Type']), RESPONSE_BODY_TIMEOUT
+                    )
+                )
+            return _finish(response, etag)
+        return wrapper
+    return decorator
+
+
+def _finish(response, etag):
+    response['ETag'] = etag
+    # Per-user data: shared caches must not store it, browsers must revalidate
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import close_old_connections
+
+from .routers import pin_primary, request_scope
+from .tokens import token_for_user
+
+
+class PipelineSaturated(Exception):
+    """Raised when every hashing slot and queue slot is taken"""
+
+
+class LoginMetrics:
+    """Running totals for queue wait versus password verification time"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.verify_total = 0.0
+        self.verify_max = 0.0
+
+    def record(self, wait, verify):
+        with self.lock:
+            self.accepted += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.verify_total += verify
+            self.verify_max = max(self.verify_max, verify)
+
+    def snapshot(self):
+        with self.lock:
+            completed = self.accepted or 1
+            return {
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'in_flight': self.in_flight,
+                'queue_wait_ms_avg': self.wait_total / completed * 1000,
+                'queue_wait_ms_max': self.wait_max * 1000,
+                'verify_ms_avg': self.verify_total / completed * 1000,
+                'verify_ms_max': self.verify_max * 1000,
+            }
+
+
+class LoginPipeline:
+    """
+    Verifies credentials on a bounded thread pool so the event loop stays free.
+
+    PBKDF2 releases the GIL, so up to max_workers hashes run in parallel while
+    at most max_queue further logins wait for a thread. Anything beyond that is
+    rejected immediately rather than piling up behind the hashers.
+    """
+
+    def __init__(self, max_workers, max_queue):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='login')
+        self.capacity = max_workers + max_queue
+        self.metrics = LoginMetrics()
+
+    def _acquire(self):
+        with self.metrics.lock:
+            if self.metrics.in_flight >= self.capacity:
+                self.metrics.rejected += 1
+                raise PipelineSaturated()
+            self.metrics.in_flight += 1
+
+    def _release(self):
+        with self.metrics.lock:
+            self.metrics.in_flight -= 1
+
+    def _verify(self, queued_at, email, password):
+        started = time.perf_counter()
+        close_old_connections()
+        try:
+            # Worker threads outlive requests, so scope routing per login
+            with request_scope():
+                pin_primary()
+                user = authenticate(username=email, password=password)
+                verified = time.perf_counter()
+                refresh = token_for_user(user) if user else None
+        finally:
+            close_old_connections()
+        return refresh, started - queued_at, verified - started
+
+    async def login(self, email, password):
+        """Return (refresh token or None, queue wait seconds, verify seconds)"""
+        self._acquire()
+        try:
+            future = self.executor.submit(self._verify, time.perf_counter(), email, password)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the hash finishes, even if this request is
+        # cancelled (e.g. the client disconnected) while it waits
+        future.add_done_callback(lambda _: self._release())
+        refresh, wait, verify = await asyncio.wrap_future(future)
+        self.metrics.record(wait, verify)
+        return refresh, wait, verify
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    """Return the process-wide login pipeline, creating it from settings"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LoginPipeline(
+                max_workers=settings.LOGIN_MAX_CONCURRENCY or os.cpu_count() or 1,
+                max_queue=settings.LOGIN_MAX_QUEUE,
+            )
+        return _pipeline
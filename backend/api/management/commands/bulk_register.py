@@ -0,0 +1,41 @@
+import csv
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.bulk import read_csv, register_stream
+
+
+class Command(BaseCommand):
+    help = 'Register users from a CSV file with name, email, password and role columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path to the CSV file, or - for stdin')
+        parser.add_argument('--batch-size', type=int, help='Rows read and checked per batch')
+        parser.add_argument('--chunk-size', type=int, help='Rows inserted per transaction')
+        parser.add_argument('--workers', type=int, help='Password hashing processes')
+
+    def handle(self, *args, **options):
+        path = options['csv_file']
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        writer = csv.writer(self.stdout)
+        writer.writerow(['row', 'email', 'status', 'error'])
+        counts = {}
+        start = time.perf_counter()
+        try:
+            results = register_stream(
+                read_csv(stream),
+                batch_size=options['batch_size'],
+                chunk_size=options['chunk_size'],
+                workers=options['workers'],
+            )
+            for result in results:
+                writer.writerow([result['row'], result['email'], result['status'], result.get('error', '')])
+                counts[result['status']] = counts.get(result['status'], 0) + 1
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - start
+        summary = ', '.join(f'{count} {status}' for status, count in sorted(counts.items()))
+        self.stderr.write(f'{summary or "no rows"} in {elapsed:.1f}s')
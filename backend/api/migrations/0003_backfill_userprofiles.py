@@ -0,0 +1,41 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def backfill_profiles(apps, schema_editor):
+    """Give every user without a profile one, so role lookups never miss"""
+    User = apps.get_model('auth', 'User')
+    UserProfile = apps.get_model('api', 'UserProfile')
+    db_alias = schema_editor.connection.alias
+    last_pk = 0
+    while True:
+        # Keyset over the primary key so each batch is an index range scan
+        batch = list(
+            User.objects.using(db_alias)
+            .filter(pk__gt=last_pk, profile__isnull=True)
+            .order_by('pk')
+            .values_list('pk', 'is_superuser', 'is_staff')[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        profiles = [
+            UserProfile(user_id=pk, role='admin' if is_superuser else 'staff' if is_staff else 'client')
+            for pk, is_superuser, is_staff in batch
+        ]
+        with transaction.atomic(using=db_alias):
+            UserProfile.objects.using(db_alias).bulk_create(profiles, ignore_conflicts=True)
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+    # Commit per batch instead of holding one transaction over every user
+    atomic = False
+
+    dependencies = [
+        ('api', '0002_userprofile_role_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+# auth_user belongs to django.contrib.auth, so its extra indexes for the
+# /api/users/ prefix searches are created here with plain SQL. Each index
+# ends with id to match the keyset ordering (column, user_id).
+USER_INDEXES = {
+    'api_user_email_id_idx': 'email, id',
+    'api_user_first_name_id_idx': 'first_name, id',
+}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_backfill_userprofiles'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=f'CREATE INDEX IF NOT EXISTS {name} ON auth_user ({columns})',
+            reverse_sql=f'DROP INDEX IF EXISTS {name}',
+        )
+        for name, columns in USER_INDEXES.items()
+    ]
@@ -3,6 +3,11 @@ from django.contrib.auth.models import User
 
 # Create your models here.
 
+class UserProfileManager(models.Manager):
+    # Almost every profile lookup also reads the user's name or email
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+
 class UserProfile(models.Model):
     ROLE_CHOICES = [
         ("admin", "Admin"),
@@ -12,5 +17,13 @@ class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
 
+    objects = UserProfileManager()
+
+    class Meta:
+        indexes = [
+            # Role filters and keyset pagination by user within a role
+            models.Index(fields=['role', 'user'], name='api_profile_role_user_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} ({self.role})"
@@ -0,0 +1,122 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a values() queryset.
+
+    The cursor holds the ordering values of the last row served and the next
+    page starts with WHERE (a, b) > (x, y) instead of an OFFSET, so page
+    10,000 costs the same index seek as page 1. The last ordering field must
+    be unique so that ties are broken deterministically.
+    """
+
+    ordering = ('pk',)
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None, ordering=None, start=None):
+        """
+        Return one page of rows. start, if given, is a lower bound on the first
+        ordering field for the first page; later pages seek from the cursor.
+        """
+        self.request = request
+        self.ordering = tuple(ordering or self.ordering)
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        if position is not None:
+            position = self.clean_position(queryset.model, position)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.seek(position))
+        elif start is not None:
+            queryset = queryset.filter(**{f'{self.ordering[0]}__gte': start})
+        rows = list(queryset[:self.page_size + 1])
+        self.next_position = None
+        if len(rows) > self.page_size:
+            rows = rows[:self.page_size]
+            self.next_position = [rows[-1][field] for field in self.ordering]
+        return rows
+
+    def seek(self, position):
+        """Build the row-value comparison (ordering) > position"""
+        # (a > x) OR (a = x AND b > y) ..., led by a >= x so the database can
+        # seek into the index instead of evaluating the OR row by row
+        after = Q()
+        for i, field in enumerate(self.ordering):
+            equal = {self.ordering[j]: position[j] for j in range(i)}
+            after |= Q(**equal, **{f'{field}__gt': position[i]})
+        return Q(**{f'{self.ordering[0]}__gte': position[0]}) & after
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def ordering_field(self, model, path):
+        """Model field an ordering path such as profile__user_id ends at"""
+        *relations, name = path.split(LOOKUP_SEP)
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.pk if name == 'pk' else model._meta.get_field(name)
+
+    def clean_position(self, model, position):
+        """Coerce cursor values to their ordering fields' types, or reject the cursor"""
+        cleaned = []
+        for path, value in zip(self.ordering, position):
+            # Only scalars; to_python would happily stringify a dict for a CharField
+            if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                cleaned.append(self.ordering_field(model, path).to_python(value))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+        return cleaned
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode('ascii')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+
+class UserCursorPagination(KeysetPagination):
+    # auth_user.id, so users without a profile (createsuperuser, the admin
+    # site) are still listed
+    ordering = ('id',)
+    # A role filter joins the profile anyway; ordering by its user_id lets the
+    # (role, user) index serve both the filter and the ordering
+    role_ordering = ('profile__user_id',)
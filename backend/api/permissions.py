@@ -0,0 +1,18 @@
+from rest_framework import permissions
+
+from .cache import get_access_data
+
+
+class IsAdminRole(permissions.BasePermission):
+    """Allow active superusers and active users whose profile role is admin"""
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        # Not from token claims: a role change or deactivation has to apply
+        # before the token expires. The versioned cache makes this a cache hit.
+        data = get_access_data(user.pk)
+        if not data or not data['is_active']:
+            return False
+        return data['is_superuser'] or data['role'] == 'admin'
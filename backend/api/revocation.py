@@ -0,0 +1,111 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Revocations are an append-only log in the shared cache: a sequence counter
+# plus one entry per revoked token that expires along with the token. An
+# entry is (jti, exp) for one token, or (USER_ENTRY, user_id, revoked_at, exp)
+# for every token a user was issued before revoked_at.
+SEQUENCE_KEY = 'api:revoked:seq'
+ENTRY_KEY = 'api:revoked:{seq}'
+# revoke() publishes a sequence number just before writing its entry, so an
+# entry missing at sync time may still be on its way. Missing entries are
+# fetched again on later syncs for this long before being taken as expired.
+PENDING_SECONDS = 30
+USER_ENTRY = 'user'
+
+
+class RevocationList:
+    """
+    In-process set of revoked token ids, synced from the cache.
+
+    Checking a token is a set lookup. At most every sync_interval seconds the
+    list reads the cache's sequence counter and fetches only the entries
+    appended since the last sync, so logouts reach every worker quickly
+    without a cache round trip per request.
+    """
+
+    def __init__(self, sync_interval):
+        self.sync_interval = sync_interval
+        self.revoked = {}
+        # user id -> (tokens issued before this are revoked, until when)
+        self.revoked_users = {}
+        self.seq = 0
+        self.synced_at = 0.0
+        # Sequence numbers seen without an entry -> when first missed
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def publish(self, entry, exp):
+        timeout = max(1, int(exp - time.time()))
+        cache.add(SEQUENCE_KEY, 0, timeout=None)
+        seq = cache.incr(SEQUENCE_KEY)
+        cache.set(ENTRY_KEY.format(seq=seq), entry, timeout)
+        with self.lock:
+            self.apply(entry)
+
+    def revoke(self, jti, exp):
+        """Revoke a token id until its expiry timestamp"""
+        self.publish((jti, exp), exp)
+
+    def revoke_user(self, user_id, lifetime):
+        """Revoke every token issued to a user so far; lifetime is the longest a token lives"""
+        now = time.time()
+        exp = now + lifetime.total_seconds()
+        # Token claims carry the user id as a string
+        self.publish((USER_ENTRY, str(user_id), now, exp), exp)
+
+    def apply(self, entry):
+        if len(entry) == 2:
+            jti, exp = entry
+            self.revoked[jti] = exp
+        else:
+            _, user_id, revoked_at, exp = entry
+            previous = self.revoked_users.get(user_id, (0, 0))
+            self.revoked_users[user_id] = (max(previous[0], revoked_at), max(previous[1], exp))
+
+    def is_revoked(self, jti, user_id=None, issued_at=None):
+        if time.monotonic() - self.synced_at >= self.sync_interval:
+            self.sync()
+        if jti in self.revoked:
+            return True
+        revoked_at = self.revoked_users.get(str(user_id), (None,))[0]
+        # iat has whole seconds, so a token from the same second counts as earlier
+        return revoked_at is not None and issued_at is not None and issued_at <= revoked_at
+
+    def sync(self):
+        current = cache.get(SEQUENCE_KEY, 0)
+        now = time.monotonic()
+        with self.lock:
+            start = self.seq
+            self.seq = max(start, current)
+            self.synced_at = now
+            wanted = sorted(self.pending) + list(range(start + 1, current + 1))
+        found = cache.get_many([ENTRY_KEY.format(seq=seq) for seq in wanted]) if wanted else {}
+        expiry = time.time()
+        with self.lock:
+            for seq in wanted:
+                entry = found.get(ENTRY_KEY.format(seq=seq))
+                if entry is not None:
+                    self.apply(entry)
+                    self.pending.pop(seq, None)
+                elif now - self.pending.setdefault(seq, now) >= PENDING_SECONDS:
+                    # Still missing: the entry expired with its token
+                    del self.pending[seq]
+            self.revoked = {jti: exp for jti, exp in self.revoked.items() if exp > expiry}
+            self.revoked_users = {
+                user_id: revoked for user_id, revoked in self.revoked_users.items() if revoked[1] > expiry
+            }
+
+    def clear(self):
+        with self.lock:
+            self.revoked = {}
+            self.revoked_users = {}
+            self.seq = 0
+            self.synced_at = 0.0
+            self.pending = {}
+
+
+revocation_list = RevocationList(sync_interval=settings.JWT_REVOCATION_SYNC_SECONDS)
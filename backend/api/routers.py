@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+PRIMARY_DB = 'default'
+REPLICA_DB = 'replica'
+
+# Set once the current request has written to the primary (or asked to stay
+# on it) so every later read in the same request sees its own writes.
+_pinned = ContextVar('api_primary_pinned', default=False)
+
+
+def pin_primary():
+    """Send every remaining query in the current request to the primary"""
+    _pinned.set(True)
+
+
+@contextmanager
+def request_scope():
+    """Start a fresh routing scope, unpinned until the first write"""
+    token = _pinned.set(False)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads to the replica and writes to the primary.
+
+    Reads stick to the primary once the request has written, inside a
+    transaction, or after pin_primary(), which gives read-your-writes within a
+    request. Replica lag across requests is not hidden.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _pinned.get() or connections[PRIMARY_DB].in_atomic_block:
+            return PRIMARY_DB
+        return REPLICA_DB
+
+    def db_for_write(self, model, **hints):
+        pin_primary()
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB
@@ -0,0 +1,53 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import bump_profile_version
+from .credentials import credential_cache
+from .models import UserProfile
+from .revocation import revocation_list
+
+# Fields that appear in /api/me/ responses, token claims and permission checks.
+PROFILE_USER_FIELDS = {'first_name', 'email', 'username', 'is_active', 'is_superuser'}
+
+
+def _invalidate(user_id):
+    # Wait for the commit so a concurrent reader cannot repopulate the cache
+    # with the old row under the new version.
+    transaction.on_commit(lambda: bump_profile_version(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, update_fields=None, **kwargs):
+    # Logins save with update_fields={'last_login'}; those never change the profile
+    if update_fields is not None and not PROFILE_USER_FIELDS & set(update_fields):
+        return
+    _invalidate(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile(sender, instance, **kwargs):
+    _invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_credentials(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'password' not in update_fields:
+        return
+    credential_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens(sender, instance, created=False, update_fields=None, **kwargs):
+    # Tokens are checked against claims, not the User row, so deactivating a
+    # user or changing their password must revoke the tokens already issued.
+    # set_password() leaves the raw password in _password until save() returns.
+    deactivated = not instance.is_active and (update_fields is None or 'is_active' in update_fields)
+    if created or not (deactivated or instance._password is not None):
+        return
+    transaction.on_commit(lambda: revocation_list.revoke_user(instance.pk, api_settings.ACCESS_TOKEN_LIFETIME))
@@ -1,3 +1,434 @@
-from django.test import TestCase
+import asyncio
+import base64
+import json
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from . import login_pipeline
+from .authentication import ClaimsUser
+from .credentials import credential_cache
+from .models import UserProfile
+from .revocation import ENTRY_KEY, SEQUENCE_KEY, RevocationList, revocation_list
+from .routers import PrimaryReplicaRouter, request_scope
+from .tokens import token_for_user
 
 # Create your tests here.
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class MeViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='ann@example.com', email='ann@example.com',
+                                             password='secret-pass', first_name='Ann')
+        self.profile = UserProfile.objects.create(user=self.user, role='client')
+
+    def login(self):
+        response = self.client.post('/api/login/', {'email': 'ann@example.com', 'password': 'secret-pass'})
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['token']}")
+        return response
+
+    def test_me_answers_from_token_claims_without_queries(self):
+        self.login()
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/me/')
+        self.assertEqual(response.data, {'name': 'Ann', 'email': 'ann@example.com', 'role': 'client'})
+
+    def test_role_change_invalidates_token_claims(self):
+        self.login()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.role = 'staff'
+            self.profile.save()
+        response = self.client.get('/api/me/')
+        self.assertEqual(response.data['role'], 'staff')
+        # The refreshed payload is cached under the new version
+        with self.assertNumQueries(0):
+            self.client.get('/api/me/')
+
+    def test_name_change_invalidates_cached_payload(self):
+        self.login()
+        with override_settings(API_ME_FAST_PATH=False):
+            self.assertEqual(self.client.get('/api/me/').data['name'], 'Ann')
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.first_name = 'Anne'
+                self.user.save()
+            self.assertEqual(self.client.get('/api/me/').data['name'], 'Anne')
+
+    def test_me_returns_304_for_matching_etag(self):
+        self.login()
+        etag = self.client.get('/api/me/')['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        response = self.client.get('/api/me/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_etag_changes_with_profile(self):
+        self.login()
+        etag = self.client.get('/api/me/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.role = 'staff'
+            self.profile.save()
+        response = self.client.get('/api/me/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['role'], 'staff')
+
+    def test_rendered_body_is_replayed_from_cache(self):
+        self.login()
+        first = self.client.get('/api/me/')
+        with mock.patch('api.views.profile_from_claims') as claims, mock.patch('api.views.get_profile_data') as lookup:
+            second = self.client.get('/api/me/')
+        claims.assert_not_called()
+        lookup.assert_not_called()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_me_requires_authentication(self):
+        self.assertEqual(self.client.get('/api/me/').status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, BULK_REGISTER_WORKERS=1)
+class BulkRegisterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        admin = User.objects.create_user(username='admin@example.com', password='admin-pass')
+        UserProfile.objects.create(user=admin, role='admin')
+        self.client.force_authenticate(admin)
+
+    def test_bulk_register_reports_per_row_results(self):
+        User.objects.create_user(username='taken@example.com', password='x')
+        users = [
+            {'name': 'Bo', 'email': 'bo@example.com', 'password': 'pw', 'role': 'staff'},
+            {'name': 'Bo', 'email': 'bo@example.com', 'password': 'pw', 'role': 'staff'},
+            {'name': 'Cy', 'email': 'taken@example.com', 'password': 'pw', 'role': 'client'},
+            {'name': 'Di', 'email': 'di@example.com', 'password': 'pw', 'role': 'owner'},
+            {'name': 'Ed', 'email': 'ed@example.com', 'role': 'client'},
+        ]
+        response = self.client.post('/api/register/bulk/', {'users': users}, format='json')
+        self.assertEqual(response.status_code, 200)
+        statuses = [result['status'] for result in response.data['results']]
+        self.assertEqual(statuses, ['created', 'duplicate', 'exists', 'invalid', 'invalid'])
+        self.assertEqual(response.data['created'], 1)
+        created = User.objects.get(username='bo@example.com')
+        self.assertEqual(created.profile.role, 'staff')
+        self.assertTrue(created.check_password('pw'))
+
+    def test_bulk_register_accepts_csv_upload(self):
+        upload = SimpleUploadedFile('users.csv', b'name,email,password,role\nFay,fay@example.com,pw,client\n')
+        response = self.client.post('/api/register/bulk/', {'file': upload}, format='multipart')
+        self.assertEqual(response.data['created'], 1)
+        self.assertTrue(UserProfile.objects.filter(user__username='fay@example.com', role='client').exists())
+
+    def test_bulk_register_requires_admin_role(self):
+        client = User.objects.create_user(username='client@example.com', password='x')
+        UserProfile.objects.create(user=client, role='client')
+        self.client.force_authenticate(client)
+        response = self.client.post('/api/register/bulk/', {'users': []}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, LOGIN_MAX_CONCURRENCY=1, LOGIN_MAX_QUEUE=0)
+class AsyncLoginTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        login_pipeline._pipeline = None
+        user = User.objects.create_user(username='gus@example.com', email='gus@example.com',
+                                        password='secret-pass', first_name='Gus')
+        UserProfile.objects.create(user=user, role='staff')
+
+    async def test_async_login_issues_token_and_timings(self):
+        response = await self.async_client.post(
+            '/api/login/async/', {'email': 'gus@example.com', 'password': 'secret-pass'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['role'], 'staff')
+        self.assertIn('queue;dur=', response['Server-Timing'])
+        self.assertEqual(login_pipeline.get_pipeline().metrics.snapshot()['accepted'], 1)
+
+    async def test_async_login_rejects_bad_password(self):
+        response = await self.async_client.post(
+            '/api/login/async/', {'email': 'gus@example.com', 'password': 'wrong'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_saturated_pipeline_returns_503(self):
+        pipeline = login_pipeline.get_pipeline()
+        pipeline.metrics.in_flight = pipeline.capacity
+        response = await self.async_client.post(
+            '/api/login/async/', {'email': 'gus@example.com', 'password': 'secret-pass'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(pipeline.metrics.snapshot()['rejected'], 1)
+
+    async def test_non_object_json_body_is_rejected(self):
+        for body in (['gus@example.com'], 'gus@example.com', 7):
+            response = await self.async_client.post('/api/login/async/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+    async def test_cancelled_login_keeps_slot_until_hash_finishes(self):
+        pipeline = login_pipeline.get_pipeline()
+        started, finish = threading.Event(), threading.Event()
+
+        def slow_verify(queued_at, email, password):
+            started.set()
+            finish.wait(5)
+            return None, 0.0, 0.0
+
+        with mock.patch.object(pipeline, '_verify', slow_verify):
+            task = asyncio.ensure_future(pipeline.login('gus@example.com', 'secret-pass'))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The executor thread is still hashing, so the slot stays taken
+            self.assertEqual(pipeline.metrics.snapshot()['in_flight'], 1)
+            with self.assertRaises(login_pipeline.PipelineSaturated):
+                await pipeline.login('gus@example.com', 'secret-pass')
+            finish.set()
+            await asyncio.get_running_loop().run_in_executor(None, pipeline.executor.submit(lambda: None).result)
+        self.assertEqual(pipeline.metrics.snapshot()['in_flight'], 0)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, AUTHENTICATION_BACKENDS=['api.backends.CachedModelBackend'])
+class CredentialCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        credential_cache.clear()
+        self.user = User.objects.create_user(username='hal@example.com', password='secret-pass')
+
+    def login(self, password):
+        return self.client.post('/api/login/', {'email': 'hal@example.com', 'password': password})
+
+    def test_repeat_login_skips_hasher(self):
+        self.assertEqual(self.login('secret-pass').status_code, 200)
+        with mock.patch.object(User, 'check_password') as check_password:
+            self.assertEqual(self.login('secret-pass').status_code, 200)
+        check_password.assert_not_called()
+
+    def test_wrong_password_pays_full_hasher_cost(self):
+        self.login('secret-pass')
+        with mock.patch.object(User, 'check_password', return_value=False) as check_password:
+            self.assertEqual(self.login('wrong').status_code, 400)
+        check_password.assert_called_once_with('wrong')
+
+    def test_password_change_invalidates_cache(self):
+        self.login('secret-pass')
+        self.user.set_password('new-pass')
+        self.user.save()
+        self.assertEqual(self.login('secret-pass').status_code, 400)
+        self.assertEqual(self.login('new-pass').status_code, 200)
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def test_reads_stick_to_primary_after_a_write(self):
+        router = PrimaryReplicaRouter()
+        with request_scope():
+            self.assertEqual(router.db_for_read(User), 'replica')
+            self.assertEqual(router.db_for_write(User), 'default')
+            self.assertEqual(router.db_for_read(User), 'default')
+        with request_scope():
+            self.assertEqual(router.db_for_read(User), 'replica')
+
+    def test_migrations_only_run_on_primary(self):
+        router = PrimaryReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'api'))
+        self.assertFalse(router.allow_migrate('replica', 'api'))
+
+
+class BrowserOnlyMiddlewareTests(TestCase):
+    def test_api_requests_skip_browser_middleware(self):
+        response = self.client.post('/api/login/', {'email': 'nobody@example.com', 'password': 'x'})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('X-Frame-Options', response.headers)
+        self.assertNotIn('Cookie', response.headers.get('Vary', ''))
+
+    def test_admin_keeps_full_stack(self):
+        response = self.client.get('/admin/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertIn('csrftoken', response.cookies)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class StatelessAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        revocation_list.clear()
+        self.user = User.objects.create_user(username='ivy@example.com', email='ivy@example.com',
+                                             password='pw', first_name='Ivy')
+        UserProfile.objects.create(user=self.user, role='admin')
+        self.token = token_for_user(self.user).access_token
+
+    def test_claims_user_loads_row_only_for_model_fields(self):
+        user = ClaimsUser(self.token)
+        with self.assertNumQueries(0):
+            self.assertEqual((user.email, user.first_name, user.role), ('ivy@example.com', 'Ivy', 'admin'))
+        with self.assertNumQueries(1):
+            self.assertEqual(user.date_joined, self.user.date_joined)
+            self.assertEqual(user.profile.role, 'admin')
+
+    def test_logout_revokes_token(self):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {self.token}'}
+        self.assertEqual(self.client.post('/api/logout/', **headers).status_code, 200)
+        self.assertEqual(self.client.get('/api/me/', **headers).status_code, 401)
+
+    def test_revocations_sync_between_processes(self):
+        other_process = RevocationList(sync_interval=0)
+        revocation_list.revoke('abc', self.token['exp'])
+        self.assertTrue(other_process.is_revoked('abc'))
+        self.assertFalse(other_process.is_revoked('def'))
+
+    def test_revocation_published_before_its_entry_is_not_lost(self):
+        other_process = RevocationList(sync_interval=0)
+        # revoke() interrupted between publishing the sequence and writing the entry
+        cache.add(SEQUENCE_KEY, 0, timeout=None)
+        seq = cache.incr(SEQUENCE_KEY)
+        self.assertFalse(other_process.is_revoked('abc'))
+        cache.set(ENTRY_KEY.format(seq=seq), ('abc', self.token['exp']))
+        self.assertTrue(other_process.is_revoked('abc'))
+        self.assertEqual(other_process.pending, {})
+
+    def admin_status(self, user):
+        token = token_for_user(user).access_token
+        return self.client.get('/api/login/metrics/', HTTP_AUTHORIZATION=f'Bearer {token}').status_code
+
+    def test_deactivation_revokes_issued_tokens(self):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {self.token}'}
+        other_process = RevocationList(sync_interval=0)
+        self.assertEqual(self.client.get('/api/me/', **headers).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save(update_fields=['is_active'])
+        self.assertEqual(self.client.get('/api/me/', **headers).status_code, 401)
+        self.assertTrue(other_process.is_revoked(self.token['jti'], self.user.pk, self.token['iat']))
+        # Later tokens, e.g. after reactivation, are unaffected
+        self.assertFalse(other_process.is_revoked('later', self.user.pk, self.token['iat'] + 60))
+
+    def test_password_change_revokes_issued_tokens(self):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {self.token}'}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'Ivy B'
+            self.user.save()
+        self.assertEqual(self.client.get('/api/me/', **headers).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('new')
+            self.user.save()
+        self.assertEqual(self.client.get('/api/me/', **headers).status_code, 401)
+
+    def test_superuser_without_admin_profile_is_admin(self):
+        root = User.objects.create_superuser(username='root@example.com', email='root@example.com', password='pw')
+        UserProfile.objects.create(user=root, role='client')
+        self.assertEqual(self.admin_status(root), 200)
+
+    def test_demotion_and_deactivation_apply_before_token_expiry(self):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {self.token}'}
+        self.assertEqual(self.client.get('/api/login/metrics/', **headers).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.role = 'staff'
+            self.user.profile.save()
+        self.assertEqual(self.client.get('/api/login/metrics/', **headers).status_code, 403)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.role = 'admin'
+            self.user.profile.save()
+        self.assertEqual(self.client.get('/api/login/metrics/', **headers).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save(update_fields=['is_active'])
+        # Deactivation revokes the token outright
+        self.assertEqual(self.client.get('/api/login/metrics/', **headers).status_code, 401)
+
+
+class UserListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = User.objects.create_user(username='admin@example.com')
+        UserProfile.objects.create(user=admin, role='admin')
+        for i in range(5):
+            user = User.objects.create_user(username=f'staff{i}@example.com', email=f'staff{i}@example.com',
+                                            first_name='Sam')
+            UserProfile.objects.create(user=user, role='staff')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def test_pages_through_role_with_keyset_cursor(self):
+        seen = []
+        url = '/api/users/?role=staff&limit=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row['email'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [f'staff{i}@example.com' for i in range(5)])
+
+    def test_name_search_pages_through_ties(self):
+        seen = []
+        url = '/api/users/?name=Sa&limit=2&fields=email'
+        while url:
+            response = self.client.get(url)
+            seen.extend(row['email'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [f'staff{i}@example.com' for i in range(5)])
+
+    def test_prefix_search_is_case_sensitive(self):
+        User.objects.create_user(username='sally@example.com', email='sally@example.com', first_name='sally')
+        User.objects.create_user(username='SAM@example.com', email='SAM@example.com', first_name='SAM')
+
+        def names(query):
+            response = self.client.get(f'/api/users/?{query}&fields=email')
+            return [row['email'] for row in response.data['results']]
+
+        self.assertEqual(names('name=sa'), ['sally@example.com'])
+        self.assertEqual(names('name=SA'), ['SAM@example.com'])
+        self.assertEqual(len(names('name=Sa')), 5)
+        self.assertEqual(names('email=SAM'), ['SAM@example.com'])
+
+    def test_prefix_search_and_sparse_fields(self):
+        response = self.client.get('/api/users/?email=staff3&fields=id,email')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([set(row) for row in response.data['results']], [{'id', 'email'}])
+        self.assertEqual(response.data['results'][0]['email'], 'staff3@example.com')
+
+    def test_malformed_cursor_values_are_rejected(self):
+        for position in ([{'a': 1}], ['x'], [None], [True]):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode('ascii')
+            self.assertEqual(self.client.get(f'/api/users/?role=staff&cursor={cursor}').status_code, 404)
+        for position in ([{'a': 1}, 'x'], ['Sam', 'x'], ['Sam', [1]]):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode('ascii')
+            self.assertEqual(self.client.get(f'/api/users/?name=Sa&cursor={cursor}').status_code, 404)
+
+    def test_numeric_string_cursor_is_coerced(self):
+        user = User.objects.get(username='staff2@example.com')
+        cursor = base64.urlsafe_b64encode(json.dumps([str(user.pk)]).encode()).decode('ascii')
+        response = self.client.get(f'/api/users/?role=staff&cursor={cursor}&fields=email')
+        self.assertEqual([row['email'] for row in response.data['results']], ['staff3@example.com', 'staff4@example.com'])
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(self.client.get('/api/users/?fields=password').status_code, 400)
+
+    def test_users_without_a_profile_are_listed(self):
+        root = User.objects.create_superuser(username='root@example.com', email='root@example.com', password='pw')
+        seen = []
+        url = '/api/users/?limit=2&fields=email,role'
+        while url:
+            response = self.client.get(url)
+            seen.extend((row['email'], row['role']) for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(seen[-1], (root.email, None))
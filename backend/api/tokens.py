@@ -0,0 +1,25 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .cache import build_profile_data, get_profile_version
+
+# Claims copied into every access token so /api/me/ can answer without a query.
+PROFILE_CLAIMS = ('name', 'email', 'role')
+PROFILE_VERSION_CLAIM = 'pv'
+
+
+def token_for_user(user):
+    """Issue a refresh token carrying the user's profile as signed claims"""
+    refresh = RefreshToken.for_user(user)
+    for claim, value in build_profile_data(user).items():
+        refresh[claim] = value
+    refresh[PROFILE_VERSION_CLAIM] = get_profile_version(user.pk)
+    return refresh
+
+
+def profile_from_claims(token):
+    """Return the profile embedded in a token, or None if it is missing or stale"""
+    if token is None or any(claim not in token for claim in PROFILE_CLAIMS):
+        return None
+    if token.get(PROFILE_VERSION_CLAIM) != get_profile_version(token['user_id']):
+        return None
+    return {claim: token[claim] for claim in PROFILE_CLAIMS}
@@ -1,8 +1,13 @@
 from django.urls import path
-from .views import RegisterView, LoginView, MeView
+from .views import RegisterView, BulkRegisterView, LoginView, LoginMetricsView, LogoutView, MeView, UserListView, async_login
 
 urlpatterns = [
     path('register/', RegisterView.as_view()),
+    path('register/bulk/', BulkRegisterView.as_view()),
     path('login/', LoginView.as_view()),
+    path('login/async/', async_login),
+    path('login/metrics/', LoginMetricsView.as_view()),
+    path('logout/', LogoutView.as_view()),
     path('me/', MeView.as_view()),
+    path('users/', UserListView.as_view()),
 ] 
\ No newline at end of file
@@ -1,11 +1,25 @@
+import json
 from django.shortcuts import render
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.db.models import Q
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from rest_framework_simplejwt.tokens import RefreshToken
+from .bulk import read_csv, register_batch, register_stream
+from .cache import get_profile_data
+from .http_cache import conditional_response
+from .login_pipeline import PipelineSaturated, get_pipeline
 from .models import UserProfile
+from .pagination import UserCursorPagination
+from .permissions import IsAdminRole
+from .revocation import revocation_list
+from .routers import pin_primary
+from .tokens import token_for_user, profile_from_claims
 
 # Create your views here.
 
@@ -24,30 +38,144 @@ class RegisterView(APIView):
         UserProfile.objects.create(user=user, role=role)
         return Response({'success': True, 'name': name, 'email': email, 'role': role})
 
+class BulkRegisterView(APIView):
+    permission_classes = [IsAdminRole]
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is not None:
+            results = list(register_stream(read_csv(upload.file)))
+        else:
+            users = request.data.get('users')
+            if not isinstance(users, list):
+                return Response({'error': 'Provide a users list or a CSV file'}, status=400)
+            if len(users) > settings.BULK_REGISTER_MAX_ROWS:
+                return Response({'error': f'At most {settings.BULK_REGISTER_MAX_ROWS} users per request'}, status=400)
+            results = register_batch(users)
+        created = sum(1 for result in results if result['status'] == 'created')
+        return Response({'created': created, 'results': results})
+
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
     def post(self, request):
         email = request.data.get('email')
         password = request.data.get('password')
+        # A just-registered user may not have reached the replica yet
+        pin_primary()
         user = authenticate(username=email, password=password)
         if user:
-            refresh = RefreshToken.for_user(user)
-            role = user.profile.role if hasattr(user, 'profile') else ''
+            refresh = token_for_user(user)
             return Response({
-                'name': user.first_name,
-                'email': user.email,
-                'role': role,
+                'name': refresh['name'],
+                'email': refresh['email'],
+                'role': refresh['role'],
                 'token': str(refresh.access_token),
             })
         return Response({'error': 'Invalid credentials'}, status=400)
 
+@csrf_exempt
+@require_POST
+async def async_login(request):
+    """LoginView for ASGI: credentials are verified off the event loop"""
+    try:
+        data = json.loads(request.body or b'{}') if request.content_type == 'application/json' else request.POST
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+    try:
+        refresh, wait, verify = await get_pipeline().login(data.get('email'), data.get('password'))
+    except PipelineSaturated:
+        response = JsonResponse({'error': 'Too many login attempts in progress, retry shortly'}, status=503)
+        response['Retry-After'] = str(settings.LOGIN_RETRY_AFTER)
+        return response
+    if refresh is None:
+        response = JsonResponse({'error': 'Invalid credentials'}, status=400)
+    else:
+        response = JsonResponse({
+            'name': refresh['name'],
+            'email': refresh['email'],
+            'role': refresh['role'],
+            'token': str(refresh.access_token),
+        })
+    response['Server-Timing'] = f'queue;dur={wait * 1000:.1f}, verify;dur={verify * 1000:.1f}'
+    return response
+
+class LoginMetricsView(APIView):
+    permission_classes = [IsAdminRole]
+    def get(self, request):
+        return Response(get_pipeline().metrics.snapshot())
+
+class LogoutView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    def post(self, request):
+        revocation_list.revoke(request.auth['jti'], request.auth['exp'])
+        return Response({'success': True})
+
+# Public field name -> values() column for the user directory
+USER_LIST_FIELDS = {
+    'id': 'id',
+    'name': 'first_name',
+    'email': 'email',
+    'role': 'profile__role',
+}
+
+def prefix_filter(field, prefix):
+    """
+    Upper half of a prefix match written as a range. The lower bound comes
+    from the paginator, so the index seek starts at the cursor, not the prefix.
+
+    Matching is case-sensitive on every backend, like the (column, id)
+    indexes it seeks in. On SQLite the range compares bytes, which already
+    excludes other cases that its LIKE-based startswith would let through.
+    On PostgreSQL a locale collation can put other cases inside the range,
+    and startswith (a case-sensitive LIKE) drops them.
+    """
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{f'{field}__lt': upper, f'{field}__startswith': prefix})
+
+class UserListView(APIView):
+    permission_classes = [IsAdminRole]
+    def get(self, request):
+        params = request.query_params
+        fields = params['fields'].split(',') if params.get('fields') else list(USER_LIST_FIELDS)
+        unknown = [field for field in fields if field not in USER_LIST_FIELDS]
+        if unknown:
+            return Response({'error': f"Unknown fields: {', '.join(unknown)}"}, status=400)
+
+        queryset = User.objects.all()
+        ordering = UserCursorPagination.ordering
+        start = None
+        if params.get('role'):
+            queryset = queryset.filter(profile__role=params['role'])
+            ordering = UserCursorPagination.role_ordering
+        # Searches walk the auth_user (column, id) indexes from migration 0004
+        if params.get('name'):
+            queryset = queryset.filter(prefix_filter('first_name', params['name']))
+            ordering, start = ('first_name', 'id'), params['name']
+        if params.get('email'):
+            queryset = queryset.filter(prefix_filter('email', params['email']))
+            ordering, start = ('email', 'id'), params['email']
+
+        # Only fetch the columns the client renders, plus the cursor keys
+        columns = {USER_LIST_FIELDS[field] for field in fields} | set(ordering)
+        paginator = UserCursorPagination()
+        page = paginator.paginate_queryset(
+            queryset.values(*columns), request, view=self, ordering=ordering, start=start
+        )
+        return paginator.get_paginated_response([
+            {field: row[USER_LIST_FIELDS[field]] for field in fields}
+            for row in page
+        ])
+
 class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    @conditional_response('me', cache_body=True)
     def get(self, request):
-        user = request.user
-        role = user.profile.role if hasattr(user, 'profile') else ''
-        return Response({
-            'name': user.first_name,
-            'email': user.email,
-            'role': role,
-        })
+        data = None
+        if settings.API_ME_FAST_PATH:
+            data = profile_from_claims(request.auth)
+        if data is None:
+            data = get_profile_data(request.user.pk)
+        if data is None:
+            return Response({'error': 'User not found'}, status=404)
+        return Response(data)
@@ -58,14 +58,31 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     # Default middleware
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Browser-only middleware, skipped for requests under API_URL_PREFIX
+    'api.middleware.SessionMiddleware',
+    'api.middleware.CsrfViewMiddleware',
+    'api.middleware.AuthenticationMiddleware',
+    'api.middleware.MessageMiddleware',
+    'api.middleware.XFrameOptionsMiddleware',
+    # Local middleware
+    'api.middleware.DatabaseRoutingMiddleware',
 ]
 
+# The JWT-authenticated JSON API is served under this prefix
+API_URL_PREFIX = '/api/'
+
+REST_FRAMEWORK = {
+    # Sessions are not available under API_URL_PREFIX. Request users are
+    # built from token claims; see api.authentication.ClaimsUser.
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'api.authentication.StatelessJWTAuthentication',
+    ],
+}
+
+# How often each worker pulls newly revoked (logged out) tokens from the cache
+JWT_REVOCATION_SYNC_SECONDS = int(os.getenv('JWT_REVOCATION_SYNC_SECONDS', '5'))
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True  # For development only
 
@@ -93,14 +110,75 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': dj_database_url.config(
-        default=os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3'),
-        conn_max_age=600,
-        conn_health_checks=True,
+# DATABASE_POOL=True uses Django's psycopg 3 connection pool on PostgreSQL
+# (pip install "psycopg[pool]"). DATABASE_PGBOUNCER=True is for a transaction-
+# pooling PgBouncer in front of the server: Django then opens a connection
+# per request and avoids server-side cursors, and PgBouncer does the pooling.
+DATABASE_POOL = os.getenv('DATABASE_POOL', 'False') == 'True'
+DATABASE_PGBOUNCER = os.getenv('DATABASE_PGBOUNCER', 'False') == 'True'
+
+
+def database_config(url):
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=0 if DATABASE_POOL or DATABASE_PGBOUNCER else 600,
+        conn_health_checks=not (DATABASE_POOL or DATABASE_PGBOUNCER),
     )
+    if config['ENGINE'] == 'django.db.backends.postgresql':
+        if DATABASE_POOL:
+            config.setdefault('OPTIONS', {})['pool'] = {
+                'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', '2')),
+                'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', '10')),
+                'timeout': int(os.getenv('DATABASE_POOL_TIMEOUT', '10')),
+            }
+        if DATABASE_PGBOUNCER:
+            config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
+
+
+DATABASES = {
+    'default': database_config(os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3')),
 }
 
+# Read-only queries go to the replica; see api.routers for stickiness rules
+if os.getenv('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = database_config(os.getenv('DATABASE_REPLICA_URL'))
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['api.routers.PrimaryReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Profile invalidation must reach every worker, so point REDIS_URL at a shared
+# Redis in production; the local-memory default only suits a single process.
+
+# The "responses" alias holds rendered API bodies (see api.http_cache).
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        },
+        'responses': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'responses',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'responses': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'responses',
+        },
+    }
+
+API_RESPONSE_CACHE = os.getenv('API_RESPONSE_CACHE', 'responses')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -121,6 +199,17 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Opt-in cache of recently verified logins so repeat logins skip the hasher
+CREDENTIAL_CACHE = os.getenv('CREDENTIAL_CACHE', 'False') == 'True'
+CREDENTIAL_CACHE_TTL = int(os.getenv('CREDENTIAL_CACHE_TTL', '300'))
+CREDENTIAL_CACHE_MAX_ENTRIES = int(os.getenv('CREDENTIAL_CACHE_MAX_ENTRIES', '10000'))
+
+if CREDENTIAL_CACHE:
+    AUTHENTICATION_BACKENDS = ['api.backends.CachedModelBackend']
+else:
+    AUTHENTICATION_BACKENDS = ['api.backends.ProfileModelBackend']
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -143,6 +232,23 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Serve /api/me/ from the name/email/role claims in the access token
+API_ME_FAST_PATH = os.getenv('API_ME_FAST_PATH', 'True') == 'True'
+
+# Bulk registration: rows per JSON request, rows read per batch from a CSV
+# stream, rows per insert transaction and password hashing processes
+BULK_REGISTER_MAX_ROWS = int(os.getenv('BULK_REGISTER_MAX_ROWS', '10000'))
+BULK_REGISTER_BATCH_SIZE = int(os.getenv('BULK_REGISTER_BATCH_SIZE', '5000'))
+BULK_REGISTER_CHUNK_SIZE = int(os.getenv('BULK_REGISTER_CHUNK_SIZE', '500'))
+BULK_REGISTER_WORKERS = int(os.getenv('BULK_REGISTER_WORKERS', str(os.cpu_count() or 1)))
+
+# Async login (/api/login/async/ under ASGI): password hashing threads
+# (0 = one per CPU), logins allowed to wait for a thread before new ones get a
+# 503, and the Retry-After seconds sent with that 503
+LOGIN_MAX_CONCURRENCY = int(os.getenv('LOGIN_MAX_CONCURRENCY', '0'))
+LOGIN_MAX_QUEUE = int(os.getenv('LOGIN_MAX_QUEUE', '32'))
+LOGIN_RETRY_AFTER = int(os.getenv('LOGIN_RETRY_AFTER', '1'))
+
 # Supabase settings
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY')
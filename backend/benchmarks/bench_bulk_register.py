@@ -0,0 +1,58 @@
+"""
+Benchmark bulk registration throughput against the one-request-per-user flow.
+
+"sequential" replays RegisterView row by row: an exists() query, create_user
+and a separate UserProfile insert. "bulk" runs api.bulk.register_batch. With
+--pbkdf2 the real default hasher is used; otherwise MD5 isolates the database
+work from hashing cost.
+"""
+
+import argparse
+import time
+
+from harness import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--pbkdf2', action='store_true', help='Hash with the production PBKDF2 hasher')
+    args = parser.parse_args()
+
+    setup_django(fast_hashing=not args.pbkdf2)
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+
+    from api.bulk import register_batch
+    from api.models import UserProfile
+
+    def rows(prefix):
+        return [
+            {'name': f'User {i}', 'email': f'{prefix}{i}@example.com', 'password': f'pw-{i}', 'role': 'client'}
+            for i in range(args.count)
+        ]
+
+    def sequential(batch):
+        for row in batch:
+            if User.objects.filter(username=row['email']).exists():
+                continue
+            user = User.objects.create_user(username=row['email'], email=row['email'],
+                                            password=row['password'], first_name=row['name'])
+            UserProfile.objects.create(user=user, role=row['role'])
+
+    print(f"{args.count} accounts, {connection.vendor}, workers={args.workers or 'default'}")
+    for label, run, prefix in [
+        ('sequential (RegisterView loop)', sequential, 'seq'),
+        ('bulk (register_batch)', lambda batch: register_batch(batch, workers=args.workers), 'bulk'),
+    ]:
+        batch = rows(prefix)
+        start = time.perf_counter()
+        run(batch)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<32} {elapsed:>8.2f} s {args.count / elapsed:>10.0f} accounts/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark database connection handling for read-heavy /api/me/ traffic.
+
+Uses file-backed SQLite as a stand-in: the replica alias points at the same
+file, so the numbers show connection and routing overhead rather than any
+offloading. Each request clears the profile cache so it really queries.
+Against PostgreSQL, connection setup is far more expensive (TCP, TLS, auth
+and a backend fork), so the gap between "reconnect per request" and a
+persistent or pooled connection widens accordingly.
+"""
+
+import argparse
+import os
+import tempfile
+
+from harness import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    url = f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}"
+    os.environ['DATABASE_URL'] = url
+    os.environ['DATABASE_REPLICA_URL'] = url
+    os.environ['API_ME_FAST_PATH'] = 'False'
+    setup_django(test_db=False)
+
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.db import connections
+    from django.test import Client, override_settings
+
+    from api.models import UserProfile
+    from api.tokens import token_for_user
+
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='db@example.com', email='db@example.com', password='pw')
+    UserProfile.objects.create(user=user, role='client')
+    token = str(token_for_user(user).access_token)
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def request():
+        cache.clear()
+        response = client.get('/api/me/')
+        assert response.status_code == 200, response.content
+
+    def set_conn_max_age(seconds):
+        for alias in ('default', 'replica'):
+            connections[alias].close()
+            connections[alias].settings_dict['CONN_MAX_AGE'] = seconds
+
+    with override_settings(DATABASE_ROUTERS=[]):
+        set_conn_max_age(0)
+        report('primary only, reconnect per request', *measure(request, args.requests))
+        set_conn_max_age(600)
+        report('primary only, persistent connection', *measure(request, args.requests))
+    report('primary + replica router, persistent', *measure(request, args.requests))
+
+
+if __name__ == '__main__':
+    main()
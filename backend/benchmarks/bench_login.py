@@ -0,0 +1,56 @@
+"""
+Load-test LoginView latency with the verified-credential cache off and on.
+
+A pool of users logs in repeatedly from --threads concurrent clients using
+the production PBKDF2 hasher. The first login per user always pays the full
+hasher cost; with the cache on, later ones within the TTL do not.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import percentile, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--logins', type=int, default=50, help='Total logins per run')
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    setup_django(fast_hashing=False)
+
+    from django.contrib.auth.models import User
+    from django.test import Client, override_settings
+
+    from api.credentials import credential_cache
+    from api.models import UserProfile
+
+    for i in range(args.users):
+        user = User.objects.create_user(username=f'load{i}@example.com', password=f'pw-{i}')
+        UserProfile.objects.create(user=user, role='client')
+
+    def login(i):
+        start = time.perf_counter()
+        response = Client().post('/api/login/', {'email': f'load{i}@example.com', 'password': f'pw-{i}'})
+        assert response.status_code == 200, response.content
+        return (time.perf_counter() - start) * 1000
+
+    for label, backends in [
+        ('cache off', ['django.contrib.auth.backends.ModelBackend']),
+        ('cache on', ['api.backends.CachedModelBackend']),
+    ]:
+        credential_cache.clear()
+        with override_settings(AUTHENTICATION_BACKENDS=backends):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                samples = list(pool.map(login, (n % args.users for n in range(args.logins))))
+            elapsed = time.perf_counter() - start
+        print(f"{label:<10} p50 {percentile(samples, 50):>8.1f} ms  p99 {percentile(samples, 99):>8.1f} ms"
+              f"  {args.logins / elapsed:>7.1f} logins/s")
+
+
+if __name__ == '__main__':
+    main()
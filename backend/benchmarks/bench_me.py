@@ -0,0 +1,75 @@
+"""
+Benchmark /api/me/ requests per second before and after the claims fast path.
+
+"before" replays the original view: the user row is loaded by JWTAuthentication
+and the profile by a second query. "cache" skips the claims and answers from the
+versioned per-user cache. "claims" answers straight from the access token.
+"304" revalidates with If-None-Match and "body cache" replays the rendered
+response; both skip the view body entirely.
+"""
+
+import argparse
+
+from harness import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.test import override_settings
+    from rest_framework import permissions
+    from rest_framework.response import Response
+    from rest_framework.test import APIRequestFactory
+    from rest_framework.views import APIView
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    from api.models import UserProfile
+    from api.tokens import token_for_user
+    from api.views import MeView
+
+    class BaselineMeView(APIView):
+        authentication_classes = [JWTAuthentication]
+        permission_classes = [permissions.IsAuthenticated]
+
+        def get(self, request):
+            user = request.user
+            role = user.profile.role if hasattr(user, 'profile') else ''
+            return Response({'name': user.first_name, 'email': user.email, 'role': role})
+
+    user = User.objects.create_user(username='bench@example.com', email='bench@example.com',
+                                    password='bench-pass', first_name='Bench')
+    UserProfile.objects.create(user=user, role='client')
+    token = str(token_for_user(user).access_token)
+
+    factory = APIRequestFactory()
+    class UncachedMeView(MeView):
+        get = MeView.get.__wrapped__
+
+    baseline_view = BaselineMeView.as_view()
+    uncached_view = UncachedMeView.as_view()
+    me_view = MeView.as_view()
+
+    def call(view, status=200, **headers):
+        request = factory.get('/api/me/', HTTP_AUTHORIZATION=f'Bearer {token}', **headers)
+        response = view(request)
+        if hasattr(response, 'render'):
+            response.render()
+        assert response.status_code == status, response.status_code
+        return response
+
+    report('before (JWT user fetch + profile join)', *measure(lambda: call(baseline_view), args.requests))
+    with override_settings(API_ME_FAST_PATH=False):
+        report('after, versioned cache', *measure(lambda: call(uncached_view), args.requests))
+    report('after, token claims', *measure(lambda: call(uncached_view), args.requests))
+    report('after, rendered body cache', *measure(lambda: call(me_view), args.requests))
+    etag = call(me_view)['ETag']
+    report('after, 304 Not Modified', *measure(lambda: call(me_view, 304, HTTP_IF_NONE_MATCH=etag), args.requests))
+
+
+if __name__ == '__main__':
+    main()
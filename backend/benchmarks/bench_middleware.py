@@ -0,0 +1,65 @@
+"""
+Micro-benchmark per-request middleware overhead on the JSON API.
+
+Runs RegisterView, LoginView and MeView through the full Django handler with
+the stock middleware stack and with the API-scoped stack from settings, where
+sessions, CSRF, auth, messages and frame options are skipped under /api/.
+"""
+
+import argparse
+import itertools
+
+from harness import measure, report, setup_django
+
+STOCK_MIDDLEWARE = [
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.DatabaseRoutingMiddleware',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client, override_settings
+
+    from api.models import UserProfile
+    from api.tokens import token_for_user
+
+    user = User.objects.create_user(username='mw@example.com', email='mw@example.com', password='pw')
+    UserProfile.objects.create(user=user, role='client')
+    token = str(token_for_user(user).access_token)
+    counter = itertools.count()
+
+    def register(client):
+        email = f'new{next(counter)}@example.com'
+        data = {'name': 'New', 'email': email, 'password': 'pw', 'role': 'client'}
+        assert client.post('/api/register/', data).status_code == 200
+
+    def login(client):
+        assert client.post('/api/login/', {'email': 'mw@example.com', 'password': 'pw'}).status_code == 200
+
+    def me(client):
+        assert client.get('/api/me/', HTTP_AUTHORIZATION=f'Bearer {token}').status_code == 200
+
+    for name, view in [('RegisterView', register), ('LoginView', login), ('MeView', me)]:
+        for label, middleware in [('stock', STOCK_MIDDLEWARE), ('api-scoped', settings.MIDDLEWARE)]:
+            with override_settings(MIDDLEWARE=middleware):
+                client = Client()
+                report(f'{name}, {label} middleware', *measure(lambda: view(client), args.requests))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark /api/users/ page latency deep into a million-account directory.
+
+Seeds --rows users and profiles into a file-backed SQLite database, then times
+pages served by UserListView at increasing depths: plain id order, a role
+filter and an email prefix search, each compared against the equivalent
+OFFSET query the keyset cursor replaces.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from harness import percentile, setup_django
+
+ROLES = ('admin', 'staff', 'client', 'client', 'client')
+NAMES = ('Alice', 'Bob', 'Carol', 'Dan', 'Eve', 'Faith', 'Grace', 'Heidi', 'Ivan', 'Judy')
+
+
+def seed(rows):
+    from django.db import connection, transaction
+
+    random.seed(1)
+    batch = 50000
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(1, rows + 1, batch):
+            ids = range(start, min(start + batch, rows + 1))
+            cursor.executemany(
+                "INSERT INTO auth_user (id, password, is_superuser, username, first_name, last_name, email,"
+                " is_staff, is_active, date_joined) VALUES (%s, '!', 0, %s, %s, '', %s, 0, 1, '2025-01-01')",
+                [(i, f'user{i:07d}@example.com', random.choice(NAMES), f'user{i:07d}@example.com') for i in ids],
+            )
+            cursor.executemany(
+                "INSERT INTO api_userprofile (user_id, role) VALUES (%s, %s)",
+                [(i, random.choice(ROLES)) for i in ids],
+            )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--samples', type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'users.sqlite3')}"
+    setup_django(test_db=False)
+
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from api.pagination import UserCursorPagination
+    from api.views import UserListView
+
+    call_command('migrate', verbosity=0)
+    start = time.perf_counter()
+    seed(args.rows)
+    print(f"seeded {args.rows} users in {time.perf_counter() - start:.1f}s")
+
+    admin = User.objects.get(pk=1)
+    admin.is_superuser = True
+    factory = APIRequestFactory()
+    view = UserListView.as_view()
+    paginator = UserCursorPagination()
+
+    def timed(fn):
+        samples = []
+        for _ in range(args.samples):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        return f"p50 {percentile(samples, 50):7.2f} ms  p99 {percentile(samples, 99):7.2f} ms"
+
+    def page(query, position=None):
+        if position is not None:
+            query += f"&cursor={paginator.encode_cursor(position)}"
+        request = factory.get(f'/api/users/?{query}')
+        force_authenticate(request, user=admin)
+        response = view(request)
+        assert response.status_code == 200, response.data
+        assert len(response.data['results']) == 50, query
+
+    def offset_page(queryset, offset):
+        list(queryset[offset:offset + 50])
+
+    columns = ('id', 'first_name', 'email', 'profile__role')
+    users = User.objects.values(*columns)
+    for depth in (0.0, 0.5, 0.9):
+        last_id = int(args.rows * depth)
+        email = f'user{last_id:07d}@example.com'
+        print(f"depth {depth:.0%}")
+        print(f"  keyset, id order      {timed(lambda: page('limit=50', [last_id]))}")
+        print(f"  OFFSET, id order      {timed(lambda: offset_page(users.order_by('id'), last_id))}")
+        print(f"  keyset, role=staff    {timed(lambda: page('role=staff&limit=50', [last_id]))}")
+        print(f"  OFFSET, role=staff    {timed(lambda: offset_page(users.filter(profile__role='staff').order_by('id'), last_id // 5))}")
+        print(f"  keyset, email=user    {timed(lambda: page('email=user&limit=50', [email, last_id]))}")
+        print(f"  OFFSET, email=user    {timed(lambda: offset_page(users.filter(email__startswith='user').order_by('email', 'id'), last_id))}")
+        print(f"  keyset, name=Gr       {timed(lambda: page('name=Gr&fields=id,name&limit=50', ['Grace', last_id]))}")
+
+
+if __name__ == '__main__':
+    main()
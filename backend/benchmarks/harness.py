@@ -0,0 +1,56 @@
+"""
+Shared setup for the API benchmarks.
+
+Each benchmark runs against a throwaway test database (in-memory for SQLite)
+so it never touches db.sqlite3. Run them from the backend directory, e.g.
+
+    python benchmarks/bench_me.py
+"""
+
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(fast_hashing=True, test_db=True):
+    """Configure Django and create a throwaway test database"""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    if fast_hashing:
+        # Keeps fixture creation out of the numbers
+        settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    if test_db:
+        connection.creation.create_test_db(verbosity=0)
+
+
+def measure(fn, iterations):
+    """Call fn repeatedly and return (requests per second, mean ms)"""
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed, elapsed / iterations * 1000
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label, rps, mean_ms):
+    print(f"{label:<40} {rps:>10.0f} req/s {mean_ms:>8.3f} ms/req")
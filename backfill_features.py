@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Feature backfill for the Image Container.
+Extracts dimensions, file size, capture time, colour histogram and
+difference hash for catalog entries that have none yet, e.g. images
+imported before feature extraction existed, on a process pool.
+
+Usage:
+  python backfill_features.py
+  python backfill_features.py --workers 4
+"""
+
+import argparse
+import sys
+import time
+
+from image_core.catalog import open_catalog
+from image_core.features import backfill_features, open_feature_store
+
+def main(argv=None):
+    """Index every catalog entry missing from the feature store"""
+    parser = argparse.ArgumentParser(description="Extract features for images that have none yet")
+    parser.add_argument("--images", default="images", help="collection folder (default: images)")
+    parser.add_argument("--workers", type=int, help="extraction processes")
+    args = parser.parse_args(argv)
+
+    def on_progress(done, total):
+        if done % 100 == 0 or done == total:
+            print(f"  {done}/{total} images indexed", file=sys.stderr)
+
+    catalog = open_catalog(args.images)
+    start = time.perf_counter()
+    try:
+        store = open_feature_store(args.images)
+        indexed, errors = backfill_features(catalog, store, args.images, args.workers, on_progress)
+    finally:
+        catalog.close()
+    elapsed = time.perf_counter() - start
+
+    for source, error in errors:
+        print(f"✗ {source}: {error}")
+    rate = indexed / elapsed if elapsed else 0.0
+    print(f"Indexed {indexed} image(s) ({len(errors)} errors) in {elapsed:.2f}s: {rate:.1f} images/s")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Window background that follows the window size.
+
+Shows a BackgroundAssets variant scaled to the label. During a resize it
+blits the nearest stored variant after a cheap bilinear resample; once the
+size has settled, the exact variant is rendered on the task runner (or
+inline without one) and swapped in.
+"""
+
+import tkinter as tk
+from PIL import ImageTk
+
+# Quiet period after the last <Configure> before rendering the exact size
+SETTLE_MS = 250
+
+class BackgroundLabel(tk.Label):
+    """Label whose image is the background asset at the label's current size"""
+
+    def __init__(self, master, assets, tasks=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.assets = assets
+        self.tasks = tasks
+        self.size = None
+        self.photo = None
+        self.pending = None
+        self.bind("<Configure>", self.resized)
+
+    def resized(self, event):
+        size = (event.width, event.height)
+        if size == self.size or min(size) < 2:
+            return
+        self.size = size
+        self.show()
+        if self.pending:
+            self.after_cancel(self.pending)
+        # Nothing to stand in yet: render straight away rather than after the settle delay
+        delay = SETTLE_MS if self.photo else 0
+        self.pending = self.after(delay, self.render_exact)
+
+    def show(self):
+        img = self.assets.fit(self.size)
+        if img is not None:
+            self.photo = ImageTk.PhotoImage(img)
+            self.config(image=self.photo)
+
+    def render_exact(self):
+        self.pending = None
+        size = self.size
+        if self.assets.has(size):
+            self.show()
+        elif self.tasks:
+            self.tasks.submit(
+                self.assets.render_variant, size,
+                on_done=lambda path: self.rendered(size),
+                on_error=lambda e: print(f"Could not render background: {e}")
+            )
+        else:
+            self.assets.render_variant(size)
+            self.show()
+
+    def rendered(self, size):
+        # Skip if the window was resized again or closed while rendering
+        if size == self.size and self.winfo_exists():
+            self.show()
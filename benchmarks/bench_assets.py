@@ -0,0 +1,79 @@
+"""
+Benchmark background rendering per window size.
+
+legacy: what create_ui did on every launch and window recreation, i.e.
+open background.jpg and LANCZOS-resize it to the window. BackgroundAssets:
+"render" is the one-off full-quality variant for a size, "exact" decodes
+the stored variant (every later launch at that size), and "stand-in" is
+what a resize to a not-yet-rendered size shows, a bilinear resample of
+the nearest stored variant.
+
+Run from the repository root:
+
+    python benchmarks/bench_assets.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from image_core.assets import BackgroundAssets
+
+SIZES = [(800, 600), (1280, 800), (1920, 1080), (3840, 2160)]
+
+
+def legacy_background(path, size):
+    return Image.open(path).resize(size, Image.Resampling.LANCZOS)
+
+
+def best_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", type=int, nargs=2, default=[4000, 3000], help="background.jpg size")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        width, height = args.source
+        rng = np.random.default_rng(0)
+        pixels = np.linspace(0, 255, width, dtype=np.float32)[None, :, None] * np.ones((height, 1, 3), np.float32)
+        pixels += rng.normal(0, 10, (height, 1, 3))
+        source = os.path.join(workdir, "background.jpg")
+        Image.fromarray(pixels.clip(0, 255).astype(np.uint8)).save(source, quality=90)
+        print(f"background.jpg {width}x{height}")
+
+        cache_dir = os.path.join(workdir, "cache")
+        print(f"{'window':>10} {'legacy':>9} {'render':>9} {'exact':>9} {'stand-in':>9}")
+        for size in SIZES:
+            assets = BackgroundAssets.for_file(source, cache_dir)
+            # Stand-in: only the variants of the sizes before this one exist
+            stand_in = best_ms(lambda: assets.fit((size[0] + 40, size[1] + 30)), args.repeat) if assets.variants else None
+            legacy = best_ms(lambda: legacy_background(source, size), args.repeat)
+            render = best_ms(lambda: assets.render_variant(size), 1)
+            # Fresh instance, as on the next launch: nothing decoded in memory yet
+            exact = best_ms(lambda: BackgroundAssets.for_file(source, cache_dir).fit(size), args.repeat)
+            stand_in = f"{stand_in:>6.1f} ms" if stand_in is not None else f"{'-':>9}"
+            print(f"{size[0]:>5}x{size[1]:<4} {legacy:>6.1f} ms {render:>6.1f} ms {exact:>6.1f} ms {stand_in}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark procedural background generation.
+
+legacy: the old 800x600 gradient, one Image.putpixel call per pixel.
+The rest render through image_core.backgrounds at several sizes, and
+"cached" times save_background when the rendered file is already in
+the cache (what every launch after the first pays).
+
+Run from the repository root:
+
+    python benchmarks/bench_backgrounds.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from image_core.backgrounds import DEFAULT_BACKGROUND, linear_gradient, radial_gradient, save_background
+
+SIZES = {"800x600": (800, 600), "1080p": (1920, 1080), "4K": (3840, 2160)}
+
+
+def legacy_gradient(width=800, height=600):
+    image = Image.new("RGB", (width, height))
+    for y in range(height):
+        for x in range(width):
+            image.putpixel((x, y), (int(200 - y / 3), int(220 - y / 3), int(240 - y / 6)))
+    return image
+
+
+def best_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start, end = DEFAULT_BACKGROUND["start"], DEFAULT_BACKGROUND["end"]
+    print(f"{'legacy putpixel 800x600':<28} {best_ms(legacy_gradient, 1):>9.1f} ms")
+    for label, size in SIZES.items():
+        for name, fn in (
+            ("linear", lambda: linear_gradient(size, start, end, dither=False)),
+            ("linear+dither", lambda: linear_gradient(size, start, end, angle=30)),
+            ("radial+dither", lambda: radial_gradient(size, start, end)),
+        ):
+            print(f"{name + ' ' + label:<28} {best_ms(fn, args.repeat):>9.1f} ms")
+
+    workdir = tempfile.mkdtemp()
+    try:
+        cache_dir = os.path.join(workdir, "cache")
+        target = os.path.join(workdir, "background.jpg")
+        print(f"{'save_background, miss':<28} {best_ms(lambda: save_background(target, cache_dir=cache_dir), 1):>9.1f} ms")
+        print(f"{'save_background, cached':<28} {best_ms(lambda: save_background(target, cache_dir=cache_dir), args.repeat):>9.1f} ms")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
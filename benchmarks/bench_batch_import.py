@@ -0,0 +1,71 @@
+"""
+Benchmark batch import throughput.
+
+Compares the old per-file path (shutil.copy2 then one catalog INSERT per
+file, no hashing) with import_batch, which copies and hashes in one read
+on a thread pool and commits once.
+
+Run from the repository root:
+
+    python benchmarks/bench_batch_import.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_core.batch import import_batch
+from image_core.catalog import ImageCatalog
+
+
+def legacy_import(catalog, image_folder, paths):
+    for path in paths:
+        original = os.path.basename(path)
+        new_filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{original}"
+        shutil.copy2(path, os.path.join(image_folder, new_filename))
+        catalog.add(new_filename, original, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--kb", type=int, default=512, help="size of each file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(workdir, "dump")
+        os.makedirs(source)
+        for i in range(args.files):
+            with open(os.path.join(source, f"ticket{i}.png"), "wb") as f:
+                f.write(os.urandom(args.kb * 1024))
+        paths = [os.path.join(source, name) for name in sorted(os.listdir(source))]
+        total_mb = args.files * args.kb / 1024
+        print(f"{args.files} files, {total_mb:.0f} MB")
+
+        def run(label, fn):
+            target = os.path.join(workdir, label.replace(" ", "_"))
+            os.makedirs(target)
+            catalog = ImageCatalog(os.path.join(target, "catalog.sqlite3"))
+            start = time.perf_counter()
+            fn(catalog, target)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<28} {elapsed:>6.2f}s  {args.files / elapsed:>8.1f} files/s  {total_mb / elapsed:>7.1f} MB/s")
+            catalog.close()
+
+        run("legacy copy + INSERT each", lambda catalog, target: legacy_import(catalog, target, paths))
+        for workers in (1, 4, 8):
+            run(f"import_batch workers={workers}",
+                lambda catalog, target: import_batch(catalog, target, [source], workers=workers))
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark import time and disk use of the blob store on a screenshot-dump corpus.
+
+The corpus mimics support-ticket dumps: PNG/JPEG screenshots of varied size
+where the same screenshot is attached to several tickets. Compared:
+legacy (shutil.copy2 every file under a timestamp name), the blob store
+forced to copy, its default (reflink, else copy) and opt-in hardlinking.
+"New disk" counts blocks allocated beyond the source corpus, so hardlinked
+and reflinked blobs are free.
+
+Run from the repository root:
+
+    python benchmarks/bench_blobs.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from image_core.batch import import_batch
+from image_core.blobs import disk_usage
+from image_core.catalog import ImageCatalog
+
+
+def make_corpus(folder, files, duplicate_rate, seed=0):
+    rng = np.random.default_rng(seed)
+    unique = []
+    for i in range(files):
+        path = os.path.join(folder, f"ticket{i:04d}")
+        if unique and rng.random() < duplicate_rate:
+            # The same screenshot attached to another ticket
+            original = unique[rng.integers(len(unique))]
+            path += os.path.splitext(original)[1]
+            shutil.copy2(original, path)
+            continue
+        width, height = rng.choice([(1280, 720), (1920, 1080), (2560, 1440)])
+        pixels = rng.integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8)
+        img = Image.fromarray(pixels).resize((width, height), Image.Resampling.NEAREST)
+        path += ".png" if i % 3 else ".jpg"
+        img.save(path)
+        unique.append(path)
+    return len(unique)
+
+
+def tree_files(folder):
+    return [os.path.join(root, name) for root, _, names in os.walk(folder) for name in names]
+
+
+def legacy_import(source, target):
+    for path in sorted(tree_files(source)):
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.path.basename(path)}"
+        shutil.copy2(path, os.path.join(target, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--duplicate-rate", type=float, default=0.3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(workdir, "dump")
+        os.makedirs(source)
+        unique = make_corpus(source, args.files, args.duplicate_rate)
+        source_files = tree_files(source)
+        source_disk = disk_usage(source_files)
+        print(f"{args.files} files ({unique} unique), {source_disk / 1e6:.0f} MB on disk")
+
+        def run(label, fn):
+            target = os.path.join(workdir, label.split()[0] + label.split()[-1])
+            os.makedirs(target)
+            start = time.perf_counter()
+            fn(target)
+            elapsed = time.perf_counter() - start
+            stored = [path for path in tree_files(target) if "catalog.sqlite3" not in path]
+            new_disk = disk_usage(source_files + stored) - source_disk
+            print(f"{label:<32} {elapsed:>6.2f}s  new disk {new_disk / 1e6:>7.1f} MB")
+
+        run("legacy copy2", lambda target: legacy_import(source, target))
+        for link in ("copy", "reflink-or-copy", "hardlink"):
+            def blob_import(target, link=link):
+                catalog = ImageCatalog(os.path.join(target, "catalog.sqlite3"))
+                report = import_batch(catalog, target, [source], link=link)
+                catalog.close()
+                print(f"  {dict(report.methods)}")
+            run(f"blob store link={link}", blob_import)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
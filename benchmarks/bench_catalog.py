@@ -0,0 +1,94 @@
+"""
+Benchmark single-image import latency with 100k entries already in the collection.
+
+Compares the legacy CSV paths (ImageContainer: pd.concat + to_csv,
+SimpleImageContainer: list append + full DictWriter rewrite) against one
+INSERT into the SQLite catalog, and times the one-shot CSV migration.
+
+Run from the repository root:
+
+    python benchmarks/bench_catalog.py
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_core.catalog import COLUMNS, ImageCatalog, migrate_csv
+
+
+def make_rows(count):
+    return [
+        {
+            "filename": f"20250101_{i:06d}_shot{i}.png",
+            "original_name": f"shot{i}.png",
+            "date_added": f"2025-{i % 12 + 1:02d}-01 12:00:00",
+            "description": "support ticket screenshot",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label, imports, fn):
+    start = time.perf_counter()
+    for i in range(imports):
+        fn(i)
+    per_import = (time.perf_counter() - start) / imports * 1000
+    print(f"{label:<40} {per_import:>10.3f} ms/import")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--imports", type=int, default=20)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    workdir = tempfile.mkdtemp()
+    csv_path = os.path.join(workdir, "image_data.csv")
+    rows = make_rows(args.entries)
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"{args.entries} existing entries")
+
+    def new_row(i):
+        return {"filename": f"new_{i}.png", "original_name": f"new_{i}.png",
+                "date_added": "2025-06-01 09:00:00", "description": ""}
+
+    image_df = pd.read_csv(csv_path)
+
+    def pandas_import(i):
+        nonlocal image_df
+        image_df = pd.concat([image_df, pd.DataFrame({k: [v] for k, v in new_row(i).items()})], ignore_index=True)
+        image_df.to_csv(csv_path, index=False)
+
+    images = list(rows)
+
+    def csv_import(i):
+        images.append(new_row(i))
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(images)
+
+    timed("legacy pandas concat + to_csv", args.imports, pandas_import)
+    timed("legacy csv DictWriter rewrite", args.imports, csv_import)
+
+    catalog = ImageCatalog(os.path.join(workdir, "catalog.sqlite3"))
+    start = time.perf_counter()
+    migrate_csv(csv_path, catalog)
+    print(f"{'one-shot CSV migration':<40} {(time.perf_counter() - start) * 1000:>10.1f} ms total")
+    timed("catalog INSERT (committed)", args.imports * 50, lambda i: catalog.add(**new_row(i + 10**6)))
+    catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark the headless CLI end to end on a generated collection.
+
+Imports a folder of small real images with python -m image_core, then
+times list, analyze, verify (stat only, then re-hash and decode) and
+export against the resulting catalog. --memory reports each command's
+peak Python allocations instead (tracemalloc slows everything down, so
+timings are taken without it), and --profile writes a cProfile dump per
+command for pstats/snakeviz.
+
+Run from the repository root:
+
+    python benchmarks/bench_cli.py
+    python benchmarks/bench_cli.py --images 20000 --memory
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from image_core.cli import main as run_command
+
+
+def make_images(folder, count):
+    os.makedirs(folder)
+    for i in range(count):
+        # Distinct content, so none are skipped as duplicates
+        Image.new("RGB", (64 + i % 64, 48), (i % 256, i // 256 % 256, i // 65536 % 256)).save(
+            os.path.join(folder, f"shot{i}.png")
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=10000)
+    parser.add_argument("--memory", action="store_true", help="measure peak traced memory per command")
+    parser.add_argument("--profile", action="store_true", help="write a .prof file per command to the current folder")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(workdir, "dump")
+        collection = os.path.join(workdir, "images")
+        start = time.perf_counter()
+        make_images(source, args.images)
+        print(f"{args.images} images generated in {time.perf_counter() - start:.1f}s")
+
+        commands = [
+            ("import", ["import", source, "--no-thumbnails"]),
+            ("list", ["list", "--format", "jsonl"]),
+            ("analyze", ["analyze"]),
+            ("verify", ["verify", "--orphans"]),
+            ("verify --hash --decode", ["verify", "--hash", "--decode"]),
+            ("export", ["export", os.path.join(workdir, "catalog.csv")]),
+        ]
+        for label, argv in commands:
+            profile = ["--profile", f"cli_{argv[0]}.prof"] if args.profile else []
+            if args.memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            # Output goes to /dev/null so peak memory reflects the command, not a buffer of its output
+            with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+                status = run_command(["--images", collection, *profile, *argv])
+            elapsed = time.perf_counter() - start
+            if args.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{label:<24} peak {peak / 1e6:>6.1f} MB  exit {status}")
+            else:
+                print(f"{label:<24} {elapsed * 1000:>9.1f} ms  {args.images / elapsed:>10.0f} entries/s  exit {status}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
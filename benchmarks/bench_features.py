@@ -0,0 +1,104 @@
+"""
+Benchmark feature extraction and feature-based analysis.
+
+Extraction: extract_features over generated JPEGs, serially and through
+extract_many's process pool. Analysis: feature_stats over a store of
+synthetic rows (memory-mapped columns) against what re-opening every image
+for its dimensions and size would cost.
+
+Run from the repository root:
+
+    python benchmarks/bench_features.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from image_core.analytics import feature_stats
+from image_core.features import FeatureStore, extract_features, extract_many
+
+
+def reopen_stats(paths):
+    """What analysis without stored features has to do: open every file"""
+    sizes = []
+    for path in paths:
+        with Image.open(path) as img:
+            sizes.append((img.size, os.path.getsize(path)))
+    return sizes
+
+
+def synthetic_features(count, rng):
+    return [
+        {"width": int(w), "height": int(h), "mode": "RGB", "bytes": int(b), "captured": None,
+         "dhash": int(d), "histogram": np.full(64, 1 / 64, dtype=np.float16)}
+        for w, h, b, d in zip(rng.integers(100, 6000, count), rng.integers(100, 4000, count),
+                              rng.integers(10_000, 20_000_000, count), rng.integers(0, 2**63, count))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=48)
+    parser.add_argument("--size", type=int, nargs=2, default=[4000, 3000])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    workdir = tempfile.mkdtemp()
+    try:
+        # Smooth gradients plus noise compress like photos, unlike pure noise
+        width, height = args.size
+        base = np.linspace(0, 255, width, dtype=np.float32)[None, :, None] * np.ones((height, 1, 3), np.float32)
+        paths = []
+        for i in range(args.images):
+            pixels = (base + rng.normal(0, 12, (1, width, 3))).clip(0, 255).astype(np.uint8)
+            path = os.path.join(workdir, f"photo{i}.jpg")
+            Image.fromarray(np.roll(pixels, i * 97, axis=1)).save(path, quality=90)
+            paths.append(path)
+        print(f"{args.images} JPEGs at {width}x{height}")
+
+        start = time.perf_counter()
+        for path in paths:
+            extract_features(path)
+        serial = time.perf_counter() - start
+        start = time.perf_counter()
+        extract_many(paths, args.workers)
+        pooled = time.perf_counter() - start
+        print(f"extract serial   {serial / len(paths) * 1000:7.1f} ms/image  {len(paths) / serial:7.1f} images/s")
+        print(f"extract pool     {pooled / len(paths) * 1000:7.1f} ms/image  {len(paths) / pooled:7.1f} images/s"
+              f"  (includes pool start-up, {os.cpu_count()} CPU)")
+
+        start = time.perf_counter()
+        reopen_stats(paths)
+        reopen_ms = (time.perf_counter() - start) / len(paths) * 1000
+
+        store = FeatureStore(os.path.join(workdir, "features"))
+        print(f"{'rows':>9} {'append':>10} {'feature_stats':>14} {'re-open every file':>19}")
+        loaded = 0
+        for rows in args.rows:
+            batch = synthetic_features(rows - loaded, rng)
+            start = time.perf_counter()
+            store.append(list(range(loaded + 1, rows + 1)), batch)
+            append_ms = (time.perf_counter() - start) * 1000
+            loaded = rows
+            start = time.perf_counter()
+            feature_stats(store)
+            stats_ms = (time.perf_counter() - start) * 1000
+            print(f"{rows:>9} {append_ms:>7.0f} ms {stats_ms:>11.1f} ms {reopen_ms * rows / 1000:>16.0f} s*")
+        print("* extrapolated from the per-file cost measured above")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
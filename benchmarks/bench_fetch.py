@@ -0,0 +1,129 @@
+"""
+Time image_core.fetch against a local stand-in HTTP server.
+
+The server (http.server on 127.0.0.1) serves a JPEG with and without
+ETag/Last-Modified validators. Times the legacy requests.get + BytesIO +
+re-encode path against a fresh fetch, a 304 revalidation and an unchanged
+body. Behaviour (retries, size caps, timeouts) is covered by
+tests/test_fetch.py.
+
+Run from the repository root:
+
+    python benchmarks/bench_fetch.py
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import requests
+from PIL import Image
+
+from image_core.fetch import fetch, make_session
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes of the stand-in server; state lives on the server object"""
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, body, headers=()):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if self.path == "/image.jpg":
+            etag = f'"{server.version}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            # No-ETag responses are served under a different path below
+            self.send_body(server.image, [("ETag", etag), ("Last-Modified", server.modified)])
+        elif self.path == "/plain.jpg":
+            self.send_body(server.image)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+
+def make_jpeg(width, height, seed):
+    rng = np.random.default_rng(seed)
+    pixels = np.linspace(0, 255, width, dtype=np.float32)[None, :, None] * np.ones((height, 1, 3), np.float32)
+    pixels += rng.normal(0, 10, (height, 1, 3))
+    out = io.BytesIO()
+    Image.fromarray(pixels.clip(0, 255).astype(np.uint8)).save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+def legacy_download(url, target):
+    response = requests.get(url)
+    img = Image.open(io.BytesIO(response.content))
+    img.save(target)
+
+
+def best_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, nargs=2, default=[3000, 2000], help="served image size")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.image = make_jpeg(*args.size, seed=0)
+    server.version = 1
+    server.modified = formatdate(usegmt=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    session = make_session(backoff_factor=0)
+
+    workdir = tempfile.mkdtemp()
+    try:
+        print(f"{len(server.image) / 1e6:.1f} MB JPEG, {args.size[0]}x{args.size[1]}")
+        legacy = best_ms(lambda: legacy_download(f"{base}/image.jpg", os.path.join(workdir, "legacy.jpg")), args.repeat)
+        fresh_target = os.path.join(workdir, "fresh")
+
+        def fresh():
+            for suffix in ("", ".http.json"):
+                if os.path.exists(fresh_target + suffix):
+                    os.remove(fresh_target + suffix)
+            fetch(f"{base}/image.jpg", fresh_target, session)
+
+        fresh_ms = best_ms(fresh, args.repeat)
+        not_modified = best_ms(lambda: fetch(f"{base}/image.jpg", fresh_target, session), args.repeat)
+        unchanged = best_ms(lambda: fetch(f"{base}/plain.jpg", os.path.join(workdir, "plain"), session), args.repeat)
+        print(f"{'legacy get + BytesIO + re-encode':<34} {legacy:>7.1f} ms")
+        print(f"{'fetch, new content':<34} {fresh_ms:>7.1f} ms")
+        print(f"{'fetch, 304 revalidation':<34} {not_modified:>7.1f} ms")
+        print(f"{'fetch, same bytes, no validators':<34} {unchanged:>7.1f} ms")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark image list startup and refresh cost against collection size.
+
+Tk is not needed. The legacy path is what update_image_list did before
+inserting into the Listbox: read every catalog row and format every line
+(the Listbox inserts themselves cost extra on top). The virtualized path is
+what VirtualImageList.redraw needs: a CatalogListModel and one screenful
+of formatted rows, at the top, middle and bottom of the collection.
+
+Run from the repository root:
+
+    python benchmarks/bench_list.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_core.catalog import ImageCatalog
+from image_core.listmodel import CatalogListModel
+
+SCREEN_ROWS = 30
+
+
+def fmt(row):
+    return f"{row['original_name']} - {row['date_added']}"
+
+
+def timed(fn, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        catalog = ImageCatalog(os.path.join(workdir, "catalog.sqlite3"))
+        loaded = 0
+        print(f"{'entries':>9} {'legacy load+format':>19} {'model open':>11} {'top':>8} {'middle':>8} {'bottom':>8} {'append':>8}")
+        for size in args.sizes:
+            catalog.add_many(
+                {"filename": f"blobs/{i:040x}.png", "original_name": f"ticket{i}.png",
+                 "date_added": "2025-06-01 09:00:00", "description": ""}
+                for i in range(loaded, size)
+            )
+            loaded = size
+
+            legacy = timed(lambda: [fmt(row) for row in catalog.rows()], repeats=1 if size >= 100_000 else 3)
+
+            def screen(position):
+                # A fresh model each time, so nothing is served from its page cache
+                model = CatalogListModel(catalog)
+                start = min(position, model.count() - SCREEN_ROWS)
+                return [fmt(row) for row in model.rows(start, start + SCREEN_ROWS)]
+
+            model_open = timed(lambda: CatalogListModel(catalog))
+            top = timed(lambda: screen(0))
+            middle = timed(lambda: screen(size // 2))
+            bottom = timed(lambda: screen(size))
+
+            model = CatalogListModel(catalog)
+            screen(size)
+            row = {"id": size + 1, "filename": "x.png", "original_name": "x.png", "date_added": "2025-06-01 09:00:00"}
+            append = timed(lambda: (model.appended(row), model.rows(model.count() - SCREEN_ROWS, model.count())))
+            print(f"{size:>9} {legacy:>16.1f} ms {model_open:>8.2f} ms {top:>5.2f} ms {middle:>5.2f} ms {bottom:>5.2f} ms {append:>5.2f} ms")
+        catalog.close()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
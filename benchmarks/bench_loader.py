@@ -0,0 +1,100 @@
+"""
+Benchmark preview decoding over a corpus of 12-50 MP JPEGs.
+
+Each (method, file) pair runs in a fresh interpreter so peak RSS is measured
+per decode. "full" is the old path (decode every pixel, LANCZOS to fit
+700x500); "preview" is image_core.loader.load_preview.
+
+Run from the repository root:
+
+    python benchmarks/bench_loader.py
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Megapixel sizes in the corpus, 4:3 and 3:2 camera shapes
+CORPUS = [(4000, 3000), (6000, 4000), (7000, 5000), (8660, 5773)]
+BOX = (700, 500)
+
+
+def make_corpus(folder):
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    paths = []
+    for width, height in CORPUS:
+        # Smooth gradients plus sensor-like noise, compresses like a photo
+        y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+        base = np.stack([x / width, y / height, (x + y) / (width + height)], axis=-1) * 200
+        base += rng.normal(0, 8, base.shape).astype(np.float32)
+        path = os.path.join(folder, f"{width * height / 1e6:.0f}mp.jpg")
+        Image.fromarray(np.clip(base, 0, 255).astype(np.uint8)).save(path, quality=90)
+        paths.append(path)
+        del y, x, base
+    return paths
+
+
+def peak_rss_kb():
+    """High-water RSS of this process (ru_maxrss survives exec, so it can report the parent's)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def decode(method, path):
+    from PIL import Image
+    from image_core.loader import fit_size, load_preview
+
+    start = time.perf_counter()
+    if method == "full":
+        img = Image.open(path)
+        img = img.resize(fit_size(img.size, BOX), Image.Resampling.LANCZOS)
+    else:
+        img = load_preview(path, BOX)
+    elapsed = (time.perf_counter() - start) * 1000
+    peak_mb = peak_rss_kb() / 1024
+    print(f"{elapsed:.1f} {peak_mb:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--decode", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.decode:
+        decode(*args.decode)
+        return
+
+    folder = tempfile.mkdtemp()
+    try:
+        paths = make_corpus(folder)
+        print(f"{'file':<8} {'MB':>6} {'full ms':>9} {'full RSS':>9} {'preview ms':>11} {'preview RSS':>12}")
+        for path in paths:
+            results = []
+            for method in ("full", "preview"):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--decode", method, path],
+                    check=True, capture_output=True, text=True, cwd=ROOT,
+                ).stdout.split()
+                results.extend(float(value) for value in out)
+            name = os.path.basename(path)[:-4]
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{name:<8} {size_mb:>6.1f} {results[0]:>9.1f} {results[1]:>7.0f}MB {results[2]:>11.1f} {results[3]:>10.0f}MB")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark near-duplicate queries over packed 64-bit hashes.
+
+python: a loop over every hash with int.bit_count. bk-tree: a BK-tree
+(one dict of children per node) built once and then queried. swar and
+bitwise_count: a scan of the packed uint64 column with the chunked SWAR
+popcount used on NumPy 1.x, and with np.bitwise_count (NumPy 2.x only).
+search: HashIndex.search, which picks one of the two and sorts the matches.
+Times are per query; each query has a few planted near-duplicates.
+
+Run from the repository root:
+
+    python benchmarks/bench_similarity.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from image_core.similarity import HashIndex, swar_distances
+
+
+class BKTree:
+    """Metric tree over Hamming distance"""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, image_id):
+        node = self.root
+        if node is None:
+            self.root = (value, image_id, {})
+            return
+        while True:
+            distance = (value ^ node[0]).bit_count()
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, image_id, {})
+                return
+            node = child
+
+    def search(self, query, max_distance):
+        found = []
+        stack = [self.root]
+        while stack:
+            value, image_id, children = stack.pop()
+            distance = (value ^ query).bit_count()
+            if distance <= max_distance:
+                found.append((image_id, distance))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return found
+
+
+def per_query_ms(fn, queries):
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--distance", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--bk-max", type=int, default=100_000, help="largest size to build a BK-tree for")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"ms per query, distance <= {args.distance}")
+    print(f"{'hashes':>9} {'python':>10} {'bk-tree':>10} {'swar':>9} {'bitwise_count':>14} {'search':>9}")
+    for size in args.sizes:
+        # Random 64-bit hashes (integers() stops at int64, so shift and fill the low bit)
+        hashes = rng.integers(0, 2**63, size, dtype=np.int64).view(np.uint64) * np.uint64(2)
+        hashes ^= rng.integers(0, 2, size).astype(np.uint64)
+        queries = [int(h) for h in hashes[rng.integers(0, size, args.queries)]]
+        # Plant near-duplicates of every query a few bits away
+        for n, query in enumerate(queries):
+            for k in range(1, 4):
+                flips = rng.choice(64, size=k * 3, replace=False)
+                hashes[(n * 7 + k) % size] = np.uint64(query ^ sum(1 << int(bit) for bit in flips))
+        ids = np.arange(1, size + 1)
+        index = HashIndex(ids, hashes)
+        values = hashes.tolist()
+
+        def python_scan(query):
+            return sorted((i + 1, (v ^ query).bit_count()) for i, v in enumerate(values)
+                          if (v ^ query).bit_count() <= args.distance)
+
+        python_ms, expected = per_query_ms(python_scan, queries[:3])
+
+        bk_text = "-"
+        if size <= args.bk_max:
+            tree = BKTree()
+            for image_id, value in zip(ids.tolist(), values):
+                tree.add(value, image_id)
+            bk_ms, found = per_query_ms(lambda q: sorted(tree.search(q, args.distance)), queries)
+            assert found[:3] == expected
+            bk_text = f"{bk_ms:7.1f} ms"
+
+        def scan(distances):
+            return lambda query: np.flatnonzero(distances(hashes, np.uint64(query)) <= args.distance)
+
+        swar_ms, _ = per_query_ms(scan(swar_distances), queries)
+        count_text = "-"
+        if hasattr(np, "bitwise_count"):
+            count_ms, _ = per_query_ms(scan(lambda h, q: np.bitwise_count(h ^ q)), queries)
+            count_text = f"{count_ms:.2f} ms"
+        search_ms, found = per_query_ms(lambda q: sorted(index.search(q, args.distance, limit=None)), queries)
+        assert found[:3] == expected
+        print(f"{size:>9} {python_ms:>7.1f} ms {bk_text:>10} {swar_ms:>6.2f} ms {count_text:>14} {search_ms:>6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Cold-start import budget for the desktop launchers.
+
+Imports each launcher module in a fresh interpreter under -X importtime,
+takes the module's cumulative import time (best of --runs), and checks
+that the heavy packages only needed for analysis were not pulled in.
+Exits non-zero when a module is over budget or imports a deferred
+package, so it can guard against regressions.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-ms 150
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> packages it must not import at startup
+LAUNCHERS = {
+    "image_container": ("pandas", "matplotlib", "numpy"),
+    "run_image_container": ("pandas", "matplotlib", "numpy", "PIL", "requests"),
+}
+DEFAULT_BUDGET_MS = 250
+
+
+def import_profile(module):
+    """(cumulative microseconds of module, names of every imported module) from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if not total.strip().isdigit():
+            continue  # Header line
+        imported.add(name.strip())
+        if name.strip() == module and not name[1:].startswith(" "):
+            cumulative = int(total)
+    return cumulative, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    for module, deferred in LAUNCHERS.items():
+        timings = []
+        for _ in range(args.runs):
+            cumulative, imported = import_profile(module)
+            timings.append(cumulative / 1000)
+        best = min(timings)
+        loaded = sorted(name for name in deferred if name in imported)
+        status = "ok"
+        if best > args.budget_ms:
+            status = "OVER BUDGET"
+            failures.append(f"{module}: {best:.0f} ms > {args.budget_ms:.0f} ms")
+        if loaded:
+            status = "IMPORTS DEFERRED PACKAGES"
+            failures.append(f"{module}: imports {', '.join(loaded)} at startup")
+        print(f"{module:<22} best {best:>6.1f} ms  worst {max(timings):>6.1f} ms  {status}")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
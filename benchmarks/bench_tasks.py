@@ -0,0 +1,124 @@
+"""
+Benchmark UI responsiveness while importing hundreds of files.
+
+Tk is not needed: a minimal after()-driven event loop stands in for the
+main loop and a 16 ms "frame" callback records how late each frame runs.
+The legacy path copies and thumbnails every file inside one callback, as
+import_image used to on the Tk thread; the new path hands the same work
+to TaskRunner and only appends rows on the loop thread.
+
+Run from the repository root:
+
+    python benchmarks/bench_tasks.py
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from image_core.tasks import TaskRunner
+from image_core.thumbnails import ThumbnailCache
+
+FRAME_MS = 16
+
+
+class EventLoop:
+    """Single-threaded stand-in for Tk's after() scheduling"""
+
+    def __init__(self):
+        self.timers = []
+        self.order = itertools.count()
+
+    def after(self, ms, callback):
+        heapq.heappush(self.timers, (time.perf_counter() + ms / 1000, next(self.order), callback))
+
+    def run(self, until):
+        while not until():
+            when, _, callback = heapq.heappop(self.timers)
+            time.sleep(max(0, when - time.perf_counter()))
+            callback()
+
+
+def measure(label, loop, start_work, finished):
+    gaps = []
+    last = [time.perf_counter()]
+
+    def frame():
+        now = time.perf_counter()
+        gaps.append((now - last[0]) * 1000)
+        last[0] = now
+        loop.after(FRAME_MS, frame)
+
+    loop.after(FRAME_MS, frame)
+    loop.after(0, start_work)
+    started = time.perf_counter()
+    loop.run(finished)
+    elapsed = time.perf_counter() - started
+    # Let one more frame through so a fully blocked loop still records its gap
+    frames = len(gaps)
+    loop.run(lambda: len(gaps) > frames)
+    gaps = np.array(gaps)
+    on_time = (gaps <= FRAME_MS * 1.5).mean() * 100
+    print(f"{label:<22} {elapsed:>7.2f}s total  worst frame {gaps.max():>8.1f} ms  "
+          f"p99 {np.percentile(gaps, 99):>7.1f} ms  frames on time {on_time:>5.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(workdir, "source")
+        os.makedirs(source)
+        rng = np.random.default_rng(0)
+        for i in range(args.files):
+            pixels = rng.integers(0, 256, (600, 800, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(os.path.join(source, f"shot{i}.jpg"), quality=85)
+        print(f"{args.files} files, 800x600 JPEG")
+
+        def import_file(target, cache, name):
+            destination = os.path.join(target, name)
+            shutil.copy2(os.path.join(source, name), destination)
+            cache.generate(destination)
+            return name
+
+        names = sorted(os.listdir(source))
+
+        for label in ("legacy (Tk thread)", "TaskRunner"):
+            target = os.path.join(workdir, label.split()[0])
+            os.makedirs(target)
+            cache = ThumbnailCache(os.path.join(target, ".thumbnails"))
+            loop = EventLoop()
+            rows = []
+            if label == "TaskRunner":
+                runner = TaskRunner(loop, workers=args.workers)
+                start = lambda: runner.map(
+                    lambda name: import_file(target, cache, name), names,
+                    on_result=lambda name, row: rows.append(row),
+                )
+            else:
+                runner = None
+                start = lambda: rows.extend(import_file(target, cache, name) for name in names)
+            measure(label, loop, start, lambda: len(rows) == len(names))
+            if runner:
+                runner.shutdown()
+            cache.close()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark image viewer open time: full decode + LANCZOS resize vs the thumbnail cache.
+
+Run from the repository root:
+
+    python benchmarks/bench_thumbnails.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from image_core.thumbnails import ThumbnailCache
+
+
+def legacy_open(path):
+    """The viewer's old path: decode the original and resize to fit 700x500"""
+    img = Image.open(path)
+    width, height = img.size
+    max_width, max_height = 700, 500
+    if width > max_width or height > max_height:
+        ratio = min(max_width/width, max_height/height)
+        width, height = int(width*ratio), int(height*ratio)
+        img = img.resize((width, height), Image.Resampling.LANCZOS)
+    return img
+
+
+def timed(label, repeats, fn):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    per_open = (time.perf_counter() - start) / repeats * 1000
+    print(f"{label:<36} {per_open:>9.1f} ms/open")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "photo.jpg")
+        noise = np.random.default_rng(0).integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+        Image.fromarray(noise).save(path, quality=90)
+        print(f"{args.width}x{args.height} JPEG, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        cache = ThumbnailCache(os.path.join(workdir, ".thumbnails"))
+        timed("legacy open + LANCZOS resize", args.repeats, lambda: legacy_open(path).load())
+
+        start = time.perf_counter()
+        cache.generate(path)
+        print(f"{'first view (hash + render pyramid)':<36} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+        timed("cached viewer JPEG", args.repeats * 20, lambda: cache.open(path, "viewer"))
+        timed("cached list thumbnail", args.repeats * 20, lambda: cache.open(path, "list"))
+        cache.close()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Near-duplicate search for the Image Container.
+Lists catalog entries whose perceptual hash is within a Hamming distance of
+a catalog entry (by id) or of any image file.
+
+Usage:
+  python find_similar.py 42
+  python find_similar.py screenshot.png --distance 6 --limit 20
+"""
+
+import argparse
+import sys
+
+from image_core.catalog import open_catalog
+from image_core.features import open_feature_store
+from image_core.similarity import DEFAULT_LIMIT, DEFAULT_MAX_DISTANCE, find_similar
+
+def main(argv=None):
+    """Print the entries closest to the query image"""
+    parser = argparse.ArgumentParser(description="Find near-duplicate images in the collection")
+    parser.add_argument("query", help="catalog id or path of an image file")
+    parser.add_argument("--images", default="images", help="collection folder (default: images)")
+    parser.add_argument("--distance", type=int, default=DEFAULT_MAX_DISTANCE,
+                        help=f"maximum differing hash bits, 0-64 (default: {DEFAULT_MAX_DISTANCE})")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="maximum matches to list")
+    args = parser.parse_args(argv)
+
+    query = int(args.query) if args.query.isdigit() else args.query
+    catalog = open_catalog(args.images)
+    try:
+        matches = find_similar(catalog, open_feature_store(args.images), args.images, query,
+                               args.distance, args.limit)
+    except (LookupError, OSError) as e:
+        print(f"✗ {e}")
+        return 1
+    finally:
+        catalog.close()
+
+    for row in matches:
+        print(f"{row['distance']:>2}  #{row['id']:<7} {row['original_name']}  ({row['date_added']}, {row['filename']})")
+    print(f"{len(matches)} match(es) within distance {args.distance}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
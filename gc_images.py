@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Blob garbage collector for the Image Container.
+Deletes files in images/blobs that no catalog entry points at, e.g. after
+entries are removed or an import was interrupted before committing.
+
+Usage:
+  python gc_images.py --dry-run
+  python gc_images.py --grace-seconds 0
+"""
+
+import argparse
+import sys
+
+from image_core.blobs import GC_GRACE_SECONDS, BlobStore
+from image_core.catalog import open_catalog
+
+def main(argv=None):
+    """Remove unreferenced blobs and report the space reclaimed"""
+    parser = argparse.ArgumentParser(description="Reclaim blobs no catalog entry references")
+    parser.add_argument("--images", default="images", help="collection folder (default: images)")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be removed")
+    parser.add_argument("--grace-seconds", type=int, default=GC_GRACE_SECONDS,
+                        help="keep unreferenced blobs younger than this, as an import may still commit them")
+    args = parser.parse_args(argv)
+
+    catalog = open_catalog(args.images)
+    try:
+        store = BlobStore(args.images)
+        removed, reclaimed = store.gc(catalog.filenames(), dry_run=args.dry_run, grace_seconds=args.grace_seconds)
+    finally:
+        catalog.close()
+
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"{verb} {removed} unreferenced blob(s), {reclaimed / 1e6:.1f} MB reclaimed")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
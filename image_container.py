@@ -1,13 +1,25 @@
 import os
-import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk
-import shutil
-from datetime import datetime
+from tkinter import filedialog, messagebox, ttk
+from PIL import ImageTk
+# pandas, matplotlib and NumPy are imported on first use (analysis, search,
+# feature extraction), so browsing sessions start without paying for them
+from image_core.assets import BackgroundAssets
+from image_core.batch import BatchReport, backfill_hashes, commit_staged, find_sidecar, plan_imports, read_sidecar, stage_file
+from image_core.blobs import BlobStore
+from image_core.catalog import open_catalog
+from image_core.listmodel import CatalogListModel
+from image_core.tasks import DEFAULT_WORKERS, TaskRunner
+from image_core.thumbnails import open_thumbnail_cache
+from background_label import BackgroundLabel
+from virtual_list import VirtualImageList
+
+def load_plotting():
+    """Import matplotlib's Figure and Tk canvas on first use"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    return Figure, FigureCanvasTkAgg
 
 class ImageContainer:
     def __init__(self, root):
@@ -23,27 +35,46 @@ class ImageContainer:
         if not os.path.exists(self.image_folder):
             os.makedirs(self.image_folder)
             
-        # Create pandas DataFrame to track images
-        self.image_df = self.load_image_data()
+        # Open the image catalog (imports the old image_data.csv once)
+        self.catalog = open_catalog(self.image_folder)
+        
+        # Cached thumbnails and viewer-size renditions
+        self.thumbnails = open_thumbnail_cache(self.image_folder)
+        
+        # Content-addressed storage for imported files
+        self.blobs = BlobStore(self.image_folder)
+        
+        # Dimensions, sizes, histograms and hashes of imported images (see features)
+        self._features = None
+        self._features_lock = threading.Lock()
+        
+        # Paged view of the catalog for the list; rows load as they scroll into view
+        self.model = self.load_image_data()
+        
+        # Copies, decodes and analysis run off the Tk thread
+        self.tasks = TaskRunner(self.root, processes=DEFAULT_WORKERS)
+        self.current_task = None
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # Hash images imported before deduplication existed (no-op afterwards)
+        self.tasks.submit(backfill_hashes, self.catalog, self.image_folder)
         
         # Create UI
         self.create_ui()
         
+    @property
+    def features(self):
+        """Feature store, opened on first use so startup does not import NumPy"""
+        # Workers open it too (removals, similarity, analysis)
+        with self._features_lock:
+            if self._features is None:
+                from image_core.features import open_feature_store
+                self._features = open_feature_store(self.image_folder)
+        return self._features
+    
     def load_image_data(self):
-        """Load or create image tracking DataFrame"""
-        csv_path = os.path.join(self.image_folder, "image_data.csv")
-        if os.path.exists(csv_path):
-            return pd.read_csv(csv_path)
-        else:
-            # Create new DataFrame with columns
-            df = pd.DataFrame(columns=["filename", "original_name", "date_added", "description"])
-            df.to_csv(csv_path, index=False)
-            return df
-            
-    def save_image_data(self):
-        """Save image tracking data to CSV"""
-        csv_path = os.path.join(self.image_folder, "image_data.csv")
-        self.image_df.to_csv(csv_path, index=False)
+        """Open a paged view of the image records in the catalog"""
+        return CatalogListModel(self.catalog)
         
     def create_ui(self):
         """Create the user interface"""
@@ -51,14 +82,11 @@ class ImageContainer:
         main_frame = tk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Try to load and set background image
+        # Background rendered once per window size and cached; resizes blit the nearest
+        # cached variant and render the exact size off the Tk thread
         try:
-            bg_img = Image.open(self.background_image_path)
-            bg_img = bg_img.resize((800, 600), Image.LANCZOS)
-            self.bg_photo = ImageTk.PhotoImage(bg_img)
-            
-            # Create a label with the background image
-            bg_label = tk.Label(main_frame, image=self.bg_photo)
+            bg_assets = BackgroundAssets.for_file(self.background_image_path)
+            bg_label = BackgroundLabel(main_frame, bg_assets, self.tasks)
             bg_label.place(x=0, y=0, relwidth=1, relheight=1)
         except Exception as e:
             print(f"Could not load background image: {e}")
@@ -84,81 +112,204 @@ class ImageContainer:
         analyze_btn = tk.Button(button_frame, text="Analyze Images", command=self.analyze_images, width=15)
         analyze_btn.grid(row=0, column=2, padx=10)
         
+        folder_btn = tk.Button(button_frame, text="Import Folder", command=self.import_folder, width=15)
+        folder_btn.grid(row=1, column=0, padx=10, pady=(10, 0))
+        
+        remove_btn = tk.Button(button_frame, text="Remove Image", command=self.remove_image, width=15)
+        remove_btn.grid(row=1, column=1, padx=10, pady=(10, 0))
+        
+        similar_btn = tk.Button(button_frame, text="Find Similar", command=self.find_similar_images, width=15)
+        similar_btn.grid(row=1, column=2, padx=10, pady=(10, 0))
+        
+        # Progress of background work
+        progress_frame = tk.Frame(controls_frame, bg="#f0f0f0")
+        progress_frame.pack(fill=tk.X, padx=20)
+        
+        self.progress = ttk.Progressbar(progress_frame, mode="determinate")
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.cancel_btn = tk.Button(progress_frame, text="Cancel", command=self.cancel_task, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=10)
+        
         # Image list frame
         list_frame = tk.Frame(controls_frame, bg="white", bd=1, relief=tk.SUNKEN)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-        # Scrollbar
-        scrollbar = tk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Listbox for images
-        self.image_listbox = tk.Listbox(list_frame, width=70, height=15, yscrollcommand=scrollbar.set)
-        self.image_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.image_listbox.yview)
+        # Virtualized list of images with thumbnails (draws only visible rows)
+        self.image_list = VirtualImageList(
+            list_frame, self.model,
+            format_row=lambda row: f"{row['original_name']} - {row['date_added']}",
+            tasks=self.tasks,
+            load_thumbnail=lambda row: self.thumbnails.open(os.path.join(self.image_folder, row['filename']), "row"),
+            on_activate=self.view_images
+        )
+        self.image_list.pack(fill=tk.BOTH, expand=True)
         
         # Status bar
         self.status_var = tk.StringVar()
-        self.status_var.set(f"Images in collection: {len(self.image_df)}")
+        self.status_var.set(f"Images in collection: {self.model.count()}")
         status_bar = tk.Label(controls_frame, textvariable=self.status_var, bd=1, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
         
-        # Populate listbox
+        # Populate list
         self.update_image_list()
     
     def update_image_list(self):
-        """Update the image listbox with current image data"""
-        self.image_listbox.delete(0, tk.END)
-        if len(self.image_df) > 0:
-            for idx, row in self.image_df.iterrows():
-                self.image_listbox.insert(tk.END, f"{row['original_name']} - {row['date_added']}")
-        else:
-            self.image_listbox.insert(tk.END, "No images in collection")
+        """Redraw the visible rows of the image list"""
+        self.image_list.refresh()
+        self.status_var.set(f"Images in collection: {self.model.count()}")
+    
+    def add_to_image_list(self, row):
+        """Append a newly imported image without rebuilding the list"""
+        self.model.appended(row)
+        self.update_image_list()
+    
+    def remove_image(self):
+        """Remove the selected image from the collection"""
+        selected_idx = self.image_list.curselection()
+        if not selected_idx:
+            messagebox.showinfo("Info", "Please select an image to remove")
+            return
+        
+        idx = selected_idx[0]
+        image_data = self.model.row(idx)
+        if not messagebox.askyesno("Remove Image", f"Remove '{image_data['original_name']}' from the collection?"):
+            return
         
-        self.status_var.set(f"Images in collection: {len(self.image_df)}")
+        # The blob stays on disk until gc_images.py reclaims it
+        self.catalog.remove(image_data['id'])
+        self.image_list.forget_row(image_data)
+        self.model.removed(idx)
+        self.image_list.selection_clear()
+        self.update_image_list()
+        # On the worker: the first use of the feature store imports NumPy
+        self.tasks.submit(
+            self.remove_features, [image_data['id']],
+            on_error=lambda e: print(f"Could not remove features: {e}")
+        )
+    
+    def remove_features(self, ids):
+        """Tombstone the feature rows of removed images"""
+        self.features.remove(ids)
+    
+    def start_task(self, task, label):
+        """Track a background batch in the progress bar"""
+        self.current_task = task
+        self.progress.configure(maximum=max(task.total, 1), value=0)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.status_var.set(f"{label} 0/{task.total}...")
+    
+    def update_progress(self, task, label):
+        self.progress.configure(value=task.processed)
+        self.status_var.set(f"{label} {task.processed}/{task.total}...")
+    
+    def finish_task(self):
+        self.current_task = None
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.status_var.set(f"Images in collection: {self.model.count()}")
+    
+    def cancel_task(self):
+        """Cancel the running background batch"""
+        if self.current_task:
+            self.current_task.cancel()
+    
+    def close(self):
+        self.tasks.shutdown()
+        self.root.destroy()
     
     def import_image(self):
-        """Import an image into the container"""
+        """Import one or more images into the container"""
         filetypes = [
             ("Image files", "*.jpg *.jpeg *.png *.gif *.bmp *.tiff"),
             ("All files", "*.*")
         ]
         
-        filepath = filedialog.askopenfilename(
-            title="Select Image",
+        filepaths = filedialog.askopenfilenames(
+            title="Select Images",
             filetypes=filetypes
         )
         
-        if filepath:
-            try:
-                # Get image details
-                original_filename = os.path.basename(filepath)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                new_filename = f"{timestamp}_{original_filename}"
-                destination = os.path.join(self.image_folder, new_filename)
-                
-                # Copy the file
-                shutil.copy2(filepath, destination)
-                
-                # Prompt for description
-                description = self.prompt_for_description()
-                
-                # Add to DataFrame
-                new_row = pd.DataFrame({
-                    "filename": [new_filename],
-                    "original_name": [original_filename],
-                    "date_added": [datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-                    "description": [description]
-                })
-                
-                self.image_df = pd.concat([self.image_df, new_row], ignore_index=True)
-                self.save_image_data()
-                self.update_image_list()
-                
-                messagebox.showinfo("Success", f"Image '{original_filename}' imported successfully!")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to import image: {e}")
+        if filepaths:
+            self.start_import(list(filepaths))
+    
+    def import_folder(self):
+        """Import every image in a folder tree"""
+        folder = filedialog.askdirectory(title="Select Folder")
+        if folder:
+            self.start_import([folder])
+    
+    def start_import(self, paths):
+        """Copy and hash files on workers, then catalog them in one transaction"""
+        if self.current_task:
+            messagebox.showinfo("Info", "Please wait for the current import to finish")
+            return
+        
+        # Descriptions come from a descriptions.csv sidecar, or one optional prompt
+        sidecar = find_sidecar(paths)
+        if sidecar:
+            jobs = plan_imports(paths, descriptions=read_sidecar(sidecar))
+        else:
+            jobs = plan_imports(paths, self.prompt_for_description())
+        
+        if not jobs:
+            messagebox.showinfo("Info", "No images found to import")
+            return
+        
+        staged = []
+        errors = []
+        
+        def on_error(job, e):
+            errors.append(f"{job['original_name']}: {e}")
+        
+        def on_done(task):
+            # Files copied before a cancel are still cataloged
+            report = BatchReport()
+            report.files = len(jobs)
+            commit_staged(self.catalog, staged, self.blobs, report)
+            for row in report.rows:
+                self.add_to_image_list(row)
+            self.finish_task()
+            self.index_features(report.rows)
+            
+            skipped = f" ({len(report.duplicates)} duplicate(s) skipped)" if report.duplicates else ""
+            if errors:
+                messagebox.showerror("Error", "Failed to import image(s):\n" + "\n".join(errors[:10]))
+            elif task.cancelled:
+                messagebox.showinfo("Cancelled", f"Import cancelled after {len(report.rows)} image(s){skipped}")
+            elif len(jobs) == 1 and report.rows:
+                messagebox.showinfo("Success", f"Image '{jobs[0]['original_name']}' imported successfully!")
+            else:
+                messagebox.showinfo("Success", f"{len(report.rows)} images imported successfully!{skipped}")
+        
+        task = self.tasks.map(
+            lambda job: stage_file(job, self.catalog, self.blobs, self.thumbnails), jobs,
+            on_result=lambda job, staged_job: staged.append(staged_job),
+            on_error=on_error,
+            on_progress=lambda task: self.update_progress(task, "Importing"),
+            on_done=on_done
+        )
+        self.start_task(task, "Importing")
+    
+    def index_features(self, rows):
+        """Extract features of new images on the process pool, storing them in one append"""
+        from image_core.features import extract_features
+        
+        ids = {os.path.join(self.image_folder, row['filename']): row['id'] for row in rows}
+        results = {}
+        
+        def on_result(path, features):
+            results[ids[path]] = features
+        
+        def on_done(task):
+            self.features.append(list(results), list(results.values()))
+        
+        self.tasks.map(
+            extract_features, list(ids),
+            on_result=on_result,
+            on_error=lambda path, e: print(f"Could not extract features for {path}: {e}"),
+            on_done=on_done,
+            process=True
+        )
     
     def prompt_for_description(self):
         """Prompt user for image description"""
@@ -188,21 +339,21 @@ class ImageContainer:
     
     def view_images(self):
         """Open a window to view selected image"""
-        selected_idx = self.image_listbox.curselection()
+        selected_idx = self.image_list.curselection()
         
         if not selected_idx:
             messagebox.showinfo("Info", "Please select an image to view")
             return
             
-        if len(self.image_df) == 0:
-            return
-            
         idx = selected_idx[0]
-        if idx >= len(self.image_df):
+        if idx >= self.model.count():
             return
             
         # Get image data
-        image_data = self.image_df.iloc[idx]
+        self.open_viewer(self.model.row(idx))
+    
+    def open_viewer(self, image_data):
+        """Open a window showing one catalog entry"""
         image_path = os.path.join(self.image_folder, image_data['filename'])
         
         if os.path.exists(image_path):
@@ -215,19 +366,13 @@ class ImageContainer:
             frame = tk.Frame(view_window)
             frame.pack(fill=tk.BOTH, expand=True)
             
-            try:
-                # Load and display image
-                img = Image.open(image_path)
-                
-                # Calculate resize dimensions while maintaining aspect ratio
-                width, height = img.size
-                max_width, max_height = 700, 500
-                
-                if width > max_width or height > max_height:
-                    ratio = min(max_width/width, max_height/height)
-                    width, height = int(width*ratio), int(height*ratio)
-                    img = img.resize((width, height), Image.LANCZOS)
-                
+            loading_label = tk.Label(frame, text="Loading image...")
+            loading_label.pack(pady=50)
+            
+            def show_image(img):
+                if not frame.winfo_exists():
+                    return  # Viewer was closed while decoding
+                loading_label.destroy()
                 photo = ImageTk.PhotoImage(img)
                 
                 # Display image
@@ -242,17 +387,88 @@ class ImageContainer:
                 
                 info_label = tk.Label(frame, text=info_text, justify=tk.LEFT)
                 info_label.pack(padx=20, pady=10)
-                
-            except Exception as e:
-                tk.Label(frame, text=f"Error loading image: {e}").pack(pady=50)
+            
+            def show_error(e):
+                if frame.winfo_exists():
+                    loading_label.config(text=f"Error loading image: {e}")
+            
+            # Decode the cached viewer-size rendition (fits 700x500) off the Tk thread
+            self.tasks.submit(self.thumbnails.open, image_path, "viewer", on_done=show_image, on_error=show_error)
         else:
             messagebox.showerror("Error", f"Image file not found: {image_path}")
     
-    def analyze_images(self):
+    def find_similar_images(self):
+        """List near-duplicates of the selected image by perceptual hash distance"""
+        selected_idx = self.image_list.curselection()
+        if not selected_idx:
+            messagebox.showinfo("Info", "Please select an image to compare")
+            return
+        
+        image_data = self.model.row(selected_idx[0])
+        self.status_var.set("Searching for similar images...")
+        
+        # Scanning the packed hashes takes milliseconds, but keep the Tk thread free anyway
+        self.tasks.submit(
+            self.search_similar, image_data['id'],
+            on_done=lambda matches: self.show_similar(image_data, matches),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to search for similar images: {e}")
+        )
+    
+    def search_similar(self, image_id):
+        """Runs on a worker, so the first search imports NumPy off the Tk thread"""
+        from image_core.similarity import find_similar
+        return find_similar(self.catalog, self.features, self.image_folder, image_id)
+    
+    def show_similar(self, image_data, matches):
+        """Show search results; double-click one to view it"""
+        self.status_var.set(f"Images in collection: {self.model.count()}")
+        if not matches:
+            messagebox.showinfo("Find Similar", f"No images similar to '{image_data['original_name']}'")
+            return
+        
+        results_window = tk.Toplevel(self.root)
+        results_window.title(f"Similar to {image_data['original_name']}")
+        results_window.geometry("500x300")
+        
+        results = tk.Listbox(results_window)
+        results.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        for row in matches:
+            results.insert(tk.END, f"{row['original_name']} - {row['date_added']} (distance {row['distance']})")
+        
+        def open_selected(event):
+            selection = results.curselection()
+            if selection:
+                self.open_viewer(matches[selection[0]])
+        
+        results.bind("<Double-Button-1>", open_selected)
+    
+    def analyze_images(self, recount=False):
         """Show basic analysis of image collection using matplotlib"""
-        if len(self.image_df) == 0:
+        if not self.model.count():
             messagebox.showinfo("Info", "No images to analyze")
             return
+        
+        self.status_var.set("Analyzing images...")
+        
+        # Read the catalog's running counters and the feature columns on a worker, draw on the Tk thread
+        self.tasks.submit(
+            self.collect_stats, recount,
+            on_done=self.show_analysis,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to analyze images: {e}")
+        )
+    
+    def collect_stats(self, recount=False):
+        """Catalog statistics plus resolution/size histograms of indexed images"""
+        # pandas and matplotlib load here on the worker the first time, not at startup
+        from image_core.analytics import collection_stats, feature_stats
+        load_plotting()
+        stats = collection_stats(self.catalog, recount=recount)
+        stats['features'] = feature_stats(self.features)
+        return stats
+    
+    def show_analysis(self, stats):
+        """Draw the analysis window from precomputed collection stats"""
+        self.status_var.set(f"Images in collection: {self.model.count()}")
             
         # Create analysis window
         analysis_window = tk.Toplevel(self.root)
@@ -260,17 +476,18 @@ class ImageContainer:
         analysis_window.geometry("800x600")
         
         # Use matplotlib to create visualizations
-        fig = plt.Figure(figsize=(10, 8), dpi=100)
+        Figure, FigureCanvasTkAgg = load_plotting()
+        fig = Figure(figsize=(10, 8), dpi=100)
         
-        # Add plot to analyze images by date
-        ax1 = fig.add_subplot(211)
+        # A second row of charts once features have been extracted
+        features = stats['features']
+        grid = (2, 2) if features['indexed'] else (2, 1)
         
-        # Convert date_added to datetime and extract date components
-        dates = pd.to_datetime(self.image_df['date_added'])
-        self.image_df['year_month'] = dates.dt.strftime('%Y-%m')
+        # Add plot to analyze images by date
+        ax1 = fig.add_subplot(*grid, 1)
         
         # Count images by year-month
-        date_counts = self.image_df['year_month'].value_counts().sort_index()
+        date_counts = stats['month_counts']
         
         # Plot
         ax1.bar(date_counts.index, date_counts.values)
@@ -280,20 +497,33 @@ class ImageContainer:
         ax1.tick_params(axis='x', rotation=45)
         
         # Second plot - file types
-        ax2 = fig.add_subplot(212)
-        
-        # Extract file extensions
-        self.image_df['extension'] = self.image_df['filename'].apply(
-            lambda x: os.path.splitext(x)[1].lower()
-        )
+        ax2 = fig.add_subplot(*grid, 2)
         
         # Count by extension
-        ext_counts = self.image_df['extension'].value_counts()
+        ext_counts = stats['ext_counts']
         
         # Plot
         ax2.pie(ext_counts.values, labels=ext_counts.index, autopct='%1.1f%%')
         ax2.set_title('Image Types')
         
+        if features['indexed']:
+            # Resolution and file size distributions, pre-binned on the worker
+            ax3 = fig.add_subplot(*grid, 3)
+            counts, edges = features['megapixels']
+            ax3.stairs(counts, edges, fill=True)
+            ax3.set_xscale('log')
+            ax3.set_title('Resolution')
+            ax3.set_xlabel('Megapixels')
+            ax3.set_ylabel('Number of Images')
+            
+            ax4 = fig.add_subplot(*grid, 4)
+            counts, edges = features['size_kb']
+            ax4.stairs(counts, edges, fill=True)
+            ax4.set_xscale('log')
+            ax4.set_title('File Size')
+            ax4.set_xlabel('KB')
+            ax4.set_ylabel('Number of Images')
+        
         # Add the plot to the tkinter window
         canvas = FigureCanvasTkAgg(fig, master=analysis_window)
         canvas.draw()
@@ -304,14 +534,16 @@ class ImageContainer:
         toolbar_frame.pack(fill=tk.X)
         
         # Stats
-        stats_text = f"Total Images: {len(self.image_df)}\n"
-        if len(self.image_df) > 0:
-            oldest = pd.to_datetime(self.image_df['date_added']).min()
-            newest = pd.to_datetime(self.image_df['date_added']).max()
-            stats_text += f"Oldest Image: {oldest.strftime('%Y-%m-%d')}\n"
-            stats_text += f"Newest Image: {newest.strftime('%Y-%m-%d')}\n"
-        
-        tk.Label(toolbar_frame, text=stats_text, justify=tk.LEFT).pack(pady=10)
+        stats_text = f"Total Images: {stats['total']}\n"
+        if stats['total'] > 0:
+            stats_text += f"Oldest Image: {stats['oldest'].strftime('%Y-%m-%d')}\n"
+            stats_text += f"Newest Image: {stats['newest'].strftime('%Y-%m-%d')}\n"
+            stats_text += f"Indexed Images: {features['indexed']}\n"
+        
+        tk.Label(toolbar_frame, text=stats_text, justify=tk.LEFT).pack(side=tk.LEFT, padx=10, pady=10)
+        
+        # Counts every entry again instead of trusting the running counters
+        tk.Button(toolbar_frame, text="Recount", command=lambda: self.analyze_images(recount=True)).pack(side=tk.RIGHT, padx=10)
         
         fig.tight_layout()
 
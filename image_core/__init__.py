@@ -0,0 +1,6 @@
+"""
+Core library for the Image Container applications.
+
+Everything in this package is free of Tk so it can be shared by the desktop
+front-ends, command line tools and benchmarks.
+"""
@@ -0,0 +1,88 @@
+"""
+Collection statistics for the analysis window.
+
+The catalog keeps per-month and per-extension counters up to date with
+triggers on every import and removal, so collection_stats reads a handful
+of rows however large the collection is. With recount=True the same
+statistics come from every row instead, through load_frame's typed frame
+(datetime64 dates, categorical extensions) and vectorized frame_stats;
+that scans the catalog, so it is for checking the counters, not for every
+open. feature_stats bins resolution and file size from the memory-mapped
+feature columns.
+
+Kept free of Tk and matplotlib so it can run on a worker thread; the UI
+only draws the returned series.
+"""
+
+import numpy as np
+import pandas as pd
+
+from image_core.catalog import COLUMNS
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Extension of a filename's last path component, as os.path.splitext (and
+# the catalog's counter triggers) see it: ".hidden" and "dir.v2/file" have none
+EXTENSION_PATTERN = r"(?:^|/)\.*[^./][^/]*?(\.[^./]*)$"
+# Log-spaced bin edges, so thumbnails and 50 MP photos share one chart
+MEGAPIXEL_BINS = np.logspace(-2, 2, 25)
+SIZE_BINS_KB = np.logspace(0, 6, 25)
+
+
+def collection_stats(catalog, recount=False):
+    """Monthly import counts, file-type counts and date range from the catalog's counters
+
+    recount reads every row instead and ignores the counters.
+    """
+    if recount:
+        return frame_stats(load_frame(catalog.iter_rows()))
+    months = catalog.month_counts()
+    extensions = catalog.extension_counts()
+    oldest, newest = catalog.date_range()
+    month_counts = pd.Series(dict(months), dtype="int64", name="count")
+    return {
+        "total": int(month_counts.sum()),
+        "month_counts": month_counts,
+        "ext_counts": pd.Series(dict(extensions), dtype="int64", name="count"),
+        "oldest": pd.to_datetime(oldest) if oldest else None,
+        "newest": pd.to_datetime(newest) if newest else None,
+    }
+
+
+def load_frame(rows):
+    """Typed DataFrame of catalog rows: datetime64 date_added, categorical extension"""
+    frame = pd.DataFrame(rows, columns=COLUMNS)
+    # One parse with an explicit format, instead of inferring it per value
+    frame["date_added"] = pd.to_datetime(frame["date_added"], format=DATE_FORMAT, errors="coerce")
+    extension = frame["filename"].str.extract(EXTENSION_PATTERN, expand=False).fillna("").str.lower()
+    frame["extension"] = extension.astype("category")
+    return frame
+
+
+def frame_stats(frame):
+    """collection_stats computed from a typed frame with vectorized operations"""
+    dates = frame["date_added"]
+    # Period bucketing stays in int64; strftime would format a string per row
+    month_counts = dates.dt.to_period("M").value_counts().sort_index()
+    month_counts.index = month_counts.index.strftime("%Y-%m")
+    ext_counts = frame["extension"].value_counts()
+    # Same order as the counters: most common first, then by extension
+    ext_counts = ext_counts[ext_counts > 0].sort_index().sort_values(ascending=False, kind="stable")
+    return {
+        "total": len(frame),
+        "month_counts": month_counts.rename("count"),
+        "ext_counts": ext_counts.rename("count"),
+        "oldest": dates.min() if len(frame) else None,
+        "newest": dates.max() if len(frame) else None,
+    }
+
+
+def feature_stats(features):
+    """Resolution and file-size histograms and mode counts from a FeatureStore"""
+    columns = features.columns(["width", "height", "bytes", "mode"])
+    megapixels = columns["width"].astype(np.float64) * columns["height"] / 1e6
+    return {
+        "indexed": len(megapixels),
+        "megapixels": np.histogram(megapixels, bins=MEGAPIXEL_BINS),
+        "size_kb": np.histogram(columns["bytes"] / 1024, bins=SIZE_BINS_KB),
+        "modes": pd.Series(columns["mode"]).value_counts(),
+    }
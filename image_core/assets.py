@@ -0,0 +1,146 @@
+"""
+Resolution-aware background assets.
+
+A background is rendered at full quality (LANCZOS, or a fresh matplotlib
+draw for illustrations) once per window size and display DPI, and stored
+under .backgrounds as a ready-to-blit JPEG. While a window is being
+resized, fit() reuses the nearest stored variant with a cheap bilinear
+resample; the exact size is rendered off the UI thread once the size
+settles, and every later launch at that size decodes it directly.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from image_core.hashing import hash_file
+from image_core.loader import load_preview
+
+# Same folder as image_core.backgrounds' generated files; names never collide
+ASSET_DIRNAME = ".backgrounds"
+# Bump when rendering changes, so stale variants are not reused
+ASSET_VERSION = 1
+JPEG_QUALITY = 92
+# Variants kept per background; the least recently used go first
+MAX_VARIANTS = 12
+# Decoded variants kept in memory for resampling during a resize
+MAX_DECODED = 2
+
+
+class BackgroundAssets:
+    """Ready-to-blit variants of one background, keyed by size (and DPI if it affects rendering)"""
+
+    def __init__(self, key, render, cache_dir=ASSET_DIRNAME, dpi=None):
+        """render(size, dpi) returns a PIL image of exactly size; dpi=None when it is ignored"""
+        self.key = f"{key}-v{ASSET_VERSION}"
+        self.render = render
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.lock = threading.Lock()
+        self.decoded = OrderedDict()
+        os.makedirs(cache_dir, exist_ok=True)
+        suffix = re.escape(f"@{dpi}") if dpi else ""
+        self.pattern = re.compile(rf"{re.escape(self.key)}-(\d+)x(\d+){suffix}\.jpg$")
+        self.variants = self.scan()
+
+    @classmethod
+    def for_file(cls, path, cache_dir=ASSET_DIRNAME):
+        """Variants of an image file, keyed by its content so edits are picked up"""
+        def render(size, dpi):
+            return load_preview(path, size, stretch=True)
+        return cls(hash_file(path)[0][:16], render, cache_dir)
+
+    def scan(self):
+        """Sizes of the stored variants, mapped to their paths"""
+        variants = {}
+        for name in os.listdir(self.cache_dir):
+            match = self.pattern.match(name)
+            if match:
+                variants[(int(match.group(1)), int(match.group(2)))] = os.path.join(self.cache_dir, name)
+        return variants
+
+    def variant_path(self, size):
+        dpi = f"@{self.dpi}" if self.dpi else ""
+        return os.path.join(self.cache_dir, f"{self.key}-{size[0]}x{size[1]}{dpi}.jpg")
+
+    def has(self, size):
+        return tuple(size) in self.variants
+
+    def nearest(self, size):
+        """Stored variant to resample for size: the smallest that covers it, else the largest"""
+        with self.lock:
+            sizes = list(self.variants)
+        if not sizes:
+            return None
+        covering = [s for s in sizes if s[0] >= size[0] and s[1] >= size[1]]
+        if covering:
+            return min(covering, key=lambda s: s[0] * s[1])
+        return max(sizes, key=lambda s: s[0] * s[1])
+
+    def render_variant(self, size):
+        """Render and store the exact-size variant (full quality; call off the UI thread)"""
+        size = tuple(size)
+        path = self.variant_path(size)
+        if not os.path.exists(path):
+            img = self.render(size, self.dpi).convert("RGB")
+            temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            img.save(temp, "JPEG", quality=JPEG_QUALITY)
+            os.replace(temp, path)
+        with self.lock:
+            self.variants[size] = path
+        self.prune()
+        return path
+
+    def prune(self):
+        """Keep only the MAX_VARIANTS most recently written or shown variants"""
+        with self.lock:
+            if len(self.variants) <= MAX_VARIANTS:
+                return
+            by_age = sorted(self.variants.items(), key=lambda item: os.path.getmtime(item[1]))
+            for size, path in by_age[:len(by_age) - MAX_VARIANTS]:
+                del self.variants[size]
+                self.decoded.pop(path, None)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def load(self, path):
+        """Decoded variant, from memory when it was used recently"""
+        with self.lock:
+            img = self.decoded.get(path)
+            if img is not None:
+                self.decoded.move_to_end(path)
+                return img
+        img = Image.open(path)
+        img.load()
+        with self.lock:
+            self.decoded[path] = img
+            while len(self.decoded) > MAX_DECODED:
+                self.decoded.popitem(last=False)
+        return img
+
+    def fit(self, size):
+        """Image of exactly size from the nearest variant, or None if none is stored yet"""
+        size = tuple(size)
+        nearest = self.nearest(size)
+        if nearest is None:
+            return None
+        path = self.variants.get(nearest)
+        if path is None:
+            return None  # Pruned meanwhile
+        img = self.load(path)
+        if img.size == size:
+            os.utime(path)  # Exact hits count as recent use for prune()
+            return img
+        # Stand-in until the exact variant is rendered: bilinear, reducing large steps first
+        return img.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+    def get(self, size):
+        """Exact-size image, rendering the variant first if needed"""
+        if not self.has(size):
+            self.render_variant(size)
+        return self.fit(size)
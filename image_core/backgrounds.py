@@ -0,0 +1,125 @@
+"""
+Procedural window backgrounds.
+
+Gradients are computed for the whole image at once with NumPy broadcasting
+and handed to Image.fromarray, instead of one putpixel call per pixel, so
+even a 4K background takes milliseconds. An optional 4x4 ordered (Bayer)
+dither hides the banding of slow gradients without making the output
+random, so the same parameters always give the same pixels. Rendered files
+are cached under .backgrounds by a hash of their parameters, and repeated
+launches copy the cached file instead of rendering again.
+"""
+
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+from PIL import Image
+
+from image_core.hashing import content_hasher
+
+BACKGROUND_DIRNAME = ".backgrounds"
+# Bump when rendering changes, so old cache entries are not reused
+RENDER_VERSION = 1
+JPEG_QUALITY = 92
+
+# The blue-grey top-to-bottom gradient the apps have always drawn
+DEFAULT_BACKGROUND = {
+    "kind": "linear",
+    "start": (200, 220, 240),
+    "end": (0, 20, 140),
+    "angle": 90,
+}
+
+BAYER_4X4 = (np.array([
+    [0, 8, 2, 10],
+    [12, 4, 14, 6],
+    [3, 11, 1, 9],
+    [15, 7, 13, 5],
+], dtype=np.float32) + 0.5) / 16
+
+
+def _to_image(t, start, end, dither):
+    """Interpolate start -> end by t (0..1 per pixel) into an RGB image"""
+    height, width = t.shape
+    start = np.asarray(start, dtype=np.float32)
+    delta = np.asarray(end, dtype=np.float32) - start
+    # Added before flooring: 0.5 everywhere rounds, the Bayer pattern dithers
+    offset = np.tile(BAYER_4X4, (height // 4 + 1, width // 4 + 1))[:height, :width] if dither else np.float32(0.5)
+    out = np.empty((height, width, 3), dtype=np.uint8)
+    channel = np.empty_like(t)
+    for c in range(3):
+        np.multiply(t, delta[c], out=channel)
+        channel += start[c]
+        channel += offset
+        np.floor(channel, out=channel)
+        np.clip(channel, 0, 255, out=channel)
+        out[..., c] = channel
+    return Image.fromarray(out, "RGB")
+
+
+def linear_gradient(size, start, end, angle=90, dither=True):
+    """Gradient from start to end colour; angle in degrees, 0 runs left to right, 90 top to bottom"""
+    width, height = size
+    radians = np.deg2rad(angle)
+    # Rounded so 0/90/180/270 degrees project exactly onto one axis
+    dx, dy = round(float(np.cos(radians)), 12), round(float(np.sin(radians)), 12)
+    x = (np.arange(width, dtype=np.float32) + 0.5) * dx
+    y = (np.arange(height, dtype=np.float32) + 0.5) * dy
+    lowest = min(0, width * dx) + min(0, height * dy)
+    extent = abs(width * dx) + abs(height * dy)
+    t = (y[:, None] + x[None, :] - lowest) / extent
+    return _to_image(t.astype(np.float32), start, end, dither)
+
+
+def radial_gradient(size, inner, outer, center=(0.5, 0.5), dither=True):
+    """Gradient from inner colour at center (fractions of the size) to outer at the farthest corner"""
+    width, height = size
+    cx, cy = center[0] * width, center[1] * height
+    x = np.arange(width, dtype=np.float32) + 0.5 - cx
+    y = np.arange(height, dtype=np.float32) + 0.5 - cy
+    radius = max(np.hypot(corner_x - cx, corner_y - cy) for corner_x in (0, width) for corner_y in (0, height))
+    t = np.sqrt(y[:, None] ** 2 + x[None, :] ** 2) / np.float32(radius)
+    return _to_image(t, inner, outer, dither)
+
+
+def render(size, kind="linear", start=None, end=None, dither=True, **options):
+    """Render a background described by the same keywords cached_background takes"""
+    if kind == "linear":
+        return linear_gradient(size, start, end, dither=dither, **options)
+    if kind == "radial":
+        return radial_gradient(size, start, end, dither=dither, **options)
+    raise ValueError(f"Unknown background kind: {kind}")
+
+
+def cache_key(size, extension, **spec):
+    """Hex digest of everything that affects the rendered file"""
+    params = dict(spec, size=list(size), extension=extension, version=RENDER_VERSION)
+    digest = content_hasher()
+    digest.update(json.dumps(params, sort_keys=True, default=list).encode())
+    return digest.hexdigest()
+
+
+def cached_background(size, cache_dir=BACKGROUND_DIRNAME, extension=".jpg", **spec):
+    """Path of the rendered background, rendering it only on a cache miss"""
+    path = os.path.join(cache_dir, cache_key(size, extension, **spec) + extension)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        img = render(size, **spec)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if extension in (".jpg", ".jpeg"):
+            img.save(temp, "JPEG", quality=JPEG_QUALITY)
+        else:
+            img.save(temp, Image.registered_extensions()[extension])
+        os.replace(temp, path)
+    return path
+
+
+def save_background(path, size=(800, 600), cache_dir=BACKGROUND_DIRNAME, **spec):
+    """Write a generated background to path (DEFAULT_BACKGROUND unless spec is given)"""
+    spec = spec or DEFAULT_BACKGROUND
+    cached = cached_background(size, cache_dir, os.path.splitext(path)[1].lower(), **spec)
+    shutil.copyfile(cached, path)
+    return path
@@ -0,0 +1,199 @@
+"""
+Batch import of many files or whole directory trees.
+
+Each file is brought into the content-addressed blob store (reflinked
+or copied, and hashed) on a pool of worker threads; file I/O and
+BLAKE2b both release the GIL. Content already in the catalog is dropped,
+and the surviving rows are written in a single catalog transaction.
+Descriptions can come from a sidecar CSV with filename and description
+columns. With a FeatureStore, features of the new rows are then extracted
+on a process pool.
+"""
+
+import csv
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from image_core.blobs import DEFAULT_LINK, BlobStore
+from image_core.hashing import hash_file
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff")
+SIDECAR_FILENAME = "descriptions.csv"
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+class BatchReport:
+    """Outcome and throughput of one batch import"""
+
+    def __init__(self):
+        self.rows = []
+        self.duplicates = []
+        self.errors = []
+        self.files = 0
+        self.bytes = 0
+        self.bytes_saved = 0
+        self.methods = Counter()
+        self.seconds = 0.0
+
+    @property
+    def files_per_sec(self):
+        return self.files / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_sec(self):
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        methods = ", ".join(f"{count} {method}" for method, count in sorted(self.methods.items()))
+        return (
+            f"Imported {len(self.rows)} of {self.files} files "
+            f"({len(self.duplicates)} duplicates, {len(self.errors)} errors) "
+            f"in {self.seconds:.2f}s: {self.files_per_sec:.1f} files/s, {self.mb_per_sec:.1f} MB/s\n"
+            f"Stored via {methods or 'nothing'}; {self.bytes_saved / 1e6:.1f} MB not stored as new copies"
+        )
+
+
+def find_images(paths):
+    """Expand files and directories into (path, relative name) pairs of image files"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, dirnames, filenames in os.walk(path):
+                # Skip hidden folders such as .thumbnails
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(IMAGE_EXTENSIONS):
+                        full_path = os.path.join(folder, filename)
+                        found.append((full_path, os.path.relpath(full_path, path)))
+        else:
+            # Explicitly named files are taken whatever their extension
+            found.append((path, os.path.basename(path)))
+    return found
+
+
+def read_sidecar(csv_path):
+    """Map relative paths and bare filenames to descriptions from a sidecar CSV"""
+    descriptions = {}
+    with open(csv_path, newline="") as f:
+        for row in csv.DictReader(f):
+            name = row.get("filename") or row.get("original_name")
+            if name:
+                descriptions[os.path.normpath(name)] = row.get("description") or ""
+    return descriptions
+
+
+def find_sidecar(paths):
+    """The descriptions.csv of the first imported directory that has one"""
+    for path in paths:
+        candidate = os.path.join(path, SIDECAR_FILENAME)
+        if os.path.isdir(path) and os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def plan_imports(paths, description="", descriptions=None):
+    """Turn source paths into import jobs"""
+    descriptions = descriptions or {}
+    jobs = []
+    for source, relative in find_images(paths):
+        original_name = os.path.basename(source)
+        jobs.append({
+            "source": source,
+            "original_name": original_name,
+            "description": descriptions.get(os.path.normpath(relative), descriptions.get(original_name, description)),
+        })
+    return jobs
+
+
+def stage_file(job, catalog, store, thumbnails=None):
+    """Bring one job into the blob store, flagging content the catalog already has"""
+    blob = store.ingest(job["source"])
+    if catalog.has_hash(blob["content_hash"]):
+        if blob["created"]:
+            store.remove(blob["filename"])
+        return dict(job, **blob, duplicate=True)
+    if thumbnails:
+        try:
+            thumbnails.generate(store.path(blob["filename"]), blob["content_hash"])
+        except Exception as e:
+            print(f"Could not create thumbnails for {job['original_name']}: {e}")
+    return dict(job, **blob, duplicate=False)
+
+
+def commit_staged(catalog, staged, store, report):
+    """Write staged files to the catalog in one transaction and fill in the report"""
+    date_added = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    new = [dict(job, date_added=date_added) for job in staged if not job["duplicate"]]
+    inserted, repeated = catalog.add_batch(new)
+    kept = {row["filename"] for row in inserted}
+    for job in repeated:
+        # Same content appeared twice in this batch; keep only the first blob
+        if job["created"] and job["filename"] not in kept:
+            store.remove(job["filename"])
+
+    duplicates = [job for job in staged if job["duplicate"]] + repeated
+    repeated_ids = {id(job) for job in repeated}
+    report.rows.extend(inserted)
+    report.duplicates.extend(duplicates)
+    if duplicates:
+        report.methods["duplicate"] += len(duplicates)
+    report.bytes += sum(job["bytes"] for job in staged)
+    # Only fresh byte copies cost new disk space
+    report.bytes_saved += sum(job["bytes"] for job in duplicates)
+    for job in new:
+        if id(job) not in repeated_ids:
+            report.methods[job["method"]] += 1
+            if job["method"] != "copy":
+                report.bytes_saved += job["bytes"]
+    return report
+
+
+def backfill_hashes(catalog, image_folder):
+    """Hash images imported before content hashing so they take part in dedupe"""
+    pairs = []
+    for image_id, filename in catalog.missing_hashes():
+        path = os.path.join(image_folder, filename)
+        if os.path.exists(path):
+            pairs.append((image_id, hash_file(path)[0]))
+    if pairs:
+        catalog.set_hashes(pairs)
+    return len(pairs)
+
+
+def import_batch(catalog, image_folder, paths, description="", sidecar=None,
+                 workers=None, thumbnails=None, on_progress=None, link=DEFAULT_LINK, features=None):
+    """Import files and directory trees in parallel; returns a BatchReport"""
+    start = time.perf_counter()
+    store = BlobStore(image_folder, link)
+    backfill_hashes(catalog, image_folder)
+
+    sidecar = sidecar or find_sidecar(paths)
+    descriptions = read_sidecar(sidecar) if sidecar else None
+    jobs = plan_imports(paths, description, descriptions)
+
+    report = BatchReport()
+    report.files = len(jobs)
+    staged = []
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as executor:
+        futures = [executor.submit(stage_file, job, catalog, store, thumbnails) for job in jobs]
+        for done, (job, future) in enumerate(zip(jobs, futures), start=1):
+            try:
+                staged.append(future.result())
+            except Exception as e:
+                report.errors.append((job["source"], str(e)))
+            if on_progress:
+                on_progress(done, len(jobs))
+
+    commit_staged(catalog, staged, store, report)
+    if features and report.rows:
+        # Imported here: the UI uses this module at startup and should not load NumPy
+        from image_core.features import index_features
+        # Feature errors do not undo the import; backfill_features retries them later
+        _, feature_errors = index_features(features, image_folder, report.rows)
+        for source, error in feature_errors:
+            print(f"Could not extract features for {source}: {error}")
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,182 @@
+"""
+Content-addressed blob store for imported images.
+
+Files live under images/blobs/<xx>/<blake2b digest><ext>, so identical
+content is stored once whatever it was called. Imports reflink the source
+when the filesystem supports copy-on-write clones and otherwise fall back
+to a byte copy. Blobs no catalog row points at are reclaimed by gc().
+
+Hardlinking (link="hardlink") avoids the copy on filesystems without
+reflinks, but the blob then shares its inode with the source: editing the
+source in place silently changes the stored image under its old hash. It
+is only for sources that are never modified after import, such as dumps
+that are deleted once imported.
+"""
+
+import errno
+import os
+import shutil
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from image_core.hashing import content_hasher, hash_file
+
+BLOB_DIRNAME = "blobs"
+# Buffer for copy_and_hash
+CHUNK_SIZE = 1 << 16
+# Linux FICLONE ioctl (btrfs, XFS, bcachefs); not exposed by the fcntl module
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+# Errors meaning "this filesystem/pair of paths cannot do that", not real failures
+UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EPERM, errno.EMLINK, errno.ENOSYS}
+# Blobs younger than this may belong to an import that has not committed yet
+GC_GRACE_SECONDS = 3600
+# How ingest() places files, cheapest first
+LINK_METHODS = {
+    "reflink-or-copy": ("reflink", "copy"),
+    "hardlink": ("hardlink", "copy"),
+    "copy": ("copy",),
+}
+DEFAULT_LINK = "reflink-or-copy"
+
+
+def iter_blobs(image_folder):
+    """Yield (catalog filename, path) for every blob under an images folder, creating nothing"""
+    for folder, _, filenames in os.walk(os.path.join(image_folder, BLOB_DIRNAME)):
+        for filename in filenames:
+            path = os.path.join(folder, filename)
+            yield os.path.relpath(path, image_folder).replace(os.sep, "/"), path
+
+
+def reflink(source, destination):
+    """Clone source into destination sharing extents (copy-on-write)"""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink not supported on this platform")
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(destination)
+            raise
+
+
+def copy_and_hash(source, destination):
+    """Copy a file while hashing it, in one read; returns (hex digest, size)"""
+    digest = content_hasher()
+    size = 0
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+            size += len(chunk)
+    shutil.copystat(source, destination)
+    return digest.hexdigest(), size
+
+
+class BlobStore:
+    """Stores files by content hash under one folder"""
+
+    def __init__(self, image_folder, link=DEFAULT_LINK):
+        self.image_folder = image_folder
+        self.root = os.path.join(image_folder, BLOB_DIRNAME)
+        self.methods = LINK_METHODS[link]
+        os.makedirs(self.root, exist_ok=True)
+
+    def relative_path(self, digest, extension):
+        """Catalog filename of a blob, relative to the images folder"""
+        return f"{BLOB_DIRNAME}/{digest[:2]}/{digest}{extension.lower()}"
+
+    def path(self, relative):
+        return os.path.join(self.image_folder, *relative.split("/"))
+
+    def ingest(self, source):
+        """Bring a file into the store
+
+        Returns a dict with the digest, size, catalog filename, the method
+        used ("reflink", "hardlink", "copy" or "existing") and whether a new
+        blob was created.
+        """
+        partial = os.path.join(self.root, f".{os.getpid()}.{time.monotonic_ns()}.part")
+        try:
+            method = self.place(source, partial)
+            if method == "copy":
+                digest, size = copy_and_hash(source, partial)
+            else:
+                # Hash the placed file, so the key always matches what is stored
+                digest, size = hash_file(partial)
+            relative = self.relative_path(digest, os.path.splitext(source)[1])
+            target = self.path(relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.exists(target):
+                os.remove(partial)
+                return {"content_hash": digest, "bytes": size, "filename": relative,
+                        "method": "existing", "created": False}
+            os.replace(partial, target)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return {"content_hash": digest, "bytes": size, "filename": relative, "method": method, "created": True}
+
+    def place(self, source, partial):
+        """Link or clone source at partial with the cheapest supported method"""
+        for method in self.methods:
+            if method == "copy":
+                return "copy"
+            try:
+                if method == "reflink":
+                    reflink(source, partial)
+                else:
+                    os.link(source, partial)
+                return method
+            except OSError as e:
+                if e.errno not in UNSUPPORTED:
+                    raise
+        return "copy"
+
+    def remove(self, relative):
+        try:
+            os.remove(self.path(relative))
+        except FileNotFoundError:
+            pass
+
+    def iter_blobs(self):
+        """Yield (catalog filename, path) for every file in the store"""
+        return iter_blobs(self.image_folder)
+
+    def gc(self, referenced, dry_run=False, grace_seconds=GC_GRACE_SECONDS):
+        """Delete blobs not in referenced; returns (files removed, bytes reclaimed)"""
+        referenced = set(referenced)
+        cutoff = time.time() - grace_seconds
+        removed = reclaimed = 0
+        for relative, path in list(self.iter_blobs()):
+            if relative in referenced:
+                continue
+            stat = os.stat(path)
+            # ctime moves on link/clone/copy, unlike mtime which keeps the source's
+            if stat.st_ctime > cutoff:
+                continue
+            # A hardlinked blob frees no space while the source still exists
+            if stat.st_nlink == 1:
+                reclaimed += stat.st_size
+            removed += 1
+            if not dry_run:
+                os.remove(path)
+        return removed, reclaimed
+
+
+def disk_usage(paths):
+    """Bytes actually allocated by a set of files, counting shared inodes once"""
+    seen = set()
+    total = 0
+    for path in paths:
+        stat = os.stat(path)
+        if (stat.st_dev, stat.st_ino) in seen:
+            continue
+        seen.add((stat.st_dev, stat.st_ino))
+        total += stat.st_blocks * 512
+    return total
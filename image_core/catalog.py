@@ -0,0 +1,309 @@
+"""
+SQLite-backed image catalog.
+
+Replaces images/image_data.csv, which had to be rewritten in full on every
+import. Each import is now a single indexed INSERT committed in its own
+transaction, and the database runs in WAL mode so a crash mid-write never
+loses earlier entries.
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+
+CATALOG_FILENAME = "catalog.sqlite3"
+LEGACY_CSV_FILENAME = "image_data.csv"
+COLUMNS = ["filename", "original_name", "date_added", "description"]
+
+# Final path component of a filename column: rtrim strips everything after
+# the last "/", and the length of what is left is where the name starts
+NAME_SQL = "substr({0}, length(rtrim({0}, replace({0}, '/', ''))) + 1)"
+# Lower-cased extension of a name, like os.path.splitext: the text from the
+# last dot, but only if a dot follows the name's leading dots (".hidden" has none)
+EXTENSION_OF_NAME_SQL = (
+    "lower(CASE WHEN instr(ltrim({0}, '.'), '.') > 0"
+    " THEN substr({0}, length(rtrim({0}, replace({0}, '.', '')))) ELSE '' END)"
+)
+
+
+def extension_sql(column):
+    """SQL expression for the extension of a filename column"""
+    return EXTENSION_OF_NAME_SQL.format(NAME_SQL.format(column))
+
+
+COUNTER_TRIGGERS = """
+    CREATE TRIGGER images_count_insert AFTER INSERT ON images BEGIN
+        INSERT INTO month_counts VALUES (substr(NEW.date_added, 1, 7), 1)
+            ON CONFLICT (month) DO UPDATE SET count = count + 1;
+        INSERT INTO extension_counts VALUES ({ext_new}, 1)
+            ON CONFLICT (extension) DO UPDATE SET count = count + 1;
+    END;
+    CREATE TRIGGER images_count_delete AFTER DELETE ON images BEGIN
+        UPDATE month_counts SET count = count - 1 WHERE month = substr(OLD.date_added, 1, 7);
+        UPDATE extension_counts SET count = count - 1 WHERE extension = {ext_old};
+        DELETE FROM month_counts WHERE count <= 0;
+        DELETE FROM extension_counts WHERE count <= 0;
+    END;
+""".format(ext_new=extension_sql("NEW.filename"), ext_old=extension_sql("OLD.filename"))
+
+# Schema changes, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = [
+    """
+    CREATE TABLE images (
+        id INTEGER PRIMARY KEY,
+        filename TEXT NOT NULL UNIQUE,
+        original_name TEXT NOT NULL,
+        date_added TEXT NOT NULL,
+        description TEXT NOT NULL DEFAULT ''
+    );
+    CREATE INDEX images_date_added ON images (date_added);
+    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    """,
+    # BLAKE2b of the file contents, used to skip duplicate imports
+    """
+    ALTER TABLE images ADD COLUMN content_hash TEXT;
+    CREATE INDEX images_content_hash ON images (content_hash);
+    """,
+    # Per-month and per-extension counters kept current by triggers, so the
+    # analysis window reads a few rows instead of scanning the catalog
+    """
+    CREATE TABLE month_counts (month TEXT PRIMARY KEY, count INTEGER NOT NULL);
+    CREATE TABLE extension_counts (extension TEXT PRIMARY KEY, count INTEGER NOT NULL);
+    INSERT INTO month_counts SELECT substr(date_added, 1, 7), COUNT(*) FROM images GROUP BY 1;
+    INSERT INTO extension_counts SELECT {ext_filename}, COUNT(*) FROM images GROUP BY 1;
+    """.format(ext_filename=extension_sql("filename")) + COUNTER_TRIGGERS,
+]
+
+
+def split_statements(script):
+    """Split a SQL script into statements, keeping trigger bodies whole"""
+    statement = ""
+    for piece in script.split(";"):
+        statement += piece + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \n;"):
+                yield statement
+            statement = ""
+
+
+class ImageCatalog:
+    """Indexed, incrementally written store of image metadata"""
+
+    def __init__(self, path):
+        self.path = path
+        # Shared with worker threads; every statement runs under the lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.migrate()
+
+    def migrate(self):
+        """Bring the schema up to date"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            # executescript commits first, so run the statements one by one
+            # inside an explicit transaction with the version bump
+            with self.conn:
+                self.conn.execute("BEGIN")
+                for statement in split_statements(script):
+                    self.conn.execute(statement)
+                self.conn.execute(f"PRAGMA user_version = {number}")
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def add(self, filename, original_name, date_added, description="", content_hash=None):
+        """Insert one image and return its row as a dict"""
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO images (filename, original_name, date_added, description, content_hash)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (filename, original_name, date_added, description or "", content_hash),
+            )
+        return {
+            "id": cursor.lastrowid,
+            "filename": filename,
+            "original_name": original_name,
+            "date_added": date_added,
+            "description": description or "",
+            "content_hash": content_hash,
+        }
+
+    def add_batch(self, rows):
+        """Insert image dicts in one transaction, skipping content already in the catalog
+
+        Returns (inserted, duplicates); inserted rows gain their id. Rows
+        repeating an earlier row of the same batch count as duplicates too.
+        """
+        inserted, duplicates = [], []
+        with self.lock, self.conn:
+            for row in rows:
+                values = {column: row.get(column) or "" for column in COLUMNS}
+                values["content_hash"] = row.get("content_hash")
+                cursor = self.conn.execute(
+                    "INSERT INTO images (filename, original_name, date_added, description, content_hash)"
+                    " SELECT :filename, :original_name, :date_added, :description, :content_hash"
+                    " WHERE :content_hash IS NULL"
+                    " OR NOT EXISTS (SELECT 1 FROM images WHERE content_hash = :content_hash)",
+                    values,
+                )
+                if cursor.rowcount:
+                    inserted.append(dict(values, id=cursor.lastrowid))
+                else:
+                    duplicates.append(row)
+        return inserted, duplicates
+
+    def has_hash(self, content_hash):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM images WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+        return row is not None
+
+    def missing_hashes(self):
+        """Rows imported before content hashing, as (id, filename) pairs"""
+        with self.lock:
+            return self.conn.execute("SELECT id, filename FROM images WHERE content_hash IS NULL").fetchall()
+
+    def set_hashes(self, pairs):
+        """Record content hashes from (id, content_hash) pairs"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE images SET content_hash = ? WHERE id = ?", ((digest, image_id) for image_id, digest in pairs)
+            )
+
+    def add_many(self, rows, meta=None):
+        """Insert many image dicts, and optionally meta entries, in one transaction"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO images (filename, original_name, date_added, description)"
+                " VALUES (:filename, :original_name, :date_added, :description)",
+                ({column: row.get(column) or "" for column in COLUMNS} for row in rows),
+            )
+            for key, value in (meta or {}).items():
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def remove(self, image_id):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM images WHERE id = ?", (image_id,))
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def get(self, image_id):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM images WHERE id = ?", (image_id,)).fetchone()
+        return dict(row) if row else None
+
+    def filenames(self):
+        """Every stored filename, e.g. to find unreferenced blobs"""
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT filename FROM images")]
+
+    def rows(self):
+        """Return every image as a dict, in import order"""
+        with self.lock:
+            return [dict(row) for row in self.conn.execute("SELECT * FROM images ORDER BY id")]
+
+    def iter_rows(self, batch_size=1000, after_id=0):
+        """Yield every image as a dict in import order, reading one keyset page at a time"""
+        while True:
+            page = self.page_after(after_id, batch_size)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after_id = page[-1]["id"]
+
+    def page_at(self, offset, limit):
+        """Rows at positions [offset, offset + limit) in import order"""
+        with self.lock:
+            return [
+                dict(row)
+                for row in self.conn.execute("SELECT * FROM images ORDER BY id LIMIT ? OFFSET ?", (limit, offset))
+            ]
+
+    def page_after(self, after_id, limit):
+        """The next limit rows after an id, via the primary key instead of OFFSET"""
+        with self.lock:
+            return [
+                dict(row)
+                for row in self.conn.execute(
+                    "SELECT * FROM images WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+                )
+            ]
+
+    def page_from_end(self, offset, limit):
+        """limit rows ending offset rows before the last one, in import order"""
+        with self.lock:
+            return [
+                dict(row)
+                for row in self.conn.execute(
+                    "SELECT * FROM (SELECT * FROM images ORDER BY id DESC LIMIT ? OFFSET ?) ORDER BY id",
+                    (limit, offset),
+                )
+            ]
+
+    def month_counts(self):
+        """(YYYY-MM, images added) pairs in month order"""
+        with self.lock:
+            return self.conn.execute("SELECT month, count FROM month_counts ORDER BY month").fetchall()
+
+    def extension_counts(self):
+        """(extension, images) pairs, most common first"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT extension, count FROM extension_counts ORDER BY count DESC, extension"
+            ).fetchall()
+
+    def date_range(self):
+        """(oldest, newest) date_added via the date index, or (None, None) when empty"""
+        with self.lock:
+            return tuple(self.conn.execute(
+                "SELECT (SELECT MIN(date_added) FROM images), (SELECT MAX(date_added) FROM images)"
+            ).fetchone())
+
+    def id_range(self):
+        """(lowest id, highest id), or (None, None) when empty"""
+        with self.lock:
+            # Separate subqueries, so each is a single primary-key seek
+            return tuple(self.conn.execute(
+                "SELECT (SELECT MIN(id) FROM images), (SELECT MAX(id) FROM images)"
+            ).fetchone())
+
+    def export_csv(self, csv_path):
+        """Write the catalog in the legacy image_data.csv layout"""
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(self.iter_rows())
+
+
+def migrate_csv(csv_path, catalog):
+    """Copy every row of a legacy image_data.csv into the catalog, once"""
+    if catalog.get_meta("legacy_csv_imported"):
+        return False
+    with open(csv_path, newline="") as f:
+        # The marker commits with the rows, so an interrupted migration reruns
+        catalog.add_many(csv.DictReader(f), meta={"legacy_csv_imported": os.path.abspath(csv_path)})
+    return True
+
+
+def open_catalog(image_folder):
+    """Open the catalog for an images folder, importing the legacy CSV if present"""
+    os.makedirs(image_folder, exist_ok=True)
+    catalog = ImageCatalog(os.path.join(image_folder, CATALOG_FILENAME))
+    csv_path = os.path.join(image_folder, LEGACY_CSV_FILENAME)
+    if os.path.exists(csv_path):
+        migrate_csv(csv_path, catalog)
+    return catalog
@@ -0,0 +1,215 @@
+"""
+Headless command line interface to an image collection.
+
+    python -m image_core import dump/ --description "Ticket 4821"
+    python -m image_core list --format jsonl | head
+    python -m image_core analyze --json
+    python -m image_core verify --hash --orphans
+    python -m image_core export catalog.csv
+
+Commands stream their output (rows are read a keyset page at a time), use
+the same parallel import and verification code as the desktop apps, and
+only import pandas or NumPy when they need them. --profile FILE runs any
+command under cProfile for inspecting the hot paths.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from image_core.catalog import COLUMNS, open_catalog
+
+LIST_COLUMNS = ["id"] + COLUMNS + ["content_hash"]
+
+
+def write_rows(rows, out, fmt):
+    """Stream catalog rows as tsv, csv or jsonl"""
+    if fmt == "jsonl":
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+        return
+    writer = csv.DictWriter(out, fieldnames=LIST_COLUMNS, extrasaction="ignore",
+                            delimiter="\t" if fmt == "tsv" else ",", lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def cmd_import(args, catalog):
+    from image_core.batch import import_batch
+    from image_core.blobs import DEFAULT_LINK
+    from image_core.features import open_feature_store
+    from image_core.thumbnails import open_thumbnail_cache
+
+    thumbnails = None if args.no_thumbnails else open_thumbnail_cache(args.images)
+    features = None if args.no_features else open_feature_store(args.images)
+
+    def on_progress(done, total):
+        if done % 100 == 0 or done == total:
+            print(f"  {done}/{total} files copied", file=sys.stderr)
+
+    try:
+        report = import_batch(
+            catalog, args.images, args.paths,
+            description=args.description,
+            sidecar=args.sidecar,
+            workers=args.workers,
+            thumbnails=thumbnails,
+            on_progress=on_progress,
+            features=features,
+            link="hardlink" if args.hardlink else DEFAULT_LINK,
+        )
+    finally:
+        if thumbnails:
+            thumbnails.close()
+
+    for source, error in report.errors:
+        print(f"✗ {source}: {error}")
+    print(report.summary())
+    return 1 if report.errors else 0
+
+
+def cmd_list(args, catalog):
+    rows = catalog.iter_rows(after_id=args.after_id)
+    if args.limit is not None:
+        rows = (row for _, row in zip(range(args.limit), rows))
+    write_rows(rows, sys.stdout, args.format)
+    return 0
+
+
+def cmd_analyze(args, catalog):
+    from image_core.analytics import collection_stats, feature_stats
+    from image_core.features import open_feature_store
+
+    stats = collection_stats(catalog, recount=args.recount)
+    features = feature_stats(open_feature_store(args.images))
+    if args.json:
+        counts, edges = features["megapixels"]
+        sizes, size_edges = features["size_kb"]
+        print(json.dumps({
+            "total": stats["total"],
+            "oldest": str(stats["oldest"]) if stats["oldest"] is not None else None,
+            "newest": str(stats["newest"]) if stats["newest"] is not None else None,
+            "months": {month: int(n) for month, n in stats["month_counts"].items()},
+            "extensions": {ext: int(n) for ext, n in stats["ext_counts"].items()},
+            "indexed": features["indexed"],
+            "modes": {mode: int(n) for mode, n in features["modes"].items()},
+            "megapixels": {"counts": counts.tolist(), "edges": edges.tolist()},
+            "size_kb": {"counts": sizes.tolist(), "edges": size_edges.tolist()},
+        }, indent=2))
+        return 0
+
+    print(f"Total images: {stats['total']}")
+    if stats["total"]:
+        print(f"Oldest image: {stats['oldest']:%Y-%m-%d}")
+        print(f"Newest image: {stats['newest']:%Y-%m-%d}")
+    print("\nImages added by month:")
+    for month, n in stats["month_counts"].items():
+        print(f"  {month}  {n:>8}")
+    print("\nImage types:")
+    for ext, n in stats["ext_counts"].items():
+        print(f"  {ext or '(none)':<8} {n:>8}  {n / max(1, stats['total']):6.1%}")
+    print(f"\nIndexed images: {features['indexed']} (run backfill_features.py for the rest)"
+          if features["indexed"] < stats["total"] else f"\nIndexed images: {features['indexed']}")
+    if features["indexed"]:
+        counts, edges = features["megapixels"]
+        print("Resolution (megapixels):")
+        for low, high, n in zip(edges[:-1], edges[1:], counts):
+            if n:
+                print(f"  {low:8.2f} - {high:8.2f}  {n:>8}")
+    return 0
+
+
+def cmd_verify(args, catalog):
+    from image_core.verify import VerifyReport, verify_catalog
+
+    report = VerifyReport()
+    for row, problems in verify_catalog(catalog, args.images, rehash=args.hash, decode=args.decode,
+                                        orphans=args.orphans, workers=args.workers, report=report):
+        for problem in problems:
+            print(f"✗ #{row['id']} {row['original_name']} ({row['filename']}): {problem}", flush=True)
+    print(report.summary())
+    return 1 if report.problems else 0
+
+
+def cmd_export(args, catalog):
+    if args.output == "-":
+        write_rows(catalog.iter_rows(), sys.stdout, args.format)
+    elif args.format == "legacy":
+        catalog.export_csv(args.output)
+    else:
+        with open(args.output, "w", newline="") as f:
+            write_rows(catalog.iter_rows(), f, args.format)
+    if args.output != "-":
+        print(f"Exported {catalog.count()} entries to {args.output}", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m image_core", description="Manage an image collection without the UI")
+    parser.add_argument("--images", default="images", help="collection folder (default: images)")
+    parser.add_argument("--profile", metavar="FILE", help="run under cProfile and write stats to FILE")
+    # Also accepted after the command name, e.g. "import dump/ --images /srv/images"
+    collection = argparse.ArgumentParser(add_help=False)
+    collection.add_argument("--images", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_import = commands.add_parser("import", parents=[collection], help="import image files and folders in parallel")
+    parser_import.add_argument("paths", nargs="+", help="image files or folders to import")
+    parser_import.add_argument("--description", default="", help="description for images not in the sidecar")
+    parser_import.add_argument("--sidecar", help="CSV with filename,description columns (default: descriptions.csv in the folder)")
+    parser_import.add_argument("--workers", type=int, help="parallel copy/hash workers")
+    parser_import.add_argument("--hardlink", action="store_true",
+                               help="hardlink instead of copying where reflinks are unsupported; "
+                                    "only for sources that are never edited after import")
+    parser_import.add_argument("--no-thumbnails", action="store_true", help="skip pre-rendering thumbnails")
+    parser_import.add_argument("--no-features", action="store_true",
+                               help="skip feature extraction (run backfill_features.py later)")
+    parser_import.set_defaults(run=cmd_import)
+
+    parser_list = commands.add_parser("list", parents=[collection], help="stream catalog entries")
+    parser_list.add_argument("--format", choices=["tsv", "csv", "jsonl"], default="tsv")
+    parser_list.add_argument("--limit", type=int, help="stop after this many entries")
+    parser_list.add_argument("--after-id", type=int, default=0, help="start after this catalog id")
+    parser_list.set_defaults(run=cmd_list)
+
+    parser_analyze = commands.add_parser("analyze", parents=[collection], help="collection statistics")
+    parser_analyze.add_argument("--json", action="store_true", help="machine-readable output")
+    parser_analyze.add_argument("--recount", action="store_true",
+                                help="count from every entry instead of the running counters (slow; checks them)")
+    parser_analyze.set_defaults(run=cmd_analyze)
+
+    parser_verify = commands.add_parser("verify", parents=[collection], help="check that every entry's file exists (and is intact)")
+    parser_verify.add_argument("--hash", action="store_true", help="re-hash files and compare with the catalog")
+    parser_verify.add_argument("--decode", action="store_true", help="check that files parse as images")
+    parser_verify.add_argument("--orphans", action="store_true", help="also count blobs no entry references")
+    parser_verify.add_argument("--workers", type=int, help="parallel check workers")
+    parser_verify.set_defaults(run=cmd_verify)
+
+    parser_export = commands.add_parser("export", parents=[collection], help="write the catalog to a file")
+    parser_export.add_argument("output", help="output path, or - for stdout")
+    parser_export.add_argument("--format", choices=["legacy", "csv", "tsv", "jsonl"], default="legacy",
+                               help="legacy is the old image_data.csv layout (default)")
+    parser_export.set_defaults(run=cmd_export)
+    return parser
+
+
+def main(argv=None):
+    """Run one command against the collection; returns the exit status"""
+    args = build_parser().parse_args(argv)
+    catalog = open_catalog(args.images)
+    try:
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            status = profiler.runcall(args.run, args, catalog)
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to {args.profile} (python -m pstats {args.profile})", file=sys.stderr)
+            return status
+        return args.run(args, catalog)
+    except BrokenPipeError:
+        # Output piped into head or similar; stop quietly
+        sys.stdout = None
+        return 0
+    finally:
+        catalog.close()
@@ -0,0 +1,270 @@
+"""
+Per-image features: dimensions, mode, file size, EXIF capture time, a
+coarse colour histogram and a 64-bit difference hash.
+
+extract_features decodes each image once, at a small draft/reduced size, and
+is a plain top-level function so it can run in a process pool (the
+histogram and hash hold the GIL). Results go into a FeatureStore: one .npy
+file per column under images/features, preallocated and grown by doubling,
+so appends write in place and analysis memory-maps only the columns it
+reads instead of decoding images again. The UI and backfill_features.py
+may write to the same store at once: appends and removals hold an
+exclusive lock on features.lock and re-read the row count under it.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows; writers are then only serialized within a process
+    fcntl = None
+
+import numpy as np
+from PIL import Image
+
+from image_core.loader import load_preview
+
+FEATURES_DIRNAME = "features"
+META_FILENAME = "features.json"
+LOCK_FILENAME = "features.lock"
+# Joint RGB histogram with this many levels per channel (4 -> 64 bins)
+HISTOGRAM_LEVELS = 4
+HISTOGRAM_BINS = HISTOGRAM_LEVELS ** 3
+# Decode size for the histogram; the hash resamples this further to 9x8
+SAMPLE_BOX = (64, 64)
+INITIAL_CAPACITY = 1024
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
+# EXIF DateTimeOriginal lives in the Exif sub-IFD; DateTime is the fallback
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 36867
+EXIF_DATETIME = 306
+EXIF_DATE_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+# Column name -> (dtype, per-row shape)
+COLUMNS = {
+    "id": ("<i8", ()),
+    "width": ("<i4", ()),
+    "height": ("<i4", ()),
+    "mode": ("<U8", ()),
+    "bytes": ("<i8", ()),
+    "captured": ("<M8[s]", ()),
+    "dhash": ("<u8", ()),
+    "histogram": ("<f2", (HISTOGRAM_BINS,)),
+}
+
+
+def capture_time(img):
+    """EXIF capture time as an ISO string, or None"""
+    try:
+        exif = img.getexif()
+        value = exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL) or exif.get(EXIF_DATETIME)
+        return datetime.strptime(str(value).strip("\x00 "), EXIF_DATE_FORMAT).isoformat() if value else None
+    except (ValueError, TypeError, AttributeError, OSError):
+        return None
+
+
+def color_histogram(img):
+    """Joint RGB histogram of an image as fractions of its pixels"""
+    pixels = np.asarray(img.convert("RGB"), dtype=np.uint8).reshape(-1, 3)
+    shift = 8 - int(np.log2(HISTOGRAM_LEVELS))
+    quantized = pixels >> shift
+    bins = (quantized[:, 0].astype(np.intp) * HISTOGRAM_LEVELS + quantized[:, 1]) * HISTOGRAM_LEVELS + quantized[:, 2]
+    counts = np.bincount(bins, minlength=HISTOGRAM_BINS)
+    return (counts / max(1, len(pixels))).astype(np.float16)
+
+
+def difference_hash(img):
+    """64-bit dHash: whether each pixel of a 9x8 greyscale thumbnail is brighter than its left neighbour"""
+    grey = np.asarray(img.convert("L").resize((9, 8), Image.Resampling.BILINEAR), dtype=np.int16)
+    bits = np.packbits(grey[:, 1:] > grey[:, :-1])
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def extract_features(path):
+    """Features of one image file as a dict of plain values (picklable for process pools)"""
+    with Image.open(path) as img:
+        width, height = img.size
+        mode = img.mode
+        captured = capture_time(img)
+    # Header fields above are free; only the small sample below is decoded
+    sample = load_preview(path, SAMPLE_BOX)
+    return {
+        "width": width,
+        "height": height,
+        "mode": mode,
+        "bytes": os.path.getsize(path),
+        "captured": captured,
+        "dhash": difference_hash(sample),
+        "histogram": color_histogram(sample),
+    }
+
+
+class FeatureStore:
+    """Columnar, memory-mappable feature table keyed by catalog id"""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+        self.meta_path = os.path.join(folder, META_FILENAME)
+        self.lock_path = os.path.join(folder, LOCK_FILENAME)
+        self.load_meta()
+
+    def read_meta(self):
+        """Row count and capacity as last committed by any process"""
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"rows": 0, "capacity": 0}
+
+    def load_meta(self):
+        meta = self.read_meta()
+        self.rows = meta["rows"]
+        self.capacity = meta["capacity"]
+
+    @contextmanager
+    def write_lock(self):
+        """Exclusive across threads and processes, with the meta reloaded
+
+        Without fcntl (Windows) only threads of this process are serialized:
+        the UI and backfill_features.py writing at once can still overwrite
+        each other's rows there.
+        """
+        with self.lock, open(self.lock_path, "a") as lock_file:
+            if fcntl:
+                # Released when the file closes
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self.load_meta()
+            yield
+
+    def column_path(self, name):
+        return os.path.join(self.folder, f"{name}.npy")
+
+    def save_meta(self):
+        # Written after the column data, so a crash mid-append leaves the old row count
+        partial = self.meta_path + ".part"
+        with open(partial, "w") as f:
+            json.dump({"rows": self.rows, "capacity": self.capacity}, f)
+        os.replace(partial, self.meta_path)
+
+    def grow(self, needed):
+        """Reallocate every column with room for at least needed rows"""
+        capacity = max(INITIAL_CAPACITY, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        for name, (dtype, shape) in COLUMNS.items():
+            path = self.column_path(name)
+            partial = path + ".part"
+            grown = np.lib.format.open_memmap(partial, mode="w+", dtype=dtype, shape=(capacity,) + shape)
+            if self.rows:
+                grown[:self.rows] = np.load(path, mmap_mode="r")[:self.rows]
+            grown.flush()
+            del grown
+            os.replace(partial, path)
+        self.capacity = capacity
+
+    def append(self, ids, features):
+        """Add extract_features results for the given catalog ids
+
+        Ids that already have a row (e.g. written meanwhile by another
+        process) are skipped, so each id is stored at most once.
+        """
+        if not ids:
+            return
+        with self.write_lock():
+            if self.rows:
+                stored = np.load(self.column_path("id"), mmap_mode="r")[:self.rows]
+                fresh = ~np.isin(np.asarray(ids, dtype=np.int64), stored)
+                if not fresh.all():
+                    ids = [image_id for image_id, keep in zip(ids, fresh) if keep]
+                    features = [f for f, keep in zip(features, fresh) if keep]
+                    if not ids:
+                        return
+            start = self.rows
+            stop = start + len(ids)
+            if stop > self.capacity:
+                self.grow(stop)
+            values = {
+                "id": ids,
+                "captured": [np.datetime64(f["captured"], "s") if f["captured"] else np.datetime64("NaT") for f in features],
+            }
+            for name in COLUMNS:
+                column = np.load(self.column_path(name), mmap_mode="r+")
+                column[start:stop] = values[name] if name in values else [f[name] for f in features]
+                column.flush()
+            self.rows = stop
+            self.save_meta()
+
+    def remove(self, ids):
+        """Mark the rows of removed catalog entries as dead (id 0)"""
+        with self.write_lock():
+            if not self.rows:
+                return
+            column = np.load(self.column_path("id"), mmap_mode="r+")
+            live = column[:self.rows]
+            live[np.isin(live, list(ids))] = 0
+            column.flush()
+
+    def columns(self, names=None):
+        """Read-only memory maps of the live rows of the named columns"""
+        # Not self.rows: another process may have appended since
+        rows = self.read_meta()["rows"]
+        if not rows:
+            return {name: np.empty((0,) + COLUMNS[name][1], dtype=COLUMNS[name][0]) for name in names or COLUMNS}
+        ids = np.load(self.column_path("id"), mmap_mode="r")[:rows]
+        live = ids > 0
+        everything = live.all()
+        result = {}
+        for name in names or COLUMNS:
+            column = ids if name == "id" else np.load(self.column_path(name), mmap_mode="r")[:rows]
+            # Slicing keeps the memory map; only removals force a copy of the live rows
+            result[name] = column if everything else column[live]
+        return result
+
+    def indexed_ids(self):
+        return set(self.columns(["id"])["id"].tolist())
+
+
+def open_feature_store(image_folder):
+    """The feature store that belongs to an images folder"""
+    return FeatureStore(os.path.join(image_folder, FEATURES_DIRNAME))
+
+
+def extract_many(paths, workers=None, on_progress=None):
+    """extract_features over paths on a process pool; returns (features, errors) lists"""
+    results = []
+    errors = []
+    with ProcessPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as executor:
+        futures = [executor.submit(extract_features, path) for path in paths]
+        for done, (path, future) in enumerate(zip(paths, futures), start=1):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(None)
+                errors.append((path, str(e)))
+            if on_progress:
+                on_progress(done, len(paths))
+    return results, errors
+
+
+def index_features(store, image_folder, rows, workers=None, on_progress=None):
+    """Extract and store features for catalog rows; returns (indexed count, errors)"""
+    paths = [os.path.join(image_folder, row["filename"]) for row in rows]
+    results, errors = extract_many(paths, workers, on_progress)
+    ids = [row["id"] for row, features in zip(rows, results) if features]
+    store.append(ids, [features for features in results if features])
+    return len(ids), errors
+
+
+def backfill_features(catalog, store, image_folder, workers=None, on_progress=None):
+    """Index catalog entries that have no features yet, e.g. imported before extraction existed"""
+    indexed = store.indexed_ids()
+    missing = [row for row in catalog.rows() if row["id"] not in indexed]
+    return index_features(store, image_folder, missing, workers, on_progress)
@@ -0,0 +1,167 @@
+"""
+HTTP downloads for remote background images.
+
+One pooled requests.Session is shared by every fetch, with connect/read
+timeouts and urllib3 retries (exponential backoff, honouring Retry-After)
+for connection errors and 429/5xx responses. Bodies stream to a temporary
+file in chunks while being hashed, and are capped at max_bytes. The ETag,
+Last-Modified and content hash of each download are kept next to it, so a
+later fetch sends a conditional request, and a 304 or an identical body
+leaves the destination untouched.
+"""
+
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from image_core.hashing import content_hasher
+
+CHUNK_SIZE = 1 << 16
+# (connect, read) seconds; read is the longest wait for any chunk
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_SIZE = 4
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class FetchError(Exception):
+    """A download failed or was refused; status is the HTTP status, if a response came back"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class FetchTooLarge(FetchError):
+    """The response is bigger than the allowed size
+
+    status is None even though the server answered 200, so callers that
+    branch on status never take an oversize body for a success.
+    """
+
+    def __init__(self, message, max_bytes):
+        super().__init__(message)
+        self.max_bytes = max_bytes
+
+
+def make_session(retries=RETRIES, backoff_factor=BACKOFF_FACTOR):
+    """Session with pooled connections and retry/backoff on transient failures"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+        # Hand the final 5xx back instead of raising, so it is reported like any other status
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def shared_session():
+    """The process-wide session, created on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+
+def validators_path(destination):
+    return destination + ".http.json"
+
+
+def load_validators(destination):
+    """ETag, Last-Modified and content hash saved by the last fetch to destination"""
+    try:
+        with open(validators_path(destination)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_validators(destination, validators):
+    partial = validators_path(destination) + ".part"
+    with open(partial, "w") as f:
+        json.dump(validators, f)
+    os.replace(partial, validators_path(destination))
+
+
+def fetch(url, destination, session=None, timeout=DEFAULT_TIMEOUT, max_bytes=DEFAULT_MAX_BYTES):
+    """Download url to destination unless it is unchanged
+
+    Returns a dict with the destination path, the HTTP status, whether the
+    file changed, its size and its content hash. Raises FetchError (or
+    FetchTooLarge) for error statuses, network failures and oversize bodies.
+    """
+    session = session or shared_session()
+    validators = load_validators(destination) if os.path.exists(destination) else {}
+    if validators.get("url") != url:
+        validators = {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    try:
+        response = session.get(url, headers=headers, timeout=timeout, stream=True)
+    except requests.RequestException as e:
+        raise FetchError(f"Could not fetch {url}: {e}") from e
+
+    with response:
+        if response.status_code == 304:
+            return {"path": destination, "status": 304, "changed": False,
+                    "bytes": os.path.getsize(destination), "content_hash": validators.get("content_hash")}
+        if response.status_code != 200:
+            raise FetchError(f"Could not fetch {url}: HTTP {response.status_code}", response.status_code)
+        declared = int(response.headers.get("Content-Length") or 0)
+        if declared > max_bytes:
+            raise FetchTooLarge(f"{url} is {declared} bytes, over the {max_bytes} byte limit", max_bytes)
+
+        os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+        partial = f"{destination}.{os.getpid()}.{threading.get_ident()}.part"
+        digest = content_hasher()
+        size = 0
+        try:
+            with open(partial, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise FetchTooLarge(f"{url} exceeded the {max_bytes} byte limit", max_bytes)
+                    digest.update(chunk)
+                    f.write(chunk)
+        except requests.RequestException as e:
+            os.remove(partial)
+            raise FetchError(f"Could not fetch {url}: {e}") from e
+        except BaseException:
+            os.remove(partial)
+            raise
+
+    content_hash = digest.hexdigest()
+    changed = content_hash != validators.get("content_hash") or not os.path.exists(destination)
+    if changed:
+        os.replace(partial, destination)
+    else:
+        # Same bytes under new validators (e.g. a server without ETags)
+        os.remove(partial)
+    save_validators(destination, {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "content_hash": content_hash,
+    })
+    return {"path": destination, "status": 200, "changed": changed, "bytes": size, "content_hash": content_hash}
@@ -0,0 +1,24 @@
+"""
+BLAKE2b content hashing shared by the blob store, the thumbnail cache and
+downloads, so a file hashes to the same key everywhere.
+"""
+
+import hashlib
+
+CHUNK_SIZE = 1 << 20
+
+
+def content_hasher():
+    """New BLAKE2b hasher; catalog content hashes and cache keys share it"""
+    return hashlib.blake2b(digest_size=20)
+
+
+def hash_file(path, chunk_size=CHUNK_SIZE):
+    """Stream a file through BLAKE2b; returns (hex digest, size)"""
+    digest = content_hasher()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
@@ -0,0 +1,98 @@
+"""
+Paged, position-indexed view of the catalog for list widgets.
+
+A list only ever shows a screenful of rows, so rows are fetched from the
+catalog a page at a time and a bounded number of pages is kept. Every fetch
+is a primary-key range scan where possible: sequential scrolling continues
+from the neighbouring page's last id, and while ids have no gaps (nothing
+deleted) a position maps straight to an id. Otherwise jumps use OFFSET from
+whichever end of the collection is nearer.
+"""
+
+from collections import OrderedDict
+
+PAGE_SIZE = 100
+MAX_PAGES = 64
+
+
+class CatalogListModel:
+    """Rows of an ImageCatalog addressed by list position"""
+
+    def __init__(self, catalog, page_size=PAGE_SIZE, max_pages=MAX_PAGES):
+        self.catalog = catalog
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.reload()
+
+    def count(self):
+        return self._count
+
+    def page(self, number):
+        rows = self.pages.get(number)
+        if rows is not None:
+            self.pages.move_to_end(number)
+            return rows
+        start = number * self.page_size
+        previous = self.pages.get(number - 1)
+        if previous and len(previous) == self.page_size:
+            rows = self.catalog.page_after(previous[-1]["id"], self.page_size)
+        elif self.dense:
+            rows = self.catalog.page_after(self.first_id + start - 1, self.page_size)
+        elif start > self._count // 2:
+            limit = max(0, min(self.page_size, self._count - start))
+            rows = self.catalog.page_from_end(self._count - start - limit, limit)
+        else:
+            rows = self.catalog.page_at(start, self.page_size)
+        self.pages[number] = rows
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+        return rows
+
+    def row(self, index):
+        number, offset = divmod(index, self.page_size)
+        return self.page(number)[offset]
+
+    def rows(self, start, stop):
+        """Rows at positions [start, stop)"""
+        result = []
+        index = max(0, start)
+        stop = min(stop, self._count)
+        while index < stop:
+            number, offset = divmod(index, self.page_size)
+            chunk = self.page(number)[offset:offset + stop - index]
+            if not chunk:
+                break
+            result.extend(chunk)
+            index += len(chunk)
+        return result
+
+    def appended(self, row):
+        """Record a newly inserted row; it has the highest id, so it goes last"""
+        number, offset = divmod(self._count, self.page_size)
+        if not self._count:
+            self.first_id, self.dense = row["id"], True
+        else:
+            self.dense = self.dense and row["id"] == self.first_id + self._count
+        self._count += 1
+        rows = self.pages.get(number)
+        if rows is not None and len(rows) == offset:
+            rows.append(row)
+        else:
+            self.pages.pop(number, None)
+
+    def removed(self, index):
+        """Record that the row at index was deleted; later cached pages shift up"""
+        self._count -= 1
+        # A gap in the ids breaks the position -> id mapping
+        self.dense = False
+        first = index // self.page_size
+        for number in [number for number in self.pages if number >= first]:
+            del self.pages[number]
+
+    def reload(self):
+        """Forget cached pages, e.g. after an import committed many rows at once"""
+        self.pages.clear()
+        self._count = self.catalog.count()
+        self.first_id, last_id = self.catalog.id_range()
+        self.dense = bool(self._count) and last_id - self.first_id + 1 == self._count
@@ -0,0 +1,63 @@
+"""
+Reduced-size image loading for previews.
+
+Decoding a 24 MP photo only to show it at 700x500 wastes most of the work.
+load_preview asks the JPEG decoder for the smallest DCT scale (1/2, 1/4 or
+1/8) that still covers the target box, or box-reduces other formats by an
+integer factor, and only then runs the final LANCZOS resample. Previews
+always come back as RGB, RGBA or L, whatever the file's mode.
+"""
+
+from PIL import Image
+
+# Decode to at least this multiple of the target before the final resample;
+# 1.0 is the cheapest scale that still covers the box
+REDUCING_GAP = 1.0
+
+
+def fit_size(size, box):
+    """Largest size with the image's aspect ratio that fits in box, never upscaled"""
+    width, height = size
+    max_width, max_height = box
+    if width <= max_width and height <= max_height:
+        return width, height
+    ratio = min(max_width / width, max_height / height)
+    return max(1, int(width * ratio)), max(1, int(height * ratio))
+
+
+def reduce_factor(size, target, reducing_gap=REDUCING_GAP):
+    """Largest integer reduction that keeps reducing_gap times the target size"""
+    factor = int(min(size[0] / (target[0] * reducing_gap), size[1] / (target[1] * reducing_gap)))
+    return max(1, factor)
+
+
+def display_mode(img):
+    """img converted to RGB, or RGBA if it has transparency, unless already RGB, RGBA or L"""
+    if img.mode in ("RGB", "RGBA", "L"):
+        return img
+    # 16-bit, float, CMYK and palette images can't be reduced or resampled with LANCZOS
+    transparent = "A" in img.getbands() or "transparency" in img.info
+    return img.convert("RGBA" if transparent else "RGB")
+
+
+def load_preview(path, box, stretch=False, reducing_gap=REDUCING_GAP):
+    """Load an image scaled to fit box (or exactly box, if stretch) with the cheapest decode"""
+    img = Image.open(path)
+    target = tuple(box) if stretch else fit_size(img.size, box)
+    if target == img.size:
+        img.load()
+        return display_mode(img)
+
+    if img.format == "JPEG":
+        # Scale-on-decode: libjpeg skips the discarded DCT coefficients
+        mode = img.mode if img.mode in ("RGB", "L") else "RGB"
+        img.draft(mode, (int(target[0] * reducing_gap), int(target[1] * reducing_gap)))
+        # draft() can't leave CMYK, so that still needs converting below
+        img = display_mode(img)
+    else:
+        img = display_mode(img)
+        factor = reduce_factor(img.size, target, reducing_gap)
+        if factor > 1:
+            img = img.reduce(factor)
+
+    return img.resize(target, Image.Resampling.LANCZOS)
@@ -0,0 +1,124 @@
+"""
+Near-duplicate search over the 64-bit difference hashes in the FeatureStore.
+
+The hashes are one packed uint64 column, so a query is an XOR against every
+entry followed by a vectorized popcount: np.bitwise_count where NumPy has
+it, otherwise a SWAR popcount run in cache-sized chunks. Either way a scan
+of a million hashes takes a few milliseconds, which is faster than walking
+a BK-tree in Python at the radii near-duplicates need (see
+benchmarks/bench_similarity.py).
+"""
+
+import os
+
+import numpy as np
+
+from image_core.features import SAMPLE_BOX, difference_hash
+from image_core.loader import load_preview
+
+# dHash bits that may differ for two images to count as near-duplicates
+DEFAULT_MAX_DISTANCE = 10
+DEFAULT_LIMIT = 50
+# Rows per SWAR pass; keeps the temporaries in L2
+CHUNK_ROWS = 1 << 15
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+_SHIFTS = [np.uint64(n) for n in (1, 2, 4, 56)]
+
+
+def _swar_popcount(x, out):
+    """Bit counts of the uint64 array x (modified in place) into out"""
+    one, two, four, top = _SHIFTS
+    y = x >> one
+    y &= _M1
+    x -= y
+    y = x >> two
+    y &= _M2
+    x &= _M2
+    x += y
+    y = x >> four
+    x += y
+    x &= _M4
+    x *= _H01
+    x >>= top
+    out[:] = x
+
+
+def swar_distances(hashes, query):
+    """hamming_distances without np.bitwise_count, one cache-sized chunk at a time"""
+    distances = np.empty(len(hashes), dtype=np.uint8)
+    for start in range(0, len(hashes), CHUNK_ROWS):
+        stop = start + CHUNK_ROWS
+        _swar_popcount(np.bitwise_xor(hashes[start:stop], query), distances[start:stop])
+    return distances
+
+
+def hamming_distances(hashes, query):
+    """Number of differing bits between query and each hash, as uint8"""
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    query = np.uint64(query)
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(np.bitwise_xor(hashes, query))
+    return swar_distances(hashes, query)
+
+
+def image_hash(path):
+    """dHash of any image file, computed the same way extract_features does"""
+    return difference_hash(load_preview(path, SAMPLE_BOX))
+
+
+class HashIndex:
+    """Catalog ids and their packed dHashes, searchable by Hamming distance"""
+
+    def __init__(self, ids, hashes):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.hashes = np.asarray(hashes, dtype=np.uint64)
+
+    @classmethod
+    def from_store(cls, features):
+        columns = features.columns(["id", "dhash"])
+        return cls(columns["id"], columns["dhash"])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def hash_of(self, image_id):
+        """Stored hash of a catalog id, or None if it has not been indexed"""
+        matches = np.flatnonzero(self.ids == image_id)
+        return int(self.hashes[matches[-1]]) if len(matches) else None
+
+    def search(self, query, max_distance=DEFAULT_MAX_DISTANCE, limit=DEFAULT_LIMIT, exclude=None):
+        """(id, distance) pairs within max_distance of query, closest first"""
+        distances = hamming_distances(self.hashes, query)
+        candidates = np.flatnonzero(distances <= max_distance)
+        if exclude is not None:
+            candidates = candidates[self.ids[candidates] != exclude]
+        # Stable sort keeps import order among equal distances
+        candidates = candidates[np.argsort(distances[candidates], kind="stable")][:limit]
+        return [(int(self.ids[i]), int(distances[i])) for i in candidates]
+
+
+def find_similar(catalog, features, image_folder, query, max_distance=DEFAULT_MAX_DISTANCE, limit=DEFAULT_LIMIT):
+    """Catalog rows near a catalog id or an image path, each with a "distance" key"""
+    index = HashIndex.from_store(features)
+    exclude = None
+    if isinstance(query, int):
+        exclude = query
+        query_hash = index.hash_of(query)
+        if query_hash is None:
+            # Not indexed yet: hash the stored file instead
+            row = catalog.get(query)
+            if row is None:
+                raise LookupError(f"No image with id {query}")
+            query_hash = image_hash(os.path.join(image_folder, row["filename"]))
+    else:
+        query_hash = image_hash(query)
+    results = []
+    for image_id, distance in index.search(query_hash, max_distance, limit, exclude):
+        row = catalog.get(image_id)
+        if row:
+            results.append(dict(row, distance=distance))
+    return results
@@ -0,0 +1,166 @@
+"""
+Background task runner for the Tk front ends.
+
+Copies, decodes, thumbnailing and analysis run on a worker pool. Workers
+never touch Tk: each finished job posts its callback to a queue, and the
+Tk thread drains that queue from a root.after loop, spending at most a few
+milliseconds per tick so the UI keeps painting at 60 fps.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+# Leave a core for the Tk thread; extra workers mostly fight it for the GIL
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+# One frame at 60 fps, and the share of it callbacks may use
+POLL_MS = 16
+DRAIN_BUDGET = 0.008
+
+
+class TaskCancelled(Exception):
+    """Raised inside a job whose task was cancelled"""
+
+
+class Task:
+    """Handle for one submitted job or batch: progress counters and cancellation"""
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.futures = []
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def processed(self):
+        """Items that are over, whether they succeeded, failed or were skipped"""
+        return self.done + self.failed + self.skipped
+
+    @property
+    def finished(self):
+        return self.processed >= self.total
+
+    def cancel(self):
+        """Stop queued jobs; running jobs can poll check() to stop early"""
+        self._cancelled.set()
+        for future in self.futures:
+            future.cancel()
+
+    def check(self):
+        if self.cancelled:
+            raise TaskCancelled()
+
+
+def _apply(call):
+    fn, args = call
+    return fn(*args)
+
+
+def _run_job(task, fn, item):
+    task.check()
+    return fn(item)
+
+
+class TaskRunner:
+    """Executor-backed jobs whose callbacks run on the Tk thread"""
+
+    def __init__(self, root, workers=None, processes=0):
+        self.root = root
+        self.threads = ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS, thread_name_prefix="image-task")
+        # CPU-bound work that holds the GIL can opt into a process pool. Spawned, not
+        # forked: a forked child would inherit the Tk connection and running threads
+        self.processes = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        ) if processes else None
+        self.pending = queue.SimpleQueue()
+        self.closed = False
+        self.root.after(POLL_MS, self.drain)
+
+    def post(self, callback, *args):
+        """Queue a callback to run on the Tk thread (safe from any thread)"""
+        self.pending.put((callback, args))
+
+    def drain(self):
+        """Run queued callbacks for up to DRAIN_BUDGET, then reschedule"""
+        deadline = time.perf_counter() + DRAIN_BUDGET
+        while time.perf_counter() < deadline:
+            try:
+                callback, args = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Task callback failed: {e}")
+        if not self.closed:
+            self.root.after(POLL_MS, self.drain)
+
+    def submit(self, fn, *args, on_done=None, on_error=None, process=False):
+        """Run fn(*args) in the background; on_done(result) or on_error(exc) on the Tk thread"""
+        return self.map(
+            _apply, [(fn, args)],
+            on_result=lambda item, result: on_done and on_done(result),
+            on_error=lambda item, exc: on_error and on_error(exc),
+            process=process,
+        )
+
+    def map(self, fn, items, on_result=None, on_error=None, on_progress=None, on_done=None, process=False):
+        """Run fn over items in the background with per-item callbacks on the Tk thread
+
+        on_result(item, result) and on_error(item, exc) fire as each item
+        finishes, on_progress(task) after every item and on_done(task) once
+        the whole batch has finished or been cancelled. process=True runs
+        on the process pool when the runner has one, and on the threads
+        otherwise.
+        """
+        items = list(items)
+        task = Task(len(items))
+        for item in items:
+            if process and self.processes:
+                future = self.processes.submit(fn, item)
+            else:
+                future = self.threads.submit(_run_job, task, fn, item)
+            future.add_done_callback(
+                lambda future, item=item: self.post(
+                    self.item_finished, task, item, future, on_result, on_error, on_progress, on_done
+                )
+            )
+            task.futures.append(future)
+        if not items and on_done:
+            self.post(on_done, task)
+        return task
+
+    def item_finished(self, task, item, future, on_result, on_error, on_progress, on_done):
+        # Runs on the Tk thread, so the counters need no lock
+        try:
+            result = future.result()
+        except (CancelledError, TaskCancelled):
+            task.skipped += 1
+        except Exception as e:
+            task.failed += 1
+            if on_error:
+                on_error(item, e)
+        else:
+            task.done += 1
+            if on_result:
+                on_result(item, result)
+        if on_progress:
+            on_progress(task)
+        if task.finished and on_done:
+            on_done(task)
+
+    def shutdown(self):
+        """Stop polling and drop queued jobs, e.g. when the window closes"""
+        self.closed = True
+        self.threads.shutdown(wait=False, cancel_futures=True)
+        if self.processes:
+            self.processes.shutdown(wait=False, cancel_futures=True)
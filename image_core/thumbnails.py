@@ -0,0 +1,208 @@
+"""
+Content-addressed thumbnail cache.
+
+Each source image is hashed (BLAKE2b) once per size/mtime and rendered into a
+small pyramid of JPEGs, one per entry in SIZES, under a .thumbnails folder
+next to the images folder. Later views decode the small cached JPEG instead
+of the full-resolution original. The cache is bounded by a disk budget and
+evicts least recently used thumbnails first.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from PIL import Image
+
+from image_core.hashing import hash_file
+from image_core.loader import load_preview
+
+THUMBNAIL_DIRNAME = ".thumbnails"
+INDEX_FILENAME = "index.sqlite3"
+
+# Named levels of the pyramid, as bounding boxes; the viewer fits in 700x500
+SIZES = {
+    "row": (48, 36),
+    "list": (160, 120),
+    "viewer": (700, 500),
+}
+DEFAULT_BUDGET_MB = int(os.getenv("THUMBNAIL_CACHE_MB", "256"))
+JPEG_QUALITY = 85
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    bytes INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+class ThumbnailCache:
+    """Disk-budgeted LRU cache of downscaled JPEG renditions"""
+
+    def __init__(self, cache_dir, sizes=None, budget_bytes=None):
+        self.cache_dir = cache_dir
+        self.sizes = dict(sizes or SIZES)
+        self.budget_bytes = DEFAULT_BUDGET_MB * 1024 * 1024 if budget_bytes is None else budget_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, INDEX_FILENAME), check_same_thread=False)
+        self.lock = threading.RLock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            with self.conn:
+                for statement in SCHEMA.split(";"):
+                    if statement.strip():
+                        self.conn.execute(statement)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def source_digest(self, path):
+        """Content hash of a source image, recomputed only when size or mtime change"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime_ns, digest FROM sources WHERE path = ?", (path,)
+            ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        return self.remember(path, hash_file(path)[0], stat)
+
+    def remember(self, path, digest, stat=None):
+        """Record a digest computed elsewhere, e.g. while copying the file in"""
+        path = os.path.abspath(path)
+        stat = stat or os.stat(path)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, digest),
+            )
+        return digest
+
+    def entry_name(self, digest, size):
+        width, height = self.sizes[size]
+        return f"{digest[:2]}/{digest}_{width}x{height}.jpg"
+
+    def entry_path(self, name):
+        return os.path.join(self.cache_dir, *name.split("/"))
+
+    def get(self, path, size="viewer"):
+        """Return the cached JPEG path for one pyramid level, rendering it if needed"""
+        digest = self.source_digest(path)
+        name = self.entry_name(digest, size)
+        if self.touch(name):
+            return self.entry_path(name)
+        return self.render(path, digest, [size])[size]
+
+    def open(self, path, size="viewer"):
+        """Decode the cached rendition of an image"""
+        img = Image.open(self.get(path, size))
+        img.load()
+        return img
+
+    def generate(self, path, digest=None):
+        """Render every pyramid level for an image, e.g. straight after import"""
+        digest = self.remember(path, digest) if digest else self.source_digest(path)
+        missing = [size for size in self.sizes if not self.touch(self.entry_name(digest, size))]
+        if missing:
+            self.render(path, digest, missing)
+        return {size: self.entry_path(self.entry_name(digest, size)) for size in self.sizes}
+
+    def touch(self, name):
+        """Mark an entry as used; False if it is not cached"""
+        if not os.path.exists(self.entry_path(name)):
+            return False
+        with self.lock, self.conn:
+            updated = self.conn.execute(
+                "UPDATE entries SET last_used = ? WHERE name = ?", (time.time(), name)
+            ).rowcount
+        return bool(updated)
+
+    def area(self, size):
+        width, height = self.sizes[size]
+        return width * height
+
+    def pyramid_source(self, path, digest, size):
+        """Smallest cached level larger than size, or the original if none is cached"""
+        for larger in sorted(self.sizes, key=self.area):
+            if self.area(larger) > self.area(size):
+                cached = self.entry_path(self.entry_name(digest, larger))
+                if os.path.exists(cached):
+                    return cached
+        return path
+
+    def render(self, path, digest, sizes=None):
+        """Decode once and write the requested levels, largest first"""
+        sizes = sorted(sizes or self.sizes, key=self.area, reverse=True)
+        written = {}
+        img = None
+        for size in sizes:
+            # Only the largest level is decoded, from the original or a larger
+            # cached level; each smaller level is downscaled from the previous one
+            if img is None:
+                img = load_preview(self.pyramid_source(path, digest, size), self.sizes[size])
+            else:
+                img = img.copy()
+                img.thumbnail(self.sizes[size], Image.Resampling.LANCZOS)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            written[size] = self.write(self.entry_name(digest, size), img)
+        self.evict()
+        return written
+
+    def write(self, name, img):
+        target = self.entry_path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        img.save(temp, "JPEG", quality=JPEG_QUALITY)
+        os.replace(temp, target)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (name, bytes, last_used) VALUES (?, ?, ?)",
+                (name, os.path.getsize(target), time.time()),
+            )
+        return target
+
+    def usage(self):
+        """Total bytes of cached thumbnails"""
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        """Delete least recently used thumbnails until the cache fits its budget"""
+        with self.lock:
+            excess = self.usage() - self.budget_bytes
+            if excess <= 0:
+                return 0
+            evicted = []
+            for name, size in self.conn.execute("SELECT name, bytes FROM entries ORDER BY last_used"):
+                if excess <= 0:
+                    break
+                evicted.append(name)
+                excess -= size
+            with self.conn:
+                self.conn.executemany("DELETE FROM entries WHERE name = ?", ((name,) for name in evicted))
+        for name in evicted:
+            try:
+                os.remove(self.entry_path(name))
+            except FileNotFoundError:
+                pass
+        return len(evicted)
+
+
+def open_thumbnail_cache(image_folder, budget_bytes=None):
+    """Open the thumbnail cache that sits next to an images folder"""
+    parent = os.path.dirname(os.path.abspath(image_folder))
+    return ThumbnailCache(os.path.join(parent, THUMBNAIL_DIRNAME), budget_bytes=budget_bytes)
@@ -0,0 +1,89 @@
+"""
+Consistency checks between the catalog and the files it points at.
+
+Entries are read a keyset page at a time and checked on a thread pool
+(stat, and optionally BLAKE2b re-hashing and a header decode, which all
+release the GIL), so problems stream out as they are found and memory
+stays flat however large the collection is.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from image_core.blobs import iter_blobs
+from image_core.hashing import hash_file
+
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+# Entries in flight at once; bounds memory on very large catalogs
+BATCH_SIZE = 1024
+
+
+class VerifyReport:
+    """Counts and throughput of one verification run"""
+
+    def __init__(self):
+        self.checked = 0
+        self.problems = 0
+        self.bytes = 0
+        self.orphans = 0
+        self.seconds = 0.0
+
+    @property
+    def entries_per_sec(self):
+        return self.checked / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        orphans = f", {self.orphans} unreferenced blob(s)" if self.orphans else ""
+        return (
+            f"Checked {self.checked} entries ({self.bytes / 1e6:.1f} MB) in {self.seconds:.2f}s: "
+            f"{self.entries_per_sec:.1f} entries/s, {self.problems} problem(s){orphans}"
+        )
+
+
+def check_entry(row, image_folder, rehash=False, decode=False):
+    """Problems with one catalog entry and its file size: (list of strings, bytes)"""
+    path = os.path.join(image_folder, row["filename"])
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return ["missing file"], 0
+    problems = []
+    if rehash and row.get("content_hash"):
+        digest, _ = hash_file(path)
+        if digest != row["content_hash"]:
+            problems.append(f"content hash {digest[:12]} does not match catalog {row['content_hash'][:12]}")
+    if decode:
+        try:
+            with Image.open(path) as img:
+                img.verify()
+        except Exception as e:
+            problems.append(f"cannot decode: {e}")
+    return problems, size
+
+
+def verify_catalog(catalog, image_folder, rehash=False, decode=False, orphans=False,
+                   workers=None, report=None):
+    """Yield (row, problems) for every faulty entry; counts go into report as it runs"""
+    report = report if report is not None else VerifyReport()
+    start = time.perf_counter()
+    rows = catalog.iter_rows(BATCH_SIZE)
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as executor:
+        while True:
+            batch = [row for _, row in zip(range(BATCH_SIZE), rows)]
+            if not batch:
+                break
+            results = executor.map(lambda row: check_entry(row, image_folder, rehash, decode), batch)
+            for row, (problems, size) in zip(batch, results):
+                report.checked += 1
+                report.bytes += size
+                if problems:
+                    report.problems += len(problems)
+                    yield row, problems
+    if orphans:
+        referenced = set(catalog.filenames())
+        # Not through BlobStore, whose constructor creates the blobs folder
+        report.orphans = sum(1 for relative, _ in iter_blobs(image_folder) if relative not in referenced)
+    report.seconds = time.perf_counter() - start
@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+"""
+Headless batch importer for the Image Container.
+Copies image files or whole directory trees into the collection without a display,
+e.g. on a server receiving support-ticket screenshot dumps.
+
+Usage:
+  python import_images.py screenshots/ extra.png --description "Ticket 4821"
+  python import_images.py dump/ --sidecar dump/descriptions.csv --workers 16
+
+This is the "import" command of python -m image_core, which also lists,
+analyzes, verifies and exports the collection.
+"""
+
+import sys
+
+from image_core.cli import main as run_command
+
+def main(argv=None):
+    """Import the given files and folders, then print throughput"""
+    # Same as python -m image_core import ...; kept for existing scripts
+    argv = sys.argv[1:] if argv is None else argv
+    return run_command(["import", *argv])
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,26 +2,40 @@
 """
 Image Container Application Runner
 This script ensures the background image exists and then runs the image container application.
+
+Usage:
+  python run_image_container.py
+  python run_image_container.py --install-deps
 """
 
+import argparse
+import importlib.util
 import os
 import subprocess
 import sys
 
-def run_application():
+# Import names of the packages in requirements.txt
+REQUIRED_MODULES = ["numpy", "pandas", "matplotlib", "PIL", "requests"]
+
+def missing_modules():
+    """Required packages that are not installed, checked without importing them"""
+    return [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+
+def run_application(install_deps=False):
     """Run the image container application with proper setup"""
     print("Starting Image Container Application...")
     
-    # Check if required libraries are installed
-    try:
-        import numpy
-        import pandas
-        import matplotlib
-        import PIL
-        import requests
-    except ImportError:
+    # Check if required libraries are installed; find_spec only locates them,
+    # so pandas and matplotlib are not loaded until the app needs them
+    missing = missing_modules()
+    if missing:
+        if not install_deps:
+            print(f"Required libraries not found: {', '.join(missing)}")
+            print("Run: pip install -r requirements.txt (or pass --install-deps)")
+            return False
         print("Required libraries not found. Installing dependencies...")
         subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        importlib.invalidate_caches()
     
     # Check if images directory exists
     if not os.path.exists('images'):
@@ -53,11 +67,19 @@ def run_application():
     
     # Run the main application
     try:
-        from image_container import ImageContainer
         import tkinter as tk
         
         print("Launching Image Container application...")
+        # Show the window first, then load the application into it
         root = tk.Tk()
+        root.title("Image Container")
+        root.geometry("800x600")
+        loading = tk.Label(root, text="Loading...")
+        loading.pack(expand=True)
+        root.update()
+        
+        from image_container import ImageContainer
+        loading.destroy()
         app = ImageContainer(root)
         root.mainloop()
         return True
@@ -66,4 +88,8 @@ def run_application():
         return False
 
 if __name__ == "__main__":
-    run_application() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the Image Container")
+    parser.add_argument("--install-deps", action="store_true",
+                        help="pip install requirements.txt if packages are missing")
+    args = parser.parse_args()
+    sys.exit(0 if run_application(args.install_deps) else 1) 
\ No newline at end of file
@@ -1,19 +1,45 @@
-import requests
 import os
+import shutil
 from PIL import Image
-from io import BytesIO
+from image_core.backgrounds import BACKGROUND_DIRNAME, save_background
+from image_core.fetch import FetchError, fetch
 
-def save_background_image():
+# URL of the image from the conversation
+# This would typically come from the user, but we're using a placeholder
+IMAGE_URL = "https://image-placeholder-url.jpg"  # Replace with actual image URL
+
+# Raw downloaded bytes, with the HTTP validators fetch() keeps beside them
+DOWNLOAD_PATH = os.path.join(BACKGROUND_DIRNAME, "download")
+# Content hash of the download background.jpg was last made from
+INSTALLED_PATH = DOWNLOAD_PATH + ".installed"
+
+def install_download(result):
+    """Make background.jpg from the downloaded file, skipping it if nothing changed"""
+    try:
+        with open(INSTALLED_PATH) as f:
+            installed = f.read().strip()
+    except FileNotFoundError:
+        installed = None
+    if installed == result["content_hash"] and os.path.exists('background.jpg'):
+        return False
+    
+    with Image.open(result["path"]) as img:
+        if img.format == "JPEG":
+            # Already a JPEG: copy the bytes instead of decoding and re-encoding
+            shutil.copyfile(result["path"], 'background.jpg')
+        else:
+            img.convert("RGB").save('background.jpg')
+    with open(INSTALLED_PATH, "w") as f:
+        f.write(result["content_hash"])
+    return True
+
+def save_background_image(image_url=IMAGE_URL):
     """Save the provided image as background.jpg"""
     try:
         # Create images directory if it doesn't exist
         if not os.path.exists('images'):
             os.makedirs('images')
         
-        # URL of the image from the conversation
-        # This would typically come from the user, but we're using a placeholder
-        image_url = "https://image-placeholder-url.jpg"  # Replace with actual image URL
-        
         # For local testing without downloading, we'll check if you have the image in the current directory
         if os.path.exists('headset_image.jpg'):
             print("Using local image as background")
@@ -22,24 +48,23 @@ def save_background_image():
             print("Background image saved successfully as background.jpg")
             return True
             
-        # If no local image found, try to download from URL
+        # If no local image found, try to download from URL (conditional, streamed, size-capped)
         try:
-            response = requests.get(image_url)
-            if response.status_code == 200:
-                img = Image.open(BytesIO(response.content))
-                img.save('background.jpg')
+            result = fetch(image_url, DOWNLOAD_PATH)
+            if install_download(result):
                 print("Background image downloaded and saved successfully as background.jpg")
-                return True
             else:
-                print(f"Failed to download image: HTTP {response.status_code}")
+                print("Background image unchanged on the server; kept background.jpg")
+            return True
+        except FetchError as e:
+            if e.status:
+                print(f"Failed to download image: {e}")
                 return False
-        except Exception as e:
             print(f"Error downloading image: {e}")
             
             # If download fails, create a placeholder image
             print("Creating placeholder background...")
-            placeholder = Image.new('RGB', (800, 600), color=(200, 220, 240))
-            placeholder.save('background.jpg')
+            save_background('background.jpg', (800, 600))
             print("Placeholder background created as background.jpg")
             return True
             
@@ -48,4 +73,4 @@ def save_background_image():
         return False
 
 if __name__ == "__main__":
-    save_background_image() 
\ No newline at end of file
+    save_background_image()
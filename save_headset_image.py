@@ -1,63 +1,84 @@
 import os
+import shutil
 from PIL import Image
-import matplotlib.pyplot as plt
-import numpy as np
+from image_core.assets import BackgroundAssets
+from image_core.backgrounds import save_background
 
-def save_headset_image():
+# Size of the saved illustration: 10x6 inches at 150 dpi, as it has always been drawn
+HEADSET_SIZE = (1500, 900)
+HEADSET_DPI = 150
+
+def render_headset(size, dpi=HEADSET_DPI):
+    """Draw the headset illustration at exactly size pixels"""
+    # Imported here: once a variant is stored, saving it again needs no matplotlib
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Circle
+    
+    # Create a canvas (no pyplot, so nothing global is left open)
+    fig = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    
+    # Set background color to light gray to mimic the desk surface
+    ax.set_facecolor('#f5f5f5')
+    
+    # Draw laptop-like shape (black rectangle)
+    laptop_x = np.array([2, 8, 8, 2, 2])
+    laptop_y = np.array([1, 1, 4, 4, 1])
+    ax.fill(laptop_x, laptop_y, color='#333333')
+    
+    # Draw headset-like shape (black curved line with circle for ear cup)
+    # Headband
+    headband_x = np.array([6, 9, 9])
+    headband_y = np.array([2, 2.5, 1.5])
+    ax.plot(headband_x, headband_y, color='black', linewidth=3)
+    
+    # Ear cup
+    ear_cup = Circle((8.5, 1.5), 0.8, color='#444444')
+    ax.add_artist(ear_cup)
+    
+    # Microphone
+    mic_x = np.array([7.5, 7, 6.5])
+    mic_y = np.array([1.5, 1, 0.8])
+    ax.plot(mic_x, mic_y, color='black', linewidth=2)
+    
+    # Hand silhouette on keyboard
+    hand_x = np.linspace(3, 5, 100)
+    hand_y = 1 + 0.3 * np.sin(hand_x)
+    ax.fill(hand_x, hand_y, color='#d0c0b0', alpha=0.7)
+    
+    # Remove axes and set limits
+    ax.axis('off')
+    ax.set_xlim(0, 10)
+    ax.set_ylim(0, 5)
+    
+    canvas.draw()
+    img = Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba()).convert("RGB")
+    # Inch sizes can round a pixel off
+    return img if img.size == tuple(size) else img.resize(size, Image.Resampling.LANCZOS)
+
+def headset_assets(dpi=HEADSET_DPI):
+    """Rendered variants of the illustration, one per size and DPI"""
+    return BackgroundAssets("headset", render_headset, dpi=dpi)
+
+def save_headset_image(size=HEADSET_SIZE, dpi=HEADSET_DPI):
     """
     Save the headset image shown in the chat as headset_image.jpg
     """
     try:
         # Create a placeholder image similar to the headset image shown in the chat
         # Since we can't directly download the image from the chat, we'll create a similar looking one
-        
-        # Create a canvas
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Set background color to light gray to mimic the desk surface
-        ax.set_facecolor('#f5f5f5')
-        
-        # Draw laptop-like shape (black rectangle)
-        laptop_x = np.array([2, 8, 8, 2, 2])
-        laptop_y = np.array([1, 1, 4, 4, 1])
-        ax.fill(laptop_x, laptop_y, color='#333333')
-        
-        # Draw headset-like shape (black curved line with circle for ear cup)
-        # Headband
-        headband_x = np.array([6, 9, 9])
-        headband_y = np.array([2, 2.5, 1.5])
-        ax.plot(headband_x, headband_y, color='black', linewidth=3)
-        
-        # Ear cup
-        ear_cup = plt.Circle((8.5, 1.5), 0.8, color='#444444')
-        ax.add_artist(ear_cup)
-        
-        # Microphone
-        mic_x = np.array([7.5, 7, 6.5])
-        mic_y = np.array([1.5, 1, 0.8])
-        ax.plot(mic_x, mic_y, color='black', linewidth=2)
-        
-        # Hand silhouette on keyboard
-        hand_x = np.linspace(3, 5, 100)
-        hand_y = 1 + 0.3 * np.sin(hand_x)
-        ax.fill(hand_x, hand_y, color='#d0c0b0', alpha=0.7)
-        
-        # Remove axes and set limits
-        ax.axis('off')
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 5)
-        
-        # Save the figure
-        plt.tight_layout()
-        plt.savefig('headset_image.jpg', dpi=150, bbox_inches='tight')
-        plt.close()
+        # Drawn once per size and DPI; later calls copy the stored variant
+        variant = headset_assets(dpi).render_variant(size)
+        shutil.copyfile(variant, 'headset_image.jpg')
         
         print("Headset image created and saved as headset_image.jpg")
         
         # Now we can use this as the background for our image container app
         # Copy it to background.jpg directly
-        img = Image.open('headset_image.jpg')
-        img.save('background.jpg')
+        shutil.copyfile(variant, 'background.jpg')
         print("Also saved as background.jpg for immediate use")
         
         return True
@@ -66,21 +87,9 @@ def save_headset_image():
         
         # Create a simple fallback image if the matplotlib approach fails
         try:
-            # Create a simple gradient image
-            width, height = 800, 600
-            image = Image.new('RGB', (width, height))
-            
-            # Create a blue-gray gradient background
-            for y in range(height):
-                for x in range(width):
-                    # Create a gradient from top to bottom
-                    r = int(200 - y/3)
-                    g = int(220 - y/3)
-                    b = int(240 - y/6)
-                    image.putpixel((x, y), (r, g, b))
-            
-            image.save('headset_image.jpg')
-            image.save('background.jpg')
+            # Create a simple blue-gray gradient image (cached after the first run)
+            save_background('headset_image.jpg', (800, 600))
+            save_background('background.jpg', (800, 600))
             print("Created alternative background images")
             return True
         except Exception as e2:
@@ -1,10 +1,16 @@
 import os
 import tkinter as tk
-from tkinter import filedialog, messagebox, Label, Button, Frame, Listbox, Scrollbar, StringVar
-import shutil
-from datetime import datetime
-from PIL import Image, ImageTk
-import csv
+from tkinter import filedialog, messagebox, Label, Button, Frame, StringVar
+from PIL import ImageTk
+from image_core.assets import BackgroundAssets
+from image_core.backgrounds import save_background
+from image_core.batch import import_batch
+from image_core.catalog import open_catalog
+from image_core.listmodel import CatalogListModel
+from image_core.tasks import TaskRunner
+from image_core.thumbnails import open_thumbnail_cache
+from background_label import BackgroundLabel
+from virtual_list import VirtualImageList
 
 class SimpleImageContainer:
     def __init__(self, root):
@@ -14,17 +20,20 @@ class SimpleImageContainer:
         
         # Set up paths
         self.image_folder = "images"
-        self.csv_file = os.path.join(self.image_folder, "image_data.csv")
         
-        # Ensure image folder exists
-        if not os.path.exists(self.image_folder):
-            os.makedirs(self.image_folder)
-            
-        # Create CSV file if it doesn't exist
-        if not os.path.exists(self.csv_file):
-            with open(self.csv_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["filename", "original_name", "date_added", "description"])
+        # Open the image catalog (creates the folder, imports image_data.csv once)
+        self.catalog = open_catalog(self.image_folder)
+        
+        # Cached thumbnails and viewer-size renditions
+        self.thumbnails = open_thumbnail_cache(self.image_folder)
+        
+        # Paged view of the catalog for the list
+        self.model = CatalogListModel(self.catalog)
+        
+        # Imports copy and hash files off the Tk thread
+        self.tasks = TaskRunner(self.root)
+        self.importing = False
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         # Create UI
         self.create_ui()
@@ -38,14 +47,9 @@ class SimpleImageContainer:
         main_frame = Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Try to load and set background image
+        # Try to load and set background image (cached per window size)
         try:
-            bg_img = Image.open("background.jpg")
-            bg_img = bg_img.resize((800, 600), Image.Resampling.LANCZOS)
-            self.bg_photo = ImageTk.PhotoImage(bg_img)
-            
-            # Create a label with the background image
-            bg_label = Label(main_frame, image=self.bg_photo)
+            bg_label = BackgroundLabel(main_frame, BackgroundAssets.for_file("background.jpg"))
             bg_label.place(x=0, y=0, relwidth=1, relheight=1)
         except Exception as e:
             print(f"Could not load background image: {e}")
@@ -72,14 +76,13 @@ class SimpleImageContainer:
         list_frame = Frame(controls_frame, bg="white", bd=1, relief=tk.SUNKEN)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-        # Scrollbar
-        scrollbar = Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Listbox for images
-        self.image_listbox = Listbox(list_frame, width=70, height=15, yscrollcommand=scrollbar.set)
-        self.image_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.image_listbox.yview)
+        # Virtualized list of images (draws only visible rows)
+        self.image_list = VirtualImageList(
+            list_frame, self.model,
+            format_row=lambda img: f"{img['original_name']} - {img['date_added']}",
+            on_activate=self.view_image
+        )
+        self.image_list.pack(fill=tk.BOTH, expand=True)
         
         # Status bar
         self.status_var = StringVar()
@@ -88,39 +91,24 @@ class SimpleImageContainer:
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
     
     def load_image_data(self):
-        """Load image data from CSV file"""
-        self.images = []
+        """Load image data from the catalog"""
         try:
-            with open(self.csv_file, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    self.images.append(row)
+            self.model.reload()
             
-            # Update listbox
+            # Update list
             self.update_image_list()
         except Exception as e:
             print(f"Error loading image data: {e}")
     
     def update_image_list(self):
-        """Update the image listbox with current image data"""
-        self.image_listbox.delete(0, tk.END)
-        if self.images:
-            for img in self.images:
-                self.image_listbox.insert(tk.END, f"{img['original_name']} - {img['date_added']}")
-        else:
-            self.image_listbox.insert(tk.END, "No images in collection")
-        
-        self.status_var.set(f"Images in collection: {len(self.images)}")
+        """Redraw the visible rows of the image list"""
+        self.image_list.refresh()
+        self.status_var.set(f"Images in collection: {self.model.count()}")
     
-    def save_image_data(self):
-        """Save image data to CSV file"""
-        try:
-            with open(self.csv_file, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=["filename", "original_name", "date_added", "description"])
-                writer.writeheader()
-                writer.writerows(self.images)
-        except Exception as e:
-            print(f"Error saving image data: {e}")
+    def add_to_image_list(self, image):
+        """Append a newly imported image without rebuilding the list"""
+        self.model.appended(image)
+        self.update_image_list()
     
     def import_image(self):
         """Import an image into the container"""
@@ -134,36 +122,39 @@ class SimpleImageContainer:
             filetypes=filetypes
         )
         
-        if filepath:
-            try:
-                # Get image details
-                original_filename = os.path.basename(filepath)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                new_filename = f"{timestamp}_{original_filename}"
-                destination = os.path.join(self.image_folder, new_filename)
-                
-                # Copy the file
-                shutil.copy2(filepath, destination)
-                
-                # Get description
-                description = self.prompt_for_description()
-                
-                # Add to image data
-                new_image = {
-                    "filename": new_filename,
-                    "original_name": original_filename,
-                    "date_added": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "description": description
-                }
-                
-                self.images.append(new_image)
-                self.save_image_data()
-                self.update_image_list()
-                
-                messagebox.showinfo("Success", f"Image '{original_filename}' imported successfully!")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to import image: {e}")
+        if not filepath:
+            return
+        if self.importing:
+            messagebox.showinfo("Info", "Please wait for the current import to finish")
+            return
+        
+        # Get description
+        description = self.prompt_for_description()
+        
+        def on_done(report):
+            self.importing = False
+            self.status_var.set(f"Images in collection: {self.model.count()}")
+            if report.errors:
+                messagebox.showerror("Error", f"Failed to import image: {report.errors[0][1]}")
+            elif report.duplicates:
+                messagebox.showinfo("Info", "This image is already in the collection")
+            else:
+                self.add_to_image_list(report.rows[0])
+                messagebox.showinfo("Success", f"Image '{os.path.basename(filepath)}' imported successfully!")
+        
+        def on_error(e):
+            self.importing = False
+            self.status_var.set(f"Images in collection: {self.model.count()}")
+            messagebox.showerror("Error", f"Failed to import image: {e}")
+        
+        # Copy, hash and catalog the file on a worker, skipping content already imported
+        self.importing = True
+        self.status_var.set(f"Importing {os.path.basename(filepath)}...")
+        self.tasks.submit(
+            lambda: import_batch(self.catalog, self.image_folder, [filepath],
+                                 description=description, thumbnails=self.thumbnails),
+            on_done=on_done, on_error=on_error
+        )
     
     def prompt_for_description(self):
         """Prompt user for image description"""
@@ -191,23 +182,24 @@ class SimpleImageContainer:
         
         return description_result[0]
     
+    def close(self):
+        self.tasks.shutdown()
+        self.root.destroy()
+    
     def view_image(self):
         """Open a window to view selected image"""
-        selected_idx = self.image_listbox.curselection()
+        selected_idx = self.image_list.curselection()
         
         if not selected_idx:
             messagebox.showinfo("Info", "Please select an image to view")
             return
             
-        if not self.images:
-            return
-            
         idx = selected_idx[0]
-        if idx >= len(self.images):
+        if idx >= self.model.count():
             return
             
         # Get image data
-        image_data = self.images[idx]
+        image_data = self.model.row(idx)
         image_path = os.path.join(self.image_folder, image_data['filename'])
         
         if os.path.exists(image_path):
@@ -221,17 +213,8 @@ class SimpleImageContainer:
             frame.pack(fill=tk.BOTH, expand=True)
             
             try:
-                # Load and display image
-                img = Image.open(image_path)
-                
-                # Calculate resize dimensions while maintaining aspect ratio
-                width, height = img.size
-                max_width, max_height = 700, 500
-                
-                if width > max_width or height > max_height:
-                    ratio = min(max_width/width, max_height/height)
-                    width, height = int(width*ratio), int(height*ratio)
-                    img = img.resize((width, height), Image.Resampling.LANCZOS)
+                # Load the cached viewer-size rendition (fits 700x500)
+                img = self.thumbnails.open(image_path, "viewer")
                 
                 photo = ImageTk.PhotoImage(img)
                 
@@ -257,20 +240,8 @@ def create_background_image():
     """Create a simple background image if it doesn't exist"""
     if not os.path.exists("background.jpg"):
         try:
-            # Create a simple gradient image
-            width, height = 800, 600
-            image = Image.new('RGB', (width, height))
-            
-            # Create a blue-gray gradient background similar to the headset image
-            for y in range(height):
-                for x in range(width):
-                    # Create a gradient from top to bottom
-                    r = int(200 - y/3)
-                    g = int(220 - y/3)
-                    b = int(240 - y/6)
-                    image.putpixel((x, y), (r, g, b))
-            
-            image.save('background.jpg')
+            # Blue-gray gradient similar to the headset image, rendered once and cached
+            save_background("background.jpg", (800, 600))
             print("Created background.jpg")
             return True
         except Exception as e:
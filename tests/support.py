@@ -0,0 +1,37 @@
+"""Fixtures shared by the image core tests"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+
+
+class FolderTestCase(unittest.TestCase):
+    """Gives each test an empty temporary folder, self.root, removed afterwards"""
+
+    def setUp(self):
+        super().setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        # Collection folder; created by whatever opens it first
+        self.images = os.path.join(self.root, "images")
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def write_file(self, relative, content):
+        """Write bytes to a file under self.root, making its folders; returns the path"""
+        path = self.path(relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def save_image(self, relative, size=(20, 10), color=0, mode="RGB", **params):
+        """Save a solid image under self.root, making its folders; returns the path"""
+        path = self.path(relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Image.new(mode, size, color).save(path, **params)
+        return path
@@ -0,0 +1,45 @@
+import unittest
+
+import pandas as pd
+
+from image_core.analytics import collection_stats, load_frame
+from image_core.catalog import open_catalog
+from tests.support import FolderTestCase
+from tests.test_counters import FILENAMES
+
+
+class CollectionStatsTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.catalog = open_catalog(self.images)
+        self.addCleanup(self.catalog.close)
+
+    def test_empty_catalog(self):
+        for recount in (False, True):
+            stats = collection_stats(self.catalog, recount=recount)
+            self.assertEqual((stats["total"], stats["oldest"], stats["newest"]), (0, None, None))
+            self.assertEqual(len(stats["month_counts"]), 0)
+
+    def test_recount_matches_the_counters(self):
+        for i, name in enumerate(FILENAMES):
+            self.catalog.add(name or "empty", name, f"202{i % 3}-0{i % 9 + 1}-05 10:00:0{i % 10}")
+        self.catalog.remove(3)
+        counted = collection_stats(self.catalog)
+        recounted = collection_stats(self.catalog, recount=True)
+        self.assertEqual(recounted["total"], counted["total"])
+        self.assertEqual((recounted["oldest"], recounted["newest"]), (counted["oldest"], counted["newest"]))
+        for key in ("month_counts", "ext_counts"):
+            self.assertEqual(list(recounted[key].items()), list(counted[key].items()))
+
+    def test_frame_columns_are_typed(self):
+        self.catalog.add("blobs/ab/cd.JPG", "cd.JPG", "2024-01-05 10:00:00")
+        self.catalog.add(".hidden", ".hidden", "not a date")
+        frame = load_frame(self.catalog.iter_rows())
+        self.assertTrue(pd.api.types.is_datetime64_dtype(frame["date_added"]))
+        self.assertTrue(frame["date_added"].isna().iloc[1])
+        self.assertIsInstance(frame["extension"].dtype, pd.CategoricalDtype)
+        self.assertEqual(frame["extension"].tolist(), [".jpg", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
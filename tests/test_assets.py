@@ -0,0 +1,95 @@
+import os
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from image_core import assets
+from image_core.assets import BackgroundAssets
+from tests.support import FolderTestCase
+
+
+class Renderer:
+    """render callback that records every size it is asked for"""
+
+    def __init__(self):
+        self.sizes = []
+
+    def __call__(self, size, dpi):
+        self.sizes.append(size)
+        return Image.new("RGB", size, (30, 60, 90))
+
+
+class BackgroundAssetsTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = self.path(".backgrounds")
+        self.render = Renderer()
+
+    def open(self, dpi=None):
+        return BackgroundAssets("sky", self.render, self.cache_dir, dpi)
+
+    def test_nearest_prefers_the_smallest_covering_variant(self):
+        background = self.open()
+        self.assertIsNone(background.nearest((800, 600)))
+        for size in ((640, 480), (1024, 768), (1920, 1080)):
+            background.render_variant(size)
+        self.assertEqual(background.nearest((800, 600)), (1024, 768))
+        self.assertEqual(background.nearest((1024, 768)), (1024, 768))
+        self.assertEqual(background.nearest((300, 200)), (640, 480))
+        # Nothing covers it: upscale the largest
+        self.assertEqual(background.nearest((2560, 1440)), (1920, 1080))
+        # Wider than every variant but one
+        self.assertEqual(background.nearest((1900, 300)), (1920, 1080))
+
+    def test_fit_resamples_without_rendering(self):
+        background = self.open()
+        self.assertIsNone(background.fit((800, 600)))
+        background.render_variant((1024, 768))
+        img = background.fit((800, 600))
+        self.assertEqual(img.size, (800, 600))
+        self.assertEqual(self.render.sizes, [(1024, 768)])
+
+    def test_get_renders_each_size_once(self):
+        background = self.open()
+        self.assertEqual(background.get((800, 600)).size, (800, 600))
+        self.assertEqual(background.get((800, 600)).size, (800, 600))
+        self.assertEqual(self.render.sizes, [(800, 600)])
+
+    def test_stored_variants_survive_a_restart(self):
+        self.open().render_variant((800, 600))
+        background = self.open()
+        self.assertTrue(background.has((800, 600)))
+        background.get((800, 600))
+        self.assertEqual(self.render.sizes, [(800, 600)])
+
+    def test_variants_are_kept_apart_by_dpi(self):
+        self.open(dpi=96).render_variant((800, 600))
+        self.assertFalse(self.open(dpi=192).has((800, 600)))
+        self.assertTrue(self.open(dpi=96).has((800, 600)))
+
+    def test_prune_drops_the_least_recently_used(self):
+        background = self.open()
+        with mock.patch.object(assets, "MAX_VARIANTS", 2):
+            for age, size in enumerate(((100, 100), (200, 200))):
+                os.utime(background.render_variant(size), (age, age))
+            # Showing the oldest exactly makes it recent again
+            background.fit((100, 100))
+            background.render_variant((300, 300))
+        self.assertEqual(sorted(background.variants), [(100, 100), (300, 300)])
+        self.assertEqual(sorted(self.open().variants), [(100, 100), (300, 300)])
+
+    def test_file_assets_follow_the_content(self):
+        source = self.save_image("sky.png", (400, 300), (200, 100, 0))
+        before = BackgroundAssets.for_file(source, self.cache_dir)
+        # Stored as JPEG, so allow a level of rounding
+        for got, expected in zip(before.get((40, 30)).getpixel((20, 15)), (200, 100, 0)):
+            self.assertAlmostEqual(got, expected, delta=2)
+        self.save_image("sky.png", (400, 300), (0, 100, 200))
+        after = BackgroundAssets.for_file(source, self.cache_dir)
+        self.assertNotEqual(after.key, before.key)
+        self.assertIsNone(after.nearest((40, 30)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from image_core import backgrounds
+from image_core.backgrounds import cached_background, linear_gradient, radial_gradient, render, save_background
+from tests.support import FolderTestCase
+
+BLACK, WHITE = (0, 0, 0), (255, 255, 255)
+RED, BLUE = (255, 0, 0), (0, 0, 255)
+
+
+def pixels(img):
+    return np.asarray(img, dtype=np.int16)
+
+
+class GradientTests(unittest.TestCase):
+    def test_linear_gradient_reaches_both_endpoints(self):
+        # 256 rows of 0..255: every row is exactly one level brighter than the last
+        column = pixels(linear_gradient((4, 256), BLACK, WHITE, dither=False))[:, 0, 0]
+        self.assertEqual(column.tolist(), list(range(256)))
+
+    def test_linear_gradient_direction_follows_the_angle(self):
+        size = (64, 48)
+        for angle, first, last in (
+            (0, (slice(None), 0), (slice(None), -1)),
+            (90, (0, slice(None)), (-1, slice(None))),
+            (180, (slice(None), -1), (slice(None), 0)),
+            (270, (-1, slice(None)), (0, slice(None))),
+        ):
+            with self.subTest(angle=angle):
+                img = pixels(linear_gradient(size, RED, BLUE, angle=angle, dither=False))
+                self.assertEqual(img.shape, (48, 64, 3))
+                # Each edge is within one interpolation step of its colour, and constant along the edge
+                np.testing.assert_allclose(img[first], np.broadcast_to(RED, img[first].shape), atol=4)
+                np.testing.assert_allclose(img[last], np.broadcast_to(BLUE, img[last].shape), atol=4)
+
+    def test_dither_is_deterministic_and_tracks_the_exact_mean(self):
+        plain = pixels(linear_gradient((200, 150), (10, 20, 30), (40, 50, 60), dither=False))
+        dithered = pixels(linear_gradient((200, 150), (10, 20, 30), (40, 50, 60)))
+        np.testing.assert_array_equal(dithered, pixels(linear_gradient((200, 150), (10, 20, 30), (40, 50, 60))))
+        self.assertLessEqual(np.abs(dithered - plain).max(), 1)
+        # Halfway between the endpoints; plain rounding drifts from it, dithering does not
+        self.assertAlmostEqual(dithered.mean(), 35, delta=0.01)
+
+    def test_flat_gradient_stays_flat_when_dithered(self):
+        img = pixels(linear_gradient((33, 17), (90, 90, 90), (90, 90, 90)))
+        self.assertEqual(np.unique(img).tolist(), [90])
+
+    def test_radial_gradient_runs_from_center_to_corners(self):
+        img = pixels(radial_gradient((101, 101), WHITE, BLACK, dither=False))
+        self.assertEqual(img[50, 50].tolist(), [255, 255, 255])
+        for corner in ((0, 0), (0, -1), (-1, 0), (-1, -1)):
+            self.assertLessEqual(img[corner].max(), 3)
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            render((10, 10), kind="conic", start=RED, end=BLUE)
+
+
+class BackgroundCacheTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = self.path(".backgrounds")
+
+    def test_cached_background_renders_once_per_spec(self):
+        spec = {"kind": "linear", "start": RED, "end": BLUE, "angle": 45}
+        with mock.patch.object(backgrounds, "render", wraps=backgrounds.render) as rendered:
+            first = cached_background((80, 60), self.cache_dir, **spec)
+            self.assertEqual(cached_background((80, 60), self.cache_dir, **spec), first)
+            other = cached_background((80, 60), self.cache_dir, **dict(spec, angle=0))
+        self.assertEqual(rendered.call_count, 2)
+        self.assertNotEqual(other, first)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), sorted(os.path.basename(p) for p in (first, other)))
+
+    def test_save_background_copies_the_default_gradient(self):
+        target = save_background(self.path("background.png"), (40, 30), self.cache_dir)
+        with Image.open(target) as img:
+            img = pixels(img)
+        np.testing.assert_allclose(img[0, 0], backgrounds.DEFAULT_BACKGROUND["start"], atol=4)
+        np.testing.assert_allclose(img[-1, 0], backgrounds.DEFAULT_BACKGROUND["end"], atol=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
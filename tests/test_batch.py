@@ -0,0 +1,67 @@
+import os
+import unittest
+
+from image_core.batch import BatchReport, commit_staged, import_batch, plan_imports
+from image_core.blobs import BlobStore
+from image_core.catalog import open_catalog
+from tests.support import FolderTestCase
+
+
+class ImportBatchTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = self.path("dump")
+        self.catalog = open_catalog(self.images)
+        self.addCleanup(self.catalog.close)
+
+    def write(self, relative, content):
+        return self.write_file(os.path.join("dump", relative), content)
+
+    def blobs(self):
+        return sorted(relative for relative, _ in BlobStore(self.images).iter_blobs())
+
+    def test_duplicate_content_in_one_batch_is_stored_once(self):
+        self.write("a.png", b"same")
+        self.write("nested/b.png", b"same")
+        self.write("c.png", b"other")
+        report = import_batch(self.catalog, self.images, [self.source], workers=2)
+        self.assertEqual(len(report.rows), 2)
+        self.assertEqual(len(report.duplicates), 1)
+        self.assertEqual(self.catalog.count(), 2)
+        self.assertEqual(self.blobs(), sorted(row["filename"] for row in self.catalog.rows()))
+
+    def test_reimport_skips_content_already_cataloged(self):
+        self.write("a.png", b"first")
+        import_batch(self.catalog, self.images, [self.source])
+        self.write("renamed.png", b"first")
+        report = import_batch(self.catalog, self.images, [os.path.join(self.source, "renamed.png")])
+        self.assertEqual(report.rows, [])
+        self.assertEqual(len(report.duplicates), 1)
+        self.assertEqual(self.catalog.count(), 1)
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_commit_staged_removes_blobs_of_in_batch_repeats(self):
+        store = BlobStore(self.images)
+        first = store.ingest(self.write("a.png", b"same"))
+        # A second job for the same content that still created its own blob
+        repeat_path = self.write("b.gif", b"same")
+        repeat = store.ingest(repeat_path)
+        staged = [
+            dict(first, source="a.png", original_name="a.png", description="", duplicate=False),
+            dict(repeat, source="b.gif", original_name="b.gif", description="", duplicate=False, created=True),
+        ]
+        report = commit_staged(self.catalog, staged, store, BatchReport())
+        self.assertEqual([row["filename"] for row in report.rows], [first["filename"]])
+        self.assertEqual(len(report.duplicates), 1)
+        self.assertEqual(self.blobs(), [first["filename"]])
+
+    def test_sidecar_descriptions_match_relative_paths(self):
+        self.write("nested/b.png", b"b")
+        self.write("c.png", b"c")
+        jobs = plan_imports([self.source], "fallback", {os.path.join("nested", "b.png"): "from sidecar"})
+        self.assertEqual({job["original_name"]: job["description"] for job in jobs},
+                         {"b.png": "from sidecar", "c.png": "fallback"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+from image_core.blobs import BlobStore
+from image_core.hashing import hash_file
+from tests.support import FolderTestCase
+
+
+class BlobStoreTests(FolderTestCase):
+    def test_ingest_keys_blobs_by_content(self):
+        store = BlobStore(self.images)
+        first = store.ingest(self.write_file("a.PNG", b"pixels"))
+        again = store.ingest(self.write_file("b.png", b"pixels"))
+        self.assertTrue(first["created"])
+        self.assertEqual((again["method"], again["created"]), ("existing", False))
+        self.assertEqual(first["filename"], again["filename"])
+        self.assertTrue(first["filename"].endswith(".png"))
+        self.assertEqual(hash_file(store.path(first["filename"]))[0], first["content_hash"])
+
+    def test_default_never_shares_an_inode_with_the_source(self):
+        source = self.write_file("a.png", b"original")
+        blob = BlobStore(self.images).ingest(source)
+        self.assertIn(blob["method"], ("reflink", "copy"))
+        with open(source, "wb") as f:
+            f.write(b"edited in place")
+        self.assertEqual(hash_file(BlobStore(self.images).path(blob["filename"]))[0], blob["content_hash"])
+
+    def test_hardlinking_is_opt_in(self):
+        source = self.write_file("a.png", b"original")
+        blob = BlobStore(self.images, link="hardlink").ingest(source)
+        if blob["method"] != "hardlink":
+            self.skipTest("temporary folder does not support hardlinks")
+        self.assertTrue(os.path.samefile(source, BlobStore(self.images).path(blob["filename"])))
+
+    def test_gc_waits_out_the_grace_period(self):
+        store = BlobStore(self.images, link="copy")
+        kept = store.ingest(self.write_file("kept.png", b"kept"))["filename"]
+        old = store.ingest(self.write_file("old.png", b"old"))["filename"]
+        other = store.ingest(self.write_file("other.png", b"other"))["filename"]
+
+        # Fresh blobs may belong to an import that has not committed yet
+        self.assertEqual(store.gc([kept]), (0, 0))
+
+        with mock.patch("image_core.blobs.time.time", return_value=time.time() + 60):
+            self.assertEqual(store.gc([kept], dry_run=True, grace_seconds=30), (2, 8))
+            self.assertEqual(len(list(store.iter_blobs())), 3)
+            self.assertEqual(store.gc([kept, other], grace_seconds=30), (1, 3))
+        self.assertEqual(sorted(relative for relative, _ in store.iter_blobs()), sorted([kept, other]))
+        self.assertFalse(os.path.exists(store.path(old)))
+
+    def test_gc_counts_no_space_for_blobs_still_linked_to_a_source(self):
+        store = BlobStore(self.images, link="hardlink")
+        blob = store.ingest(self.write_file("a.png", b"linked"))
+        if blob["method"] != "hardlink":
+            self.skipTest("temporary folder does not support hardlinks")
+        with mock.patch("image_core.blobs.time.time", return_value=time.time() + 60):
+            self.assertEqual(store.gc([], grace_seconds=30), (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import csv
+import sqlite3
+import unittest
+
+from image_core.catalog import (
+    CATALOG_FILENAME, COLUMNS, LEGACY_CSV_FILENAME, MIGRATIONS, ImageCatalog, open_catalog, split_statements,
+)
+from tests.support import FolderTestCase
+
+
+def pairs(rows):
+    return [tuple(row) for row in rows]
+
+
+class CatalogMigrationTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.catalog_path = self.path(CATALOG_FILENAME)
+
+    def user_version(self):
+        conn = sqlite3.connect(self.catalog_path)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_new_catalog_is_at_latest_version(self):
+        ImageCatalog(self.catalog_path).close()
+        self.assertEqual(self.user_version(), len(MIGRATIONS))
+
+    def test_old_catalog_is_upgraded_in_place(self):
+        # A catalog written before content hashing and counters existed
+        conn = sqlite3.connect(self.catalog_path)
+        for statement in split_statements(MIGRATIONS[0]):
+            conn.execute(statement)
+        conn.execute("INSERT INTO images (filename, original_name, date_added) VALUES ('a.png', 'a.png', '2024-01-05 10:00:00')")
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+        conn.close()
+
+        catalog = ImageCatalog(self.catalog_path)
+        self.addCleanup(catalog.close)
+        self.assertEqual(self.user_version(), len(MIGRATIONS))
+        self.assertEqual(catalog.get(1)["content_hash"], None)
+        self.assertEqual(pairs(catalog.month_counts()), [("2024-01", 1)])
+        self.assertEqual(pairs(catalog.extension_counts()), [(".png", 1)])
+
+    def test_reopening_does_not_rerun_migrations(self):
+        catalog = ImageCatalog(self.catalog_path)
+        catalog.add("a.png", "a.png", "2024-01-05 10:00:00")
+        catalog.close()
+        catalog = ImageCatalog(self.catalog_path)
+        self.addCleanup(catalog.close)
+        self.assertEqual(catalog.count(), 1)
+        self.assertEqual(pairs(catalog.month_counts()), [("2024-01", 1)])
+
+    def test_split_statements_keeps_trigger_bodies_whole(self):
+        statements = list(split_statements(MIGRATIONS[2]))
+        triggers = [s for s in statements if "CREATE TRIGGER" in s]
+        self.assertEqual(len(triggers), 2)
+        self.assertTrue(all(s.rstrip().endswith("END;") for s in triggers))
+
+
+class LegacyCsvTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.rows = [
+            {"filename": f"20240105_10000{i}_{i}.jpg", "original_name": f"{i}.jpg",
+             "date_added": f"2024-01-05 10:00:0{i}", "description": f"shot {i}"}
+            for i in range(3)
+        ]
+        with open(self.path(LEGACY_CSV_FILENAME), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def test_csv_is_imported_once(self):
+        open_catalog(self.root).close()
+        catalog = open_catalog(self.root)
+        self.addCleanup(catalog.close)
+        self.assertEqual([{c: row[c] for c in COLUMNS} for row in catalog.rows()], self.rows)
+        self.assertTrue(catalog.get_meta("legacy_csv_imported"))
+
+    def test_export_round_trips_the_legacy_layout(self):
+        catalog = open_catalog(self.root)
+        self.addCleanup(catalog.close)
+        exported = self.path("export.csv")
+        catalog.export_csv(exported)
+        with open(exported, newline="") as f:
+            self.assertEqual(list(csv.DictReader(f)), self.rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import unittest
+
+from image_core.cli import main
+from tests.support import FolderTestCase
+
+
+class CliTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = self.path("dump")
+        for i in range(3):
+            self.save_image(os.path.join("dump", f"{i}.png"), (30, 20 + i))
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            status = main(["--images", self.images, *argv])
+        return status, out.getvalue()
+
+    def test_import_list_verify_export(self):
+        status, output = self.run_cli("import", self.source, "--description", "ticket", "--no-thumbnails")
+        self.assertEqual(status, 0)
+        self.assertIn("Imported 3 of 3 files", output)
+
+        status, output = self.run_cli("list", "--format", "jsonl", "--limit", "2")
+        rows = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual([row["original_name"] for row in rows], ["0.png", "1.png"])
+        self.assertEqual({row["description"] for row in rows}, {"ticket"})
+
+        status, output = self.run_cli("list", "--after-id", str(rows[-1]["id"]))
+        self.assertEqual(len(output.splitlines()), 2)  # Header and the last row
+
+        self.assertEqual(self.run_cli("verify", "--hash", "--decode")[0], 0)
+        os.remove(os.path.join(self.images, rows[0]["filename"]))
+        status, output = self.run_cli("verify")
+        self.assertEqual(status, 1)
+        self.assertIn("missing file", output)
+
+        exported = self.path("catalog.csv")
+        self.assertEqual(self.run_cli("export", exported)[0], 0)
+        with open(exported, newline="") as f:
+            self.assertEqual(len(list(csv.DictReader(f))), 3)
+
+    def test_analyze_json(self):
+        self.run_cli("import", self.source, "--no-thumbnails")
+        status, output = self.run_cli("analyze", "--json")
+        stats = json.loads(output)
+        self.assertEqual((status, stats["total"], stats["indexed"]), (0, 3, 3))
+        self.assertEqual(stats["extensions"], {".png": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import unittest
+from collections import Counter
+
+from image_core.catalog import CATALOG_FILENAME, MIGRATIONS, ImageCatalog, extension_sql, split_statements
+from tests.support import FolderTestCase
+
+FILENAMES = [
+    "a.png", "b.PNG", "blobs/ab/abcdef.jpg", "archive.tar.gz", ".hidden", "..hidden", "..dots.png",
+    "dir.v2/file", "dir.v2/file.JPEG", "trailing.", "noext", "dir/.profile", "a.b/c.d/e", "",
+]
+
+
+def splitext_counts(filenames):
+    return Counter(os.path.splitext(name)[1].lower() for name in filenames)
+
+
+class ExtensionSqlTests(unittest.TestCase):
+    def test_matches_splitext(self):
+        conn = sqlite3.connect(":memory:")
+        self.addCleanup(conn.close)
+        conn.execute("CREATE TABLE names (filename TEXT)")
+        conn.executemany("INSERT INTO names VALUES (?)", [(name,) for name in FILENAMES])
+        extensions = dict(conn.execute(f"SELECT filename, {extension_sql('filename')} FROM names"))
+        self.assertEqual(extensions, {name: os.path.splitext(name)[1].lower() for name in FILENAMES})
+
+
+class CounterTriggerTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.catalog_path = self.path(CATALOG_FILENAME)
+
+    def open(self):
+        catalog = ImageCatalog(self.catalog_path)
+        self.addCleanup(catalog.close)
+        return catalog
+
+    def counts(self, catalog):
+        return dict(map(tuple, catalog.month_counts())), dict(map(tuple, catalog.extension_counts()))
+
+    def test_counters_follow_inserts_and_deletes(self):
+        catalog = self.open()
+        ids = [catalog.add(name or "empty", name or "empty", f"2024-0{i % 3 + 1}-05 10:00:00")["id"]
+               for i, name in enumerate(FILENAMES)]
+        inserted, _ = catalog.add_batch([{"filename": "batch.gif", "original_name": "batch.gif",
+                                          "date_added": "2024-04-01 00:00:00", "content_hash": "x"}])
+        names = [name or "empty" for name in FILENAMES] + ["batch.gif"]
+        months = Counter(f"2024-0{i % 3 + 1}" for i in range(len(FILENAMES))) + Counter(["2024-04"])
+        self.assertEqual(self.counts(catalog), (dict(months), dict(splitext_counts(names))))
+
+        for image_id in ids[:5] + [inserted[0]["id"]]:
+            catalog.remove(image_id)
+        rows = catalog.rows()
+        self.assertEqual(self.counts(catalog), (
+            dict(Counter(row["date_added"][:7] for row in rows)),
+            dict(splitext_counts(row["filename"] for row in rows)),
+        ))
+        # Counters that reach zero are dropped rather than left at 0
+        self.assertNotIn("2024-04", self.counts(catalog)[0])
+
+    def test_upgrade_backfills_counters(self):
+        # A catalog from before the counters existed
+        conn = sqlite3.connect(self.catalog_path)
+        for script in MIGRATIONS[:2]:
+            for statement in split_statements(script):
+                conn.execute(statement)
+        conn.executemany("INSERT INTO images (filename, original_name, date_added) VALUES (?, ?, '2024-01-05 10:00:00')",
+                         [(name, name) for name in ("x/.hidden", "dir.v2/file", "a.png")])
+        conn.execute("PRAGMA user_version = 2")
+        conn.commit()
+        conn.close()
+
+        catalog = self.open()
+        self.assertEqual(self.counts(catalog), ({"2024-01": 3}, {"": 2, ".png": 1}))
+        catalog.add("dir.v3/again", "again", "2024-01-06 10:00:00")
+        self.assertEqual(self.counts(catalog), ({"2024-01": 4}, {"": 3, ".png": 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
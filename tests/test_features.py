@@ -0,0 +1,72 @@
+import os
+import threading
+import unittest
+
+import numpy as np
+from image_core.features import INITIAL_CAPACITY, FeatureStore, extract_features
+from tests.support import FolderTestCase
+
+
+def fake_features(image_id):
+    return {
+        "width": image_id, "height": 10, "mode": "RGB", "bytes": image_id * 100, "captured": None,
+        "dhash": image_id, "histogram": np.full(64, 1 / 64),
+    }
+
+
+class FeatureStoreTests(FolderTestCase):
+    def append(self, store, ids):
+        store.append(list(ids), [fake_features(i) for i in ids])
+
+    def test_growth_keeps_earlier_rows(self):
+        store = FeatureStore(self.root)
+        self.append(store, range(1, 11))
+        self.assertEqual(store.capacity, INITIAL_CAPACITY)
+        self.append(store, range(11, INITIAL_CAPACITY * 2 + 6))
+        self.assertEqual(store.capacity, INITIAL_CAPACITY * 4)
+        columns = FeatureStore(self.root).columns(["id", "width", "dhash"])
+        expected = np.arange(1, INITIAL_CAPACITY * 2 + 6)
+        for name in ("id", "width", "dhash"):
+            np.testing.assert_array_equal(columns[name], expected)
+
+    def test_removed_rows_are_tombstoned(self):
+        store = FeatureStore(self.root)
+        self.append(store, range(1, 6))
+        store.remove([2, 4])
+        columns = store.columns(["id", "bytes"])
+        np.testing.assert_array_equal(columns["id"], [1, 3, 5])
+        np.testing.assert_array_equal(columns["bytes"], [100, 300, 500])
+        self.assertEqual(store.indexed_ids(), {1, 3, 5})
+
+    def test_second_writer_sees_rows_appended_by_the_first(self):
+        ui, backfill = FeatureStore(self.root), FeatureStore(self.root)
+        self.append(ui, [1, 2])
+        # Opened before the UI's append; must not overwrite rows 0-1
+        self.append(backfill, [2, 3])
+        self.assertEqual(ui.columns(["id"])["id"].tolist(), [1, 2, 3])
+        self.assertEqual(FeatureStore(self.root).rows, 3)
+
+    def test_concurrent_writers_keep_every_row_once(self):
+        stores = [FeatureStore(self.root) for _ in range(4)]
+        # Overlapping id ranges, so every id is offered by two writers
+        threads = [
+            threading.Thread(target=self.append, args=(store, range(i * 300 + 1, i * 300 + 601)))
+            for i, store in enumerate(stores)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids = FeatureStore(self.root).columns(["id"])["id"]
+        self.assertEqual(sorted(ids.tolist()), list(range(1, 1501)))
+
+    def test_extract_features_reads_the_image(self):
+        path = self.save_image("shot.png", (120, 80), (200, 30, 30))
+        features = extract_features(path)
+        self.assertEqual((features["width"], features["height"], features["mode"]), (120, 80, "RGB"))
+        self.assertEqual(features["bytes"], os.path.getsize(path))
+        self.assertAlmostEqual(float(np.sum(features["histogram"])), 1.0, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+import unittest
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from image_core.fetch import FetchError, FetchTooLarge, fetch, make_session, validators_path
+from tests.support import FolderTestCase
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes of the stand-in server; state lives on the server object"""
+
+    def log_message(self, *args):
+        pass
+
+    def send_empty(self, status, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+
+    def send_body(self, body, headers=()):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.hits[self.path] = server.hits.get(self.path, 0) + 1
+        server.requests.append((self.path, dict(self.headers)))
+        if self.path == "/image.jpg":
+            etag = f'"{server.version}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_empty(304)
+            else:
+                self.send_body(server.body, [("ETag", etag), ("Last-Modified", server.modified)])
+        elif self.path == "/plain.jpg":
+            self.send_body(server.body)
+        elif self.path == "/flaky.jpg":
+            if server.hits[self.path] <= 2:
+                self.send_empty(503, [("Retry-After", "0")])
+            else:
+                self.send_body(server.body)
+        elif self.path == "/down.jpg":
+            self.send_empty(503, [("Retry-After", "0")])
+        elif self.path == "/huge-declared":
+            self.send_response(200)
+            self.send_header("Content-Length", str(1 << 30))
+            self.end_headers()
+        elif self.path == "/huge-streamed":
+            # No Content-Length: only the running byte count can stop it
+            self.send_response(200)
+            self.end_headers()
+            try:
+                for _ in range(64):
+                    self.wfile.write(b"\0" * 65536)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            self.close_connection = True
+        elif self.path == "/stalled":
+            self.send_response(200)
+            self.send_header("Content-Length", "10")
+            self.end_headers()
+            time.sleep(2)
+        else:
+            self.send_empty(404)
+
+
+class FetchTests(FolderTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        super().setUp()
+        self.server.body = os.urandom(200_000)
+        self.server.version = 1
+        self.server.modified = formatdate(usegmt=True)
+        self.server.hits = {}
+        self.server.requests = []
+        self.session = make_session(backoff_factor=0)
+        self.addCleanup(self.session.close)
+        self.target = self.path("download")
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def leftovers(self):
+        return [name for name in os.listdir(self.root) if name.endswith(".part")]
+
+    def test_fresh_download_streams_to_disk(self):
+        result = fetch(f"{self.base}/image.jpg", self.target, self.session)
+        self.assertEqual((result["status"], result["changed"], result["bytes"]), (200, True, len(self.server.body)))
+        self.assertEqual(self.read(self.target), self.server.body)
+        self.assertTrue(os.path.exists(validators_path(self.target)))
+
+    def test_unchanged_image_is_revalidated_with_304(self):
+        first = fetch(f"{self.base}/image.jpg", self.target, self.session)
+        before = os.stat(self.target).st_mtime_ns
+        result = fetch(f"{self.base}/image.jpg", self.target, self.session)
+        self.assertEqual((result["status"], result["changed"]), (304, False))
+        self.assertEqual(result["content_hash"], first["content_hash"])
+        self.assertEqual(os.stat(self.target).st_mtime_ns, before)
+        _, headers = self.server.requests[-1]
+        self.assertEqual(headers.get("If-None-Match"), '"1"')
+        self.assertEqual(headers.get("If-Modified-Since"), self.server.modified)
+
+    def test_new_etag_replaces_the_file(self):
+        first = fetch(f"{self.base}/image.jpg", self.target, self.session)
+        self.server.body = os.urandom(1000)
+        self.server.version = 2
+        result = fetch(f"{self.base}/image.jpg", self.target, self.session)
+        self.assertEqual((result["status"], result["changed"]), (200, True))
+        self.assertNotEqual(result["content_hash"], first["content_hash"])
+        self.assertEqual(self.read(self.target), self.server.body)
+
+    def test_validators_are_not_sent_for_a_different_url(self):
+        fetch(f"{self.base}/image.jpg", self.target, self.session)
+        fetch(f"{self.base}/plain.jpg", self.target, self.session)
+        _, headers = self.server.requests[-1]
+        self.assertNotIn("If-None-Match", headers)
+
+    def test_identical_body_without_validators_is_not_rewritten(self):
+        fetch(f"{self.base}/plain.jpg", self.target, self.session)
+        before = os.stat(self.target).st_mtime_ns
+        result = fetch(f"{self.base}/plain.jpg", self.target, self.session)
+        self.assertEqual((result["status"], result["changed"]), (200, False))
+        self.assertEqual(os.stat(self.target).st_mtime_ns, before)
+        self.assertEqual(self.leftovers(), [])
+
+    def test_503_with_retry_after_is_retried(self):
+        result = fetch(f"{self.base}/flaky.jpg", self.target, self.session)
+        self.assertTrue(result["changed"])
+        self.assertEqual(self.server.hits["/flaky.jpg"], 3)
+
+    def test_retries_give_up_with_the_last_status(self):
+        with self.assertRaises(FetchError) as caught:
+            fetch(f"{self.base}/down.jpg", self.target, make_session(retries=2, backoff_factor=0))
+        self.assertEqual(caught.exception.status, 503)
+        self.assertEqual(self.server.hits["/down.jpg"], 3)
+
+    def test_http_errors_carry_their_status(self):
+        with self.assertRaises(FetchError) as caught:
+            fetch(f"{self.base}/missing.jpg", self.target, self.session)
+        self.assertEqual(caught.exception.status, 404)
+        self.assertFalse(os.path.exists(self.target))
+
+    def test_declared_size_over_the_cap_is_refused(self):
+        with self.assertRaises(FetchTooLarge) as caught:
+            fetch(f"{self.base}/huge-declared", self.target, self.session)
+        self.assertIsNone(caught.exception.status)
+        self.assertFalse(os.path.exists(self.target))
+
+    def test_streamed_size_over_the_cap_is_cut_off(self):
+        with self.assertRaises(FetchTooLarge) as caught:
+            fetch(f"{self.base}/huge-streamed", self.target, self.session, max_bytes=1 << 20)
+        self.assertEqual((caught.exception.status, caught.exception.max_bytes), (None, 1 << 20))
+        self.assertFalse(os.path.exists(self.target))
+        self.assertEqual(self.leftovers(), [])
+
+    def test_stalled_read_times_out(self):
+        start = time.perf_counter()
+        with self.assertRaises(FetchError) as caught:
+            fetch(f"{self.base}/stalled", self.target, make_session(retries=0), timeout=(1, 0.5))
+        self.assertIsNone(caught.exception.status)
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertEqual(self.leftovers(), [])
+
+    def test_connection_refused_is_a_fetch_error(self):
+        closed = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        port = closed.server_address[1]
+        closed.server_close()
+        with self.assertRaises(FetchError) as caught:
+            fetch(f"http://127.0.0.1:{port}/image.jpg", self.target, make_session(retries=0), timeout=(1, 1))
+        self.assertIsNone(caught.exception.status)
+
+
+if __name__ == "__main__":
+    unittest.main()
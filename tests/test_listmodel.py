@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from image_core.catalog import CATALOG_FILENAME, ImageCatalog
+from image_core.listmodel import CatalogListModel
+from tests.support import FolderTestCase
+
+
+class ListModelTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.catalog = ImageCatalog(self.path(CATALOG_FILENAME))
+        self.addCleanup(self.catalog.close)
+        self.add(95)
+
+    def add(self, count):
+        start = self.catalog.count()
+        return [
+            self.catalog.add(f"img{i}.png", f"img{i}.png", "2024-01-05 10:00:00")
+            for i in range(start, start + count)
+        ]
+
+    def expected(self):
+        return [row["filename"] for row in self.catalog.rows()]
+
+    def assertMatches(self, model):
+        expected = self.expected()
+        self.assertEqual(model.count(), len(expected))
+        self.assertEqual([row["filename"] for row in model.rows(0, model.count())], expected)
+        # Jumps in random order exercise page_after, page_at and page_from_end
+        for index in random.Random(4).sample(range(len(expected)), len(expected)):
+            self.assertEqual(model.row(index)["filename"], expected[index])
+
+    def test_dense_ids_map_positions_directly(self):
+        model = CatalogListModel(self.catalog, page_size=10, max_pages=3)
+        self.assertTrue(model.dense)
+        self.assertMatches(model)
+
+    def test_positions_stay_right_after_deletes(self):
+        model = CatalogListModel(self.catalog, page_size=10, max_pages=3)
+        model.rows(0, 40)
+        for index in (0, 17, 17, 60):
+            self.catalog.remove(model.row(index)["id"])
+            model.removed(index)
+        self.assertFalse(model.dense)
+        self.assertMatches(model)
+        # A fresh model over the gapped ids pages from either end
+        self.assertMatches(CatalogListModel(self.catalog, page_size=10, max_pages=3))
+
+    def test_appended_rows_join_the_last_page(self):
+        model = CatalogListModel(self.catalog, page_size=10, max_pages=3)
+        model.rows(90, 95)
+        for row in self.add(7):
+            model.appended(row)
+        self.assertTrue(model.dense)
+        self.assertMatches(model)
+
+    def test_catalog_paging_queries_agree(self):
+        self.catalog.remove(3)
+        self.catalog.remove(50)
+        expected = self.catalog.rows()
+        self.assertEqual(self.catalog.page_at(10, 5), expected[10:15])
+        self.assertEqual(self.catalog.page_after(expected[9]["id"], 5), expected[10:15])
+        self.assertEqual(self.catalog.page_from_end(5, 10), expected[-15:-5])
+        self.assertEqual(list(self.catalog.iter_rows(batch_size=7)), expected)
+        self.assertEqual(list(self.catalog.iter_rows(after_id=90)), [row for row in expected if row["id"] > 90])
+
+
+if __name__ == "__main__":
+    unittest.main()
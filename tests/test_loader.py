@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+
+from PIL import Image, JpegImagePlugin
+
+from image_core.loader import fit_size, load_preview, reduce_factor
+from tests.support import FolderTestCase
+
+BOX = (100, 100)
+
+
+class LoaderTests(FolderTestCase):
+    def test_fit_size_keeps_aspect_and_never_upscales(self):
+        self.assertEqual(fit_size((4000, 3000), (700, 500)), (666, 500))
+        self.assertEqual(fit_size((300, 200), (700, 500)), (300, 200))
+        self.assertEqual(reduce_factor((4000, 3000), (666, 500)), 6)
+
+    def test_sixteen_bit_greyscale_is_reduced(self):
+        path = self.save_image("depth.png", (800, 400), 40000, mode="I;16")
+        self.assertEqual(Image.open(path).mode, "I;16")
+        preview = load_preview(path, BOX)
+        self.assertEqual((preview.mode, preview.size), ("RGB", (100, 50)))
+
+    def test_palette_with_transparency_keeps_alpha(self):
+        img = Image.new("P", (400, 400), 1)
+        img.putpalette([0, 0, 0, 255, 0, 0] + [0] * 762)
+        path = self.path("sprite.png")
+        img.save(path, transparency=0)
+        preview = load_preview(path, BOX)
+        self.assertEqual((preview.mode, preview.size), ("RGBA", BOX))
+        self.assertEqual(preview.getpixel((50, 50)), (255, 0, 0, 255))
+
+    def test_cmyk_jpeg_comes_back_rgb(self):
+        path = self.save_image("print.jpg", (800, 800), (0, 255, 255, 0), mode="CMYK")
+        preview = load_preview(path, BOX)
+        self.assertEqual((preview.mode, preview.size), ("RGB", BOX))
+
+    def test_large_jpeg_is_drafted_before_decoding(self):
+        path = self.save_image("photo.jpg", (1600, 1200), (200, 30, 30))
+        drafted = []
+        draft = JpegImagePlugin.JpegImageFile.draft
+
+        def record(img, mode, size):
+            result = draft(img, mode, size)
+            drafted.append(img.size)
+            return result
+
+        with mock.patch.object(JpegImagePlugin.JpegImageFile, "draft", record):
+            preview = load_preview(path, BOX)
+        # 1/8 scale already covers 100x75, so libjpeg decodes 200x150
+        self.assertEqual(drafted, [(200, 150)])
+        self.assertEqual((preview.mode, preview.size), ("RGB", (100, 75)))
+
+    def test_small_images_are_returned_in_a_display_mode(self):
+        path = self.save_image("tiny.png", (10, 10), 300, mode="I;16")
+        preview = load_preview(path, BOX)
+        self.assertEqual((preview.mode, preview.size), ("RGB", (10, 10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
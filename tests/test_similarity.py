@@ -0,0 +1,117 @@
+import os
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from image_core import similarity
+from image_core.catalog import ImageCatalog
+from image_core.features import FeatureStore, extract_features
+from image_core.similarity import HashIndex, find_similar, hamming_distances, swar_distances
+from tests.support import FolderTestCase
+
+
+def reference_distances(hashes, query):
+    return [bin(int(h) ^ query).count("1") for h in hashes]
+
+
+class HammingDistanceTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        edges = np.array([0, 1, 2**63, 2**64 - 1, 0x5555555555555555, 0xAAAAAAAAAAAAAAAA], dtype=np.uint64)
+        self.hashes = np.concatenate([edges, rng.integers(0, 2**64, 500, dtype=np.uint64, endpoint=False)])
+        self.query = 0xF0F0F0F0F0F0F0F0
+
+    def test_swar_popcount_matches_a_bit_count(self):
+        distances = swar_distances(self.hashes, np.uint64(self.query))
+        self.assertEqual(distances.dtype, np.uint8)
+        self.assertEqual(distances.tolist(), reference_distances(self.hashes, self.query))
+
+    def test_swar_chunks_cover_every_row(self):
+        with mock.patch.object(similarity, "CHUNK_ROWS", 64):
+            distances = swar_distances(self.hashes, np.uint64(self.query))
+        self.assertEqual(distances.tolist(), reference_distances(self.hashes, self.query))
+
+    def test_swar_leaves_the_hashes_alone(self):
+        before = self.hashes.copy()
+        swar_distances(self.hashes, np.uint64(self.query))
+        np.testing.assert_array_equal(self.hashes, before)
+
+    def test_both_paths_agree(self):
+        expected = reference_distances(self.hashes, self.query)
+        self.assertEqual(hamming_distances(self.hashes, self.query).tolist(), expected)
+        # Older NumPy has no bitwise_count and takes the SWAR path
+        numpy_1 = types.SimpleNamespace(**{name: getattr(np, name) for name in dir(np) if name != "bitwise_count"})
+        with mock.patch.object(similarity, "np", numpy_1):
+            self.assertEqual(hamming_distances(self.hashes, self.query).tolist(), expected)
+
+
+class HashIndexTests(unittest.TestCase):
+    def setUp(self):
+        #                       0 bits  1 bit   3 bits  64 bits  1 bit
+        self.index = HashIndex([1, 2, 3, 4, 5], [0b0, 0b1, 0b111, 2**64 - 1, 0b10])
+
+    def test_search_orders_by_distance_then_id(self):
+        self.assertEqual(self.index.search(0, max_distance=3), [(1, 0), (2, 1), (5, 1), (3, 3)])
+        self.assertEqual(self.index.search(0, max_distance=1, limit=2), [(1, 0), (2, 1)])
+
+    def test_search_can_exclude_the_query_image(self):
+        self.assertEqual(self.index.search(0, max_distance=1, exclude=1), [(2, 1), (5, 1)])
+
+    def test_hash_of_unknown_id_is_none(self):
+        self.assertEqual(self.index.hash_of(3), 0b111)
+        self.assertIsNone(self.index.hash_of(9))
+
+
+class FindSimilarTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.catalog = ImageCatalog(self.path("catalog.sqlite3"))
+        self.addCleanup(self.catalog.close)
+        self.features = FeatureStore(self.images)
+
+    def ramp(self, relative, size, rising=True):
+        """Save a horizontal grey ramp; its dHash is all ones (rising) or all zeros"""
+        values = np.linspace(0, 255, size[0]) if rising else np.linspace(255, 0, size[0])
+        pixels = np.tile(values.astype(np.uint8), (size[1], 1))
+        path = self.path(relative)
+        Image.fromarray(pixels, "L").convert("RGB").save(path)
+        return path
+
+    def add(self, name, size, rising=True, index=True):
+        os.makedirs(self.images, exist_ok=True)
+        path = self.ramp(os.path.join("images", name), size, rising)
+        image_id = self.catalog.add(name, name, "2024-01-01 00:00:00")["id"]
+        if index:
+            self.features.append([image_id], [extract_features(path)])
+        return image_id
+
+    def test_catalog_id_finds_its_near_duplicates(self):
+        original = self.add("a.png", (400, 300))
+        resized = self.add("b.jpg", (200, 150))
+        self.add("c.png", (400, 300), rising=False)
+        results = find_similar(self.catalog, self.features, self.images, original)
+        self.assertEqual([(row["id"], row["filename"]) for row in results], [(resized, "b.jpg")])
+        self.assertLessEqual(results[0]["distance"], 2)
+
+    def test_unindexed_id_is_hashed_from_its_file(self):
+        original = self.add("a.png", (400, 300), index=False)
+        resized = self.add("b.jpg", (200, 150))
+        results = find_similar(self.catalog, self.features, self.images, original)
+        self.assertEqual([row["id"] for row in results], [resized])
+
+    def test_path_query_matches_every_indexed_copy(self):
+        first, second = self.add("a.png", (400, 300)), self.add("b.jpg", (200, 150))
+        query = self.ramp("query.png", (320, 240))
+        results = find_similar(self.catalog, self.features, self.images, query)
+        self.assertEqual(sorted(row["id"] for row in results), [first, second])
+
+    def test_unknown_id_raises(self):
+        with self.assertRaises(LookupError):
+            find_similar(self.catalog, self.features, self.images, 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import threading
+import time
+import unittest
+
+from image_core.tasks import TaskRunner
+
+
+class ManualRoot:
+    """Stand-in for Tk: after() callbacks run when the test pumps them"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def pump(self, until, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not until():
+            if time.monotonic() > deadline:
+                raise AssertionError("timed out waiting for the task runner")
+            callbacks, self.scheduled = self.scheduled, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.001)
+
+
+def square(n):
+    if n < 0:
+        raise ValueError(n)
+    return n * n
+
+
+class TaskRunnerTests(unittest.TestCase):
+    def setUp(self):
+        self.root = ManualRoot()
+        self.runner = TaskRunner(self.root, workers=2)
+        self.addCleanup(self.runner.shutdown)
+
+    def test_results_errors_and_done_run_on_the_pumping_thread(self):
+        results, errors, finished, threads = {}, [], [], set()
+
+        def on_result(item, result):
+            threads.add(threading.get_ident())
+            results[item] = result
+
+        task = self.runner.map(square, [1, 2, -3, 4], on_result=on_result,
+                               on_error=lambda item, exc: errors.append(item), on_done=finished.append)
+        self.root.pump(lambda: finished)
+        self.assertEqual(results, {1: 1, 2: 4, 4: 16})
+        self.assertEqual(errors, [-3])
+        self.assertEqual((task.done, task.failed, task.skipped, task.processed), (3, 1, 0, 4))
+        self.assertEqual(threads, {threading.get_ident()})
+
+    def test_cancelled_items_are_counted_as_skipped(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow(n):
+            started.set()
+            release.wait(5)
+            return n
+
+        finished = []
+        task = self.runner.map(slow, range(10), on_done=finished.append)
+        started.wait(5)
+        task.cancel()
+        release.set()
+        self.root.pump(lambda: finished)
+        # Only items a worker had already started finish; the queued ones never run
+        self.assertIn(task.done, (1, 2))
+        self.assertEqual(task.done + task.skipped, 10)
+        self.assertEqual(task.processed, task.total)
+        self.assertTrue(task.finished and task.cancelled)
+
+    def test_process_jobs_fall_back_to_threads_without_a_pool(self):
+        done = []
+        self.runner.submit(square, 7, on_done=done.append, process=True)
+        self.root.pump(lambda: done)
+        self.assertEqual(done, [49])
+
+    def test_empty_batch_still_reports_done(self):
+        finished = []
+        task = self.runner.map(square, [], on_done=finished.append)
+        self.root.pump(lambda: finished)
+        self.assertTrue(task.finished)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from image_core import thumbnails
+from image_core.thumbnails import SIZES, ThumbnailCache
+from tests.support import FolderTestCase
+
+
+class Clock:
+    """Stand-in for time.time that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ThumbnailCacheTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = ThumbnailCache(self.path(".thumbnails"))
+        self.addCleanup(self.cache.close)
+
+    def image(self, name, color=(200, 30, 30), size=(1400, 1000)):
+        return self.save_image(os.path.join("images", name), size, color)
+
+    def decoded(self):
+        """Patch load_preview to record which file each render decodes"""
+        return mock.patch.object(thumbnails, "load_preview", wraps=thumbnails.load_preview)
+
+    def test_generate_renders_every_level_to_fit(self):
+        paths = self.cache.generate(self.image("a.png"))
+        self.assertEqual(set(paths), set(SIZES))
+        for size, path in paths.items():
+            with Image.open(path) as img:
+                width, height = img.size
+            self.assertLessEqual(width, SIZES[size][0])
+            self.assertLessEqual(height, SIZES[size][1])
+            self.assertIn(SIZES[size], ((width, height), (SIZES[size][0], height), (width, SIZES[size][1])))
+
+    def test_pyramid_decodes_the_original_once(self):
+        source = self.image("a.png")
+        with self.decoded() as load_preview:
+            self.cache.generate(source)
+            self.cache.generate(source)
+            self.cache.get(source, "row")
+        self.assertEqual([c.args[0] for c in load_preview.call_args_list], [source])
+
+    def test_missing_level_is_rendered_from_a_larger_cached_one(self):
+        source = self.image("a.png")
+        viewer = self.cache.get(source, "viewer")
+        with self.decoded() as load_preview:
+            self.cache.get(source, "list")
+        self.assertEqual(load_preview.call_args.args[0], viewer)
+
+    def test_source_is_rehashed_only_when_it_changes(self):
+        source = self.image("a.png")
+        with mock.patch.object(thumbnails, "hash_file", wraps=thumbnails.hash_file) as hash_file:
+            first = self.cache.source_digest(source)
+            self.assertEqual(self.cache.source_digest(source), first)
+            self.assertEqual(hash_file.call_count, 1)
+            Image.new("RGB", (1400, 1000), (0, 0, 255)).save(source)
+            os.utime(source, ns=(0, os.stat(source).st_mtime_ns + 10**9))
+            self.assertNotEqual(self.cache.source_digest(source), first)
+            self.assertEqual(hash_file.call_count, 2)
+
+    def test_eviction_drops_least_recently_used_first(self):
+        clock = Clock()
+        with mock.patch.object(thumbnails.time, "time", clock):
+            sources = [self.image(f"{i}.png", (i * 60, 0, 0)) for i in range(3)]
+            for source in sources:
+                clock.now += 1
+                self.cache.get(source, "row")
+            clock.now += 1
+            # Reading the first one again makes the second the oldest
+            self.cache.get(sources[0], "row")
+            entries = {name: size for name, size in self.cache.conn.execute("SELECT name, bytes FROM entries")}
+            second = self.cache.entry_name(self.cache.source_digest(sources[1]), "row")
+            self.cache.budget_bytes = sum(entries.values()) - 1
+            self.assertEqual(self.cache.evict(), 1)
+
+        self.assertFalse(os.path.exists(self.cache.entry_path(second)))
+        self.assertEqual(self.cache.usage(), sum(entries.values()) - entries[second])
+        for source in (sources[0], sources[2]):
+            name = self.cache.entry_name(self.cache.source_digest(source), "row")
+            self.assertTrue(os.path.exists(self.cache.entry_path(name)))
+
+    def test_evicted_level_is_rendered_again(self):
+        source = self.image("a.png")
+        path = self.cache.get(source, "row")
+        self.cache.budget_bytes = 0
+        self.cache.evict()
+        self.assertFalse(os.path.exists(path))
+        self.cache.budget_bytes = 1 << 20
+        self.assertEqual(self.cache.get(source, "row"), path)
+        self.assertTrue(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from image_core.batch import import_batch
+from image_core.blobs import BLOB_DIRNAME
+from image_core.catalog import open_catalog
+from image_core.verify import VerifyReport, check_entry, verify_catalog
+from tests.support import FolderTestCase
+
+
+class VerifyTests(FolderTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(6):
+            self.save_image(os.path.join("dump", f"{i}.png"), (20 + i, 10), (i * 40, 0, 0))
+        self.catalog = open_catalog(self.images)
+        self.addCleanup(self.catalog.close)
+        import_batch(self.catalog, self.images, [self.path("dump")], link="copy")
+        self.rows = self.catalog.rows()
+
+    def blob_path(self, row):
+        return os.path.join(self.images, row["filename"])
+
+    def run_verify(self, **options):
+        report = VerifyReport()
+        found = {row["id"]: problems for row, problems in verify_catalog(self.catalog, self.images, report=report, **options)}
+        return found, report
+
+    def test_intact_collection_has_no_problems(self):
+        # Small batches, so entries are checked across several of them
+        with mock.patch("image_core.verify.BATCH_SIZE", 4):
+            found, report = self.run_verify(rehash=True, decode=True, orphans=True)
+        self.assertEqual(found, {})
+        self.assertEqual((report.checked, report.problems, report.orphans), (6, 0, 0))
+        self.assertEqual(report.bytes, sum(os.path.getsize(self.blob_path(row)) for row in self.rows))
+
+    def test_missing_and_altered_files_are_reported(self):
+        missing, altered, corrupt = self.rows[0], self.rows[1], self.rows[2]
+        os.remove(self.blob_path(missing))
+        Image.new("RGB", (5, 5)).save(self.blob_path(altered), "PNG")
+        with open(self.blob_path(corrupt), "r+b") as f:
+            f.write(b"not an image")
+
+        found, report = self.run_verify()
+        self.assertEqual(found, {missing["id"]: ["missing file"]})
+
+        found, report = self.run_verify(rehash=True, decode=True)
+        self.assertEqual(set(found), {missing["id"], altered["id"], corrupt["id"]})
+        self.assertIn("content hash", found[altered["id"]][0])
+        self.assertEqual(len(found[corrupt["id"]]), 2)  # Hash mismatch and decode failure
+        self.assertEqual((report.checked, report.problems), (6, 4))
+
+    def test_unreferenced_blobs_are_counted(self):
+        self.catalog.remove(self.rows[0]["id"])
+        _, report = self.run_verify(orphans=True)
+        self.assertEqual((report.checked, report.orphans), (5, 1))
+
+    def test_orphan_scan_creates_nothing(self):
+        folder = self.path("legacy")
+        catalog = open_catalog(folder)
+        self.addCleanup(catalog.close)
+        report = VerifyReport()
+        self.assertEqual(list(verify_catalog(catalog, folder, orphans=True, report=report)), [])
+        self.assertEqual(report.orphans, 0)
+        self.assertFalse(os.path.exists(os.path.join(folder, BLOB_DIRNAME)))
+
+    def test_check_entry_skips_hash_for_legacy_rows(self):
+        row = dict(self.rows[0], content_hash=None)
+        with open(self.blob_path(row), "ab") as f:
+            f.write(b"appended")
+        self.assertEqual(check_entry(row, self.images, rehash=True), ([], os.path.getsize(self.blob_path(row))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,9 @@ Verification script for the Image Container
 import os
 import shutil
 from PIL import Image
+from image_core.blobs import BLOB_DIRNAME
+from image_core.catalog import CATALOG_FILENAME, ImageCatalog
+from image_core.loader import load_preview
 
 def verify_container():
     """Verify the image container setup"""
@@ -19,6 +22,10 @@ def verify_container():
             bg_img = Image.open("background.jpg")
             print(f"  - Background image size: {bg_img.size}")
             print(f"  - Background image mode: {bg_img.mode}")
+            
+            # Check the reduced-size loader the containers use for previews
+            preview = load_preview("background.jpg", (400, 300))
+            print(f"  - Preview loads at: {preview.size}")
         except Exception as e:
             print(f"  - Error opening background image: {e}")
     else:
@@ -35,9 +42,21 @@ def verify_container():
         else:
             print("  - No images found in the directory")
         
-        # Check if CSV file exists
-        if os.path.exists(os.path.join("images", "image_data.csv")):
-            print("✓ Image metadata file exists")
+        # Check the content-addressed blob store
+        blob_folder = os.path.join("images", BLOB_DIRNAME)
+        if os.path.exists(blob_folder):
+            blobs = sum(len(files) for _, _, files in os.walk(blob_folder))
+            print(f"  - {blobs} blobs in the content store")
+        
+        # Check if the catalog exists
+        catalog_path = os.path.join("images", CATALOG_FILENAME)
+        if os.path.exists(catalog_path):
+            print("✓ Image catalog exists")
+            catalog = ImageCatalog(catalog_path)
+            print(f"  - {catalog.count()} images in the catalog")
+            catalog.close()
+        elif os.path.exists(os.path.join("images", "image_data.csv")):
+            print("✓ Image metadata file exists (imported into the catalog on next launch)")
         else:
             print("✗ Image metadata file does not exist")
     else:
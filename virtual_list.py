@@ -0,0 +1,178 @@
+"""
+Virtualized image list for the Image Container.
+Draws only the rows currently in view on a Canvas, pulling them page by page
+from a CatalogListModel, so opening or refreshing a 100k-image collection
+costs the same as a 10-image one. Optional thumbnails are decoded on the
+task runner from the thumbnail cache and drawn once they arrive.
+"""
+
+import tkinter as tk
+from collections import OrderedDict
+from PIL import ImageTk
+
+# PhotoImages kept for rows scrolled out of view
+MAX_PHOTOS = 200
+
+class VirtualImageList(tk.Frame):
+    """Listbox-like widget backed by a paged model instead of inserted strings"""
+
+    def __init__(self, master, model, format_row, tasks=None, load_thumbnail=None,
+                 thumbnail_size=(48, 36), row_height=22, empty_text="No images in collection",
+                 on_activate=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.model = model
+        self.format_row = format_row
+        self.tasks = tasks
+        self.load_thumbnail = load_thumbnail if tasks else None
+        self.thumbnail_width = thumbnail_size[0]
+        self.row_height = max(row_height, thumbnail_size[1] + 4) if self.load_thumbnail else row_height
+        self.empty_text = empty_text
+        self.on_activate = on_activate
+
+        self.top = 0  # Index of the first visible row
+        self.selected = None
+        self.photos = OrderedDict()
+        self.requested = set()
+        self.redraw_pending = False
+
+        self.scrollbar = tk.Scrollbar(self, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0, takefocus=1)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.canvas.bind("<Button-1>", self.click)
+        self.canvas.bind("<Double-Button-1>", self.activate)
+        self.canvas.bind("<Return>", self.activate)
+        self.canvas.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+        self.canvas.bind("<Up>", lambda e: self.move_selection(-1))
+        self.canvas.bind("<Down>", lambda e: self.move_selection(1))
+        self.canvas.bind("<Prior>", lambda e: self.move_selection(-self.visible_rows()))
+        self.canvas.bind("<Next>", lambda e: self.move_selection(self.visible_rows()))
+        self.canvas.bind("<Home>", lambda e: self.move_selection(-self.model.count()))
+        self.canvas.bind("<End>", lambda e: self.move_selection(self.model.count()))
+
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def curselection(self):
+        """Selected index as a tuple, like tk.Listbox"""
+        return () if self.selected is None else (self.selected,)
+
+    def selection_set(self, index):
+        self.selected = index
+        self.see(index)
+        self.refresh()
+
+    def selection_clear(self):
+        self.selected = None
+        self.refresh()
+
+    def see(self, index):
+        """Scroll just enough to bring index into view"""
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.visible_rows():
+            self.top = index - self.visible_rows() + 1
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")"""
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self.model.count())
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_rows()
+            self.top += step
+        self.refresh()
+
+    def click(self, event):
+        self.canvas.focus_set()
+        index = self.top + event.y // self.row_height
+        if index < self.model.count():
+            self.selected = index
+            self.refresh()
+
+    def activate(self, event=None):
+        if self.on_activate and self.selected is not None:
+            self.on_activate()
+
+    def move_selection(self, step):
+        count = self.model.count()
+        if count:
+            current = self.selected if self.selected is not None else self.top - (1 if step > 0 else 0)
+            self.selection_set(max(0, min(count - 1, current + step)))
+
+    def refresh(self):
+        """Redraw at the next idle moment; repeated calls collapse into one redraw"""
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.after_idle(self.redraw)
+
+    def redraw(self):
+        """Draw the rows in view; cost depends on the window height, not the collection"""
+        self.redraw_pending = False
+        self.canvas.delete("row")
+        count = self.model.count()
+        if self.selected is not None and self.selected >= count:
+            self.selected = None
+        if not count:
+            self.top = 0
+            self.canvas.create_text(4, self.row_height // 2, text=self.empty_text, anchor=tk.W, tags="row")
+            self.scrollbar.set(0, 1)
+            return
+
+        visible = self.visible_rows()
+        self.top = max(0, min(self.top, count - visible))
+        width = self.canvas.winfo_width()
+        # One extra row fills the partially visible bottom line
+        for offset, row in enumerate(self.model.rows(self.top, self.top + visible + 1)):
+            index = self.top + offset
+            y = offset * self.row_height
+            middle = y + self.row_height // 2
+            selected = index == self.selected
+            if selected:
+                self.canvas.create_rectangle(0, y, width, y + self.row_height, fill="#3874d8", outline="", tags="row")
+            x = 4
+            if self.load_thumbnail:
+                photo = self.thumbnail(row)
+                if photo:
+                    self.canvas.create_image(x, middle, image=photo, anchor=tk.W, tags="row")
+                x += self.thumbnail_width + 8
+            self.canvas.create_text(x, middle, text=self.format_row(row), anchor=tk.W,
+                                    fill="white" if selected else "black", tags="row")
+        self.scrollbar.set(self.top / count, min(1.0, (self.top + visible) / count))
+
+    def thumbnail(self, row):
+        """Cached PhotoImage for a row, or None while it loads in the background"""
+        # Keyed by filename, not id: SQLite can hand a removed entry's id to a
+        # new one, while blob filenames name the content itself
+        key = row["filename"]
+        photo = self.photos.get(key)
+        if photo:
+            self.photos.move_to_end(key)
+            return photo
+        if key not in self.requested:
+            # Failed loads stay in requested, so they are not retried on every redraw
+            self.requested.add(key)
+            self.tasks.submit(
+                self.load_thumbnail, row,
+                on_done=lambda img: self.thumbnail_loaded(key, img)
+            )
+        return None
+
+    def forget_row(self, row):
+        """Drop the cached thumbnail of a row that was removed"""
+        self.photos.pop(row["filename"], None)
+        self.requested.discard(row["filename"])
+
+    def thumbnail_loaded(self, key, img):
+        self.requested.discard(key)
+        if not self.winfo_exists():
+            return
+        self.photos[key] = ImageTk.PhotoImage(img)
+        while len(self.photos) > MAX_PHOTOS:
+            self.photos.popitem(last=False)
+        self.refresh()